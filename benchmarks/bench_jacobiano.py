@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Jacobiano analítico vs diferencias finitas
+=====================================================
+
+Compara el costo de KineticModel.simulate() con y sin el Jacobiano
+analítico (método Radau) para los modelos de 1 y 3 pasos, reversibles
+e irreversibles. Reporta nfev, njev, nlu y tiempo de pared por simulación.
+
+Nota: el nfev de solve_ivp no incluye las evaluaciones del lado derecho
+usadas para aproximar el Jacobiano por diferencias finitas, por lo que
+también se reporta el número real de llamadas a model.odes (n_rhs).
+
+Segunda parte: ParameterFitter.fit() con el Jacobiano de los residuales
+por diferencias finitas (use_jacobian=False) y exacto por sensibilidades
+(use_jacobian=True) sobre datos sintéticos a 3 temperaturas. Reporta
+evaluaciones de residuales, tiempo de pared total y hasta alcanzar el chi²
+final del ajuste por diferencias finitas, y chi² final.
+
+Uso:
+    python benchmarks/bench_jacobiano.py
+
+Autor: Sistema de Modelado de Esterificación
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Agregar raíz del proyecto al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.kinetic_model import KineticModel
+from src.models.parameter_fitting import ParameterFitter
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+
+T_SPAN = (0, 120)         # min
+TEMPERATURA = 65.0        # °C
+C0 = {'TG': 0.5, 'MeOH': 4.5}
+REPETICIONES = 20
+
+# Ajuste de parámetros
+TEMPERATURAS_AJUSTE = [50.0, 60.0, 70.0]   # °C
+TIEMPOS = np.linspace(0, 120, 13)          # min
+RUIDO = 0.01                               # Ruido relativo
+SEMILLA = 0
+PARAMS_1STEP = {'Ea_forward': 55.0, 'A_forward': 2e7, 'Ea_reverse': 60.0, 'A_reverse': 1e6}
+PARAMS_3STEP = {f'step{i}': {'Ea_forward': 50.0 + i, 'A_forward': 2e7,
+                             'Ea_reverse': 55.0, 'A_reverse': 1e6} for i in (1, 2, 3)}
+INICIAL_1STEP = {'Ea_forward': 50.0, 'A_forward': 1e6, 'Ea_reverse': 55.0, 'A_reverse': 1e5}
+INICIAL_3STEP = {f'step{i}': {'Ea_forward': 48.0, 'A_forward': 1e7,
+                              'Ea_reverse': 50.0, 'A_reverse': 1e6} for i in (1, 2, 3)}
+
+
+def medir(model, use_jacobian):
+    """Ejecuta REPETICIONES simulaciones y retorna estadísticas promedio."""
+    # Contar todas las llamadas al lado derecho (incluidas las de num_jac)
+    odes = model.odes
+    n_rhs = [0]
+
+    def odes_contadas(t, y):
+        n_rhs[0] += 1
+        return odes(t, y)
+
+    model.odes = odes_contadas
+
+    tiempos = []
+    for _ in range(REPETICIONES):
+        n_rhs[0] = 0
+        inicio = time.perf_counter()
+        results = model.simulate(T_SPAN, C0, method='Radau', use_jacobian=use_jacobian,
+                                 analytic=False)
+        tiempos.append(time.perf_counter() - inicio)
+
+    del model.odes
+
+    return {
+        'n_rhs': n_rhs[0],
+        'nfev': results['nfev'],
+        'njev': results['njev'],
+        'nlu': results['nlu'],
+        'ms': np.median(tiempos) * 1000,
+        'conversion_%': results['conversion_%'][-1],
+    }
+
+
+def crear_ajustador(model_type, reversible):
+    """Ajustador con datos sintéticos (parámetros de referencia + ruido relativo)."""
+    rng = np.random.default_rng(SEMILLA)
+    verdadero = KineticModel(model_type=model_type, reversible=reversible,
+                             kinetic_params=PARAMS_1STEP if model_type == '1-step'
+                             else PARAMS_3STEP)
+    fitter = ParameterFitter(model_type=model_type, reversible=reversible)
+    for T in TEMPERATURAS_AJUSTE:
+        results = verdadero.simulate((TIEMPOS[0], TIEMPOS[-1]), C0, t_eval=TIEMPOS,
+                                     temperature=T, use_cache=False)
+        datos = {'time': TIEMPOS}
+        datos.update({name: results[name] * (1 + RUIDO * rng.standard_normal(TIEMPOS.size))
+                      for name in results.keys() if name.startswith('C_')
+                      and name[2:] in fitter.weights})
+        fitter.add_experiment(pd.DataFrame(datos), T, C0)
+    return fitter
+
+
+def ajustar(fitter, use_jacobian, parameterization):
+    """Ajusta registrando el tiempo y el chi² de cada evaluación de residuales."""
+    historial = []
+    residuals = fitter._residuals
+
+    def residuales_registrados(params):
+        r = residuals(params)
+        historial.append((time.perf_counter() - inicio, np.sum(r ** 2)))
+        return r
+
+    fitter._residuals = residuales_registrados
+    inicial = INICIAL_1STEP if fitter.model_type == '1-step' else INICIAL_3STEP
+    inicio = time.perf_counter()
+    results = fitter.fit(verbose=False, use_jacobian=use_jacobian, initial_guess=inicial,
+                         parameterization=parameterization)
+    wall = time.perf_counter() - inicio
+    del fitter._residuals
+
+    return {'nfev': results['nfev'], 's': wall, 'historial': historial,
+            'chisqr': results['chisqr']}
+
+
+def tiempo_hasta(historial, chi2_meta):
+    """Tiempo de pared hasta la primera evaluación con chi² ≤ chi2_meta."""
+    for t, chi2 in historial:
+        if chi2 <= chi2_meta * (1 + 1e-6):
+            return t
+    return np.nan
+
+
+def main_ajuste():
+    print("=" * 78)
+    print(f"BENCHMARK: JACOBIANO DE RESIDUALES EN fit() ({len(TEMPERATURAS_AJUSTE)} temperaturas)")
+    print("=" * 78)
+    print(f"{'Modelo':<16}{'Parametriz.':<13}{'Jacobiano':<11}{'nfev':>6}{'total s':>9}"
+          f"{'a chi²_df s':>12}{'chi²':>11}")
+    print("-" * 78)
+
+    casos = [('1-step', False, 'arrhenius'), ('1-step', True, 'arrhenius'),
+             ('3-step', True, 'arrhenius'), ('3-step', True, 'reference')]
+    for model_type, reversible, parameterization in casos:
+        etiqueta = f"{model_type} {'rev' if reversible else 'irrev'}"
+        chi2_df = None
+        for use_jacobian, nombre in [(False, 'dif. fin.'), (True, 'exacto')]:
+            r = ajustar(crear_ajustador(model_type, reversible), use_jacobian, parameterization)
+            if chi2_df is None:
+                chi2_df = r['chisqr']
+            print(f"{etiqueta:<16}{parameterization:<13}{nombre:<11}{r['nfev']:>6}{r['s']:>9.2f}"
+                  f"{tiempo_hasta(r['historial'], chi2_df):>12.2f}{r['chisqr']:>11.4e}")
+    print("-" * 78)
+    print("3 pasos: los pares directo/inverso son casi no identificables; con el")
+    print("Jacobiano exacto el ajuste sigue descendiendo por el valle tras pasar")
+    print("chi²_df (final de diferencias finitas), hasta max_nfev en 'arrhenius'.")
+
+
+def main():
+    print("=" * 78)
+    print("BENCHMARK: JACOBIANO ANALÍTICO (Radau)")
+    print("=" * 78)
+    print(f"{'Modelo':<16}{'Jacobiano':<12}{'n_rhs':>7}{'nfev':>7}{'njev':>7}{'nlu':>7}"
+          f"{'ms/sim':>10}{'X (%)':>10}")
+    print("-" * 78)
+
+    for model_type in ['1-step', '3-step']:
+        for reversible in [True, False]:
+            model = KineticModel(model_type=model_type, reversible=reversible,
+                                 temperature=TEMPERATURA)
+            etiqueta = f"{model_type} {'rev' if reversible else 'irrev'}"
+
+            for use_jacobian, nombre in [(False, 'dif. fin.'), (True, 'analítico')]:
+                r = medir(model, use_jacobian)
+                print(f"{etiqueta:<16}{nombre:<12}{r['n_rhs']:>7}{r['nfev']:>7}{r['njev']:>7}"
+                      f"{r['nlu']:>7}{r['ms']:>10.2f}{r['conversion_%']:>10.3f}")
+        print("-" * 78)
+
+    print()
+    main_ajuste()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: formulación en concentraciones vs logarítmica (z = ln C)
+===================================================================
+
+Compara KineticModel.simulate(formulation='concentration') con
+formulation='log' (método Radau, Jacobiano analítico) a conversión muy
+alta (> 98 %), donde las concentraciones se agotan y el recorte en cero de
+las velocidades hace el lado derecho no suave.
+
+Para cada caso se integra:
+    - 'completa': desde C0 hasta T_FINAL
+    - '>98%':     desde el estado al 98 % de conversión hasta T_FINAL
+
+y se reportan nfev, njev, nlu, pasos aceptados, pasos rechazados por la
+prueba de error, fallos de convergencia de Newton (cada uno obliga a
+refrescar el Jacobiano o a reducir el paso), tiempo de pared y la mínima
+concentración obtenida (negativa = positividad violada).
+
+Los rechazos se cuentan envolviendo funciones internas del módulo Radau
+de SciPy (predict_factor y solve_collocation_system); los contadores
+dependen de esa implementación.
+
+Uso:
+    python benchmarks/bench_positividad.py
+
+Autor: Sistema de Modelado de Esterificación
+"""
+
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import scipy.integrate._ivp.radau as radau
+
+# Agregar raíz del proyecto al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.kinetic_model import KineticModel
+from src.models.reaction_network import ReactionNetwork
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+
+T_FINAL = 10000.0         # min (tiempo largo: agotamiento casi total)
+TEMPERATURA = 65.0        # °C
+CONVERSION_INICIO = 98.0  # % (inicio del tramo de alta conversión)
+TOLERANCIAS = [(1e-6, 1e-8), (1e-3, 1e-6)]
+REPETICIONES = 5
+
+# Red de 1 paso con orden fraccionario en TG (d r/d C_TG → ∞ cuando C_TG → 0)
+RED_FRACCIONARIA = {
+    'name': '1 paso, orden 0.5 en TG',
+    'species': ['TG', 'MeOH', 'FAME', 'GL'],
+    'reactions': [
+        {'name': 'global',
+         'reactants': {'TG': 1, 'MeOH': 3}, 'products': {'FAME': 3, 'GL': 1},
+         'orders_forward': {'TG': 0.5, 'MeOH': 1},
+         'reversible': False, 'Ea_forward': 50.0, 'A_forward': 1e6},
+    ],
+}
+
+
+# =============================================================================
+# CONTADORES DE PASOS RECHAZADOS (Radau)
+# =============================================================================
+
+contadores = {'rechazos': 0, 'fallos_newton': 0}
+_predict_factor = radau.predict_factor
+_solve_collocation_system = radau.solve_collocation_system
+
+
+def predict_factor_contado(h_abs, h_abs_old, error_norm, error_norm_old):
+    # Radau llama a predict_factor con error_norm > 1 solo al rechazar un paso
+    if error_norm > 1:
+        contadores['rechazos'] += 1
+    return _predict_factor(h_abs, h_abs_old, error_norm, error_norm_old)
+
+
+def solve_collocation_system_contado(*args):
+    resultado = _solve_collocation_system(*args)
+    if not resultado[0]:
+        contadores['fallos_newton'] += 1
+    return resultado
+
+
+def casos():
+    """Modelos y condiciones iniciales a comparar."""
+    return [
+        ('1 paso irrev', KineticModel('1-step', reversible=False, temperature=TEMPERATURA),
+         {'TG': 0.5, 'MeOH': 4.5}),
+        ('3 pasos irrev', KineticModel('3-step', reversible=False, temperature=TEMPERATURA),
+         {'TG': 0.5, 'MeOH': 4.5}),
+        ('3 pasos rev', KineticModel('3-step', reversible=True, temperature=TEMPERATURA),
+         {'TG': 0.5, 'MeOH': 9.0}),
+        ('orden 0.5', KineticModel('custom', network=ReactionNetwork.from_dict(RED_FRACCIONARIA),
+                                   temperature=TEMPERATURA),
+         {'TG': 0.5, 'MeOH': 4.5}),
+    ]
+
+
+def estado_alta_conversion(model, C0):
+    """Tiempo y concentraciones al CONVERSION_INICIO % (integración de referencia)."""
+    ref = model.simulate((0, T_FINAL), C0, method='LSODA', analytic=False, rtol=1e-10,
+                         atol=1e-14, targets={'conversion_%': CONVERSION_INICIO},
+                         stop_at_target=True, final_only=True, formulation='log')
+    estado = {species: float(ref[f'C_{species}'][-1]) for species in model.species}
+    return float(ref['t'][-1]), estado
+
+
+def medir(model, t_span, C0, formulation, rtol, atol):
+    """Ejecuta REPETICIONES simulaciones y retorna estadísticas (None si falla)."""
+    tiempos = []
+    for _ in range(REPETICIONES):
+        contadores.update(rechazos=0, fallos_newton=0)
+        inicio = time.perf_counter()
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                results = model.simulate(t_span, C0, method='Radau', analytic=False,
+                                         rtol=rtol, atol=atol, formulation=formulation)
+        except (ValueError, np.linalg.LinAlgError):
+            # p. ej. Jacobiano no finito con órdenes fraccionarios en C → 0
+            return None
+        tiempos.append(time.perf_counter() - inicio)
+
+    return {
+        'pasos': len(results['t']) - 1,
+        'rechazos': contadores['rechazos'],
+        'fallos_newton': contadores['fallos_newton'],
+        'nfev': results['nfev'],
+        'njev': results['njev'],
+        'nlu': results['nlu'],
+        'ms': np.median(tiempos) * 1000,
+        'C_min': results.y.min(),
+    }
+
+
+def main():
+    radau.predict_factor = predict_factor_contado
+    radau.solve_collocation_system = solve_collocation_system_contado
+
+    print("=" * 104)
+    print("BENCHMARK: FORMULACIÓN EN CONCENTRACIONES VS LOGARÍTMICA (Radau, Jacobiano analítico)")
+    print("=" * 104)
+
+    try:
+        for rtol, atol in TOLERANCIAS:
+            print(f"\nrtol = {rtol:g}, atol = {atol:g}")
+            print(f"{'Caso':<15}{'Tramo':<10}{'Formulación':<15}{'pasos':>7}{'rech.':>7}"
+                  f"{'Newton':>8}{'nfev':>7}{'njev':>6}{'nlu':>6}{'ms/sim':>9}{'C mín':>14}")
+            print("-" * 104)
+            for etiqueta, model, C0 in casos():
+                t98, C98 = estado_alta_conversion(model, C0)
+                for tramo, t_span, y0 in [('completa', (0, T_FINAL), C0),
+                                          ('>98%', (t98, T_FINAL), C98)]:
+                    for formulation in ['concentration', 'log']:
+                        r = medir(model, t_span, y0, formulation, rtol, atol)
+                        fila = f"{etiqueta:<15}{tramo:<10}{formulation:<15}"
+                        if r is None:
+                            print(fila + f"{'falla (Jacobiano no finito)':>43}")
+                            continue
+                        print(fila + f"{r['pasos']:>7}{r['rechazos']:>7}{r['fallos_newton']:>8}"
+                              f"{r['nfev']:>7}{r['njev']:>6}{r['nlu']:>6}{r['ms']:>9.2f}"
+                              f"{r['C_min']:>14.2e}")
+                print("-" * 104)
+    finally:
+        radau.predict_factor = _predict_factor
+        radau.solve_collocation_system = _solve_collocation_system
+
+
+if __name__ == "__main__":
+    main()
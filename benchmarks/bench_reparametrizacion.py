@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: parametrización de Arrhenius en el ajuste de 3 pasos
+===============================================================
+
+Ajusta el modelo de 3 pasos reversible (12 parámetros) a datos sintéticos
+con ruido a varias temperaturas, desde los valores iniciales por defecto,
+con las dos parametrizaciones de ParameterFitter.setup_parameters():
+
+    - 'arrhenius': A y Ea (A ~ 1e10, fuertemente correlacionado con Ea)
+    - 'reference': ln k(T_ref) y Ea, con T_ref en la media de los datos
+
+cada una con el Jacobiano por diferencias finitas y con el exacto por
+sensibilidades. Reporta evaluaciones de residuales (nfev), de Jacobiano
+(njev), tiempo de pared total y hasta alcanzar el chi² final del ajuste
+original ('arrhenius' con diferencias finitas), chi² final y la máxima
+correlación |ρ| entre Ea y su A (o ln k_ref) en la covarianza del ajuste.
+
+Con 12 parámetros los pares directo/inverso de cada paso son casi no
+identificables, por lo que los ajustes pueden terminar en mínimos
+distintos; el tiempo hasta el chi² de referencia compara el avance.
+
+Uso:
+    python benchmarks/bench_reparametrizacion.py
+
+Autor: Sistema de Modelado de Esterificación
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Agregar raíz del proyecto al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.kinetic_model import KineticModel
+from src.models.parameter_fitting import ParameterFitter
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+
+TEMPERATURAS = [45.0, 50.0, 55.0, 60.0, 65.0]   # °C
+TIEMPOS = np.linspace(0, 120, 13)               # min
+C0 = {'TG': 0.5, 'MeOH': 4.5}
+COMPONENTES = ['TG', 'DG', 'MG', 'FAME', 'GL']
+RUIDO = 0.005                                   # mol/L
+SEMILLA = 0
+MAX_NFEV = 2000
+
+
+def crear_ajustador():
+    """Ajustador con datos sintéticos (modelo de literatura + ruido gaussiano)."""
+    rng = np.random.default_rng(SEMILLA)
+    verdadero = KineticModel(model_type='3-step', reversible=True)
+    fitter = ParameterFitter(model_type='3-step', reversible=True)
+    for T in TEMPERATURAS:
+        results = verdadero.simulate((TIEMPOS[0], TIEMPOS[-1]), C0, t_eval=TIEMPOS,
+                                     temperature=T)
+        datos = {'time': TIEMPOS}
+        datos.update({f'C_{c}': results[f'C_{c}'] + rng.normal(0, RUIDO, TIEMPOS.size)
+                      for c in COMPONENTES})
+        fitter.add_experiment(pd.DataFrame(datos), T, C0)
+    return fitter
+
+
+def correlacion_arrhenius(results):
+    """Máxima |ρ| entre cada Ea y su A (o ln k_ref) en la covarianza del ajuste."""
+    covariance = results['covariance']
+    if covariance is None:
+        return np.nan
+    names = [name for name, par in results['params_lmfit'].items()
+             if par.vary and not par.expr]
+    sigma = np.sqrt(np.abs(np.diag(covariance)))
+    rho = covariance / np.outer(sigma, sigma)
+    pares = []
+    for i, name in enumerate(names):
+        if '_Ea_' in f'_{name}':
+            pareja = name.replace('Ea_', 'A_') if name.replace('Ea_', 'A_') in names \
+                else name.replace('Ea_', 'ln_kref_')
+            pares.append(abs(rho[i, names.index(pareja)]))
+    return max(pares)
+
+
+def ajustar(fitter, parameterization, use_jacobian):
+    """Ajusta registrando el chi² de cada evaluación y contando los Jacobianos."""
+    n_jac = [0]
+    historial = []
+    residuals = fitter._residuals
+    residual_jacobian = fitter._residual_jacobian
+
+    def residuales_registrados(params):
+        r = residuals(params)
+        historial.append((time.perf_counter() - inicio, np.sum(r ** 2)))
+        return r
+
+    def jacobiano_contado(params):
+        n_jac[0] += 1
+        return residual_jacobian(params)
+
+    fitter._residuals = residuales_registrados
+    fitter._residual_jacobian = jacobiano_contado
+    inicio = time.perf_counter()
+    results = fitter.fit(verbose=False, max_nfev=MAX_NFEV, use_jacobian=use_jacobian,
+                         parameterization=parameterization)
+    wall = time.perf_counter() - inicio
+    del fitter._residuals, fitter._residual_jacobian
+
+    return {'nfev': results['nfev'], 'njev': n_jac[0], 's': wall, 'historial': historial,
+            'chisqr': results['chisqr'], 'max_rho': correlacion_arrhenius(results),
+            'success': results['success']}
+
+
+def tiempo_hasta(historial, chi2_meta):
+    """Tiempo de pared hasta la primera evaluación con chi² ≤ chi2_meta."""
+    for t, chi2 in historial:
+        if chi2 <= chi2_meta * (1 + 1e-6):
+            return t
+    return np.nan
+
+
+def main():
+    fitter = crear_ajustador()
+
+    print("=" * 78)
+    print("BENCHMARK: PARAMETRIZACIÓN DE ARRHENIUS (3 pasos reversible)")
+    print("=" * 78)
+    print(f"{'Parametriz.':<13}{'Jacobiano':<11}{'nfev':>6}{'njev':>6}{'total s':>9}"
+          f"{'a chi²_ref s':>14}{'chi²':>11}{'max |ρ|':>10}")
+    print("-" * 78)
+
+    chi2_ref = None
+    for parameterization in ['arrhenius', 'reference']:
+        for use_jacobian, nombre in [(False, 'dif. fin.'), (True, 'exacto')]:
+            r = ajustar(fitter, parameterization, use_jacobian)
+            if chi2_ref is None:
+                chi2_ref = r['chisqr']
+            print(f"{parameterization:<13}{nombre:<11}{r['nfev']:>6}{r['njev']:>6}{r['s']:>9.2f}"
+                  f"{tiempo_hasta(r['historial'], chi2_ref):>14.2f}{r['chisqr']:>11.4e}"
+                  f"{r['max_rho']:>10.6f}")
+    print("-" * 78)
+    print(f"chi²_ref = {chi2_ref:.4e} ('arrhenius' con diferencias finitas)")
+    print(f"T_ref = {fitter.T_ref:.1f} °C")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: costo por llamada de ParameterFitter._residuals
+==========================================================
+
+Compara la evaluación de residuales del ajuste con tres implementaciones:
+
+    - 'modelo nuevo': construye un KineticModel por llamada y lee los datos
+      con pandas (implementación original)
+    - 'pandas': modelo reutilizado, datos leídos con pandas en cada llamada
+    - 'compilado': problema compilado en fit() (arreglos contiguos, parámetros
+      actualizados en sitio, buffer de residuales preasignado)
+
+El sobrecosto es el tiempo por llamada menos el de las simulaciones solas
+(mismas llamadas a simulate() sin nada alrededor). Con el modelo de 1 paso
+irreversible (solución cerrada) el sobrecosto domina; con el de 3 pasos
+reversible domina la integración.
+
+Uso:
+    python benchmarks/bench_residuales.py
+
+Autor: Sistema de Modelado de Esterificación
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Agregar raíz del proyecto al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.kinetic_model import KineticModel
+from src.models.parameter_fitting import ParameterFitter
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+
+TEMPERATURAS = [45.0, 50.0, 55.0, 60.0, 65.0]   # °C, un experimento por temperatura
+TIEMPOS = np.linspace(0, 120, 13)               # min
+C0 = {'TG': 0.5, 'MeOH': 4.5}
+COMPONENTES = ['TG', 'DG', 'MG', 'FAME', 'GL']
+REPETICIONES = {'1-step': 300, '3-step': 15}
+
+
+def crear_ajustador(model_type, reversible):
+    """Ajustador con datos sintéticos del modelo de literatura."""
+    verdadero = KineticModel(model_type=model_type, reversible=reversible)
+    fitter = ParameterFitter(model_type=model_type, reversible=reversible)
+    for T in TEMPERATURAS:
+        results = verdadero.simulate((TIEMPOS[0], TIEMPOS[-1]), C0, t_eval=TIEMPOS,
+                                     temperature=T)
+        datos = {'time': TIEMPOS}
+        datos.update({f'C_{c}': results[f'C_{c}'] for c in COMPONENTES
+                      if f'C_{c}' in results})
+        fitter.add_experiment(pd.DataFrame(datos), T, C0)
+    return fitter
+
+
+def residuales_pandas(fitter, params, modelo_nuevo):
+    """Implementación original: pandas por llamada y listas de residuales."""
+    kinetic_params = fitter._lmfit_to_kinetic_params(params)
+    if modelo_nuevo:
+        model = KineticModel(model_type=fitter.model_type, reversible=fitter.reversible)
+    else:
+        model = fitter._sim_model
+
+    residuals = []
+    for exp in fitter.experimental_data:
+        t_exp = exp['data']['time'].values
+        results = model.simulate(t_span=(t_exp[0], t_exp[-1]), C0=exp['C0'], t_eval=t_exp,
+                                 temperature=exp['temperature'], params=kinetic_params)
+        for component in fitter.weights.keys():
+            col_name = f'C_{component}'
+            if col_name in exp['data'].columns:
+                residuals.extend(fitter.weights[component]
+                                 * (exp['data'][col_name].values - results[col_name]))
+    return np.array(residuals)
+
+
+def solo_simulaciones(fitter, params):
+    """Cota inferior: solo las llamadas a simulate()."""
+    kinetic_params = fitter._problem['kinetic_params']
+    for exp in fitter._problem['experiments']:
+        fitter._sim_model.simulate(exp['t_span'], exp['C0'], t_eval=exp['t'],
+                                   temperature=exp['temperature'], params=kinetic_params)
+
+
+def medir(funciones, params, repeticiones):
+    """
+    Mediana del tiempo por llamada (ms) de cada función.
+
+    Las funciones se alternan en cada repetición (la deriva del equipo afecta
+    a todas por igual) y A se perturba para evitar cachés.
+    """
+    nombre_A = next(name for name in params if 'A_forward' in name)
+    A0 = params[nombre_A].value
+    tiempos = np.empty((repeticiones, len(funciones)))
+    for i in range(repeticiones):
+        params[nombre_A].value = A0 * (1 + 1e-9 * i)
+        for j, funcion in enumerate(funciones):
+            inicio = time.perf_counter()
+            funcion(params)
+            tiempos[i, j] = time.perf_counter() - inicio
+    params[nombre_A].value = A0
+    return np.median(tiempos, axis=0) * 1000
+
+
+def main():
+    print("=" * 78)
+    print("BENCHMARK: RESIDUALES DEL AJUSTE (por llamada)")
+    print("=" * 78)
+    print(f"{'Modelo':<16}{'Implementación':<18}{'ms/llamada':>12}{'sobrecosto ms':>16}"
+          f"{'idénticos':>12}")
+    print("-" * 78)
+
+    for model_type, reversible in [('1-step', False), ('3-step', True)]:
+        fitter = crear_ajustador(model_type, reversible)
+        params = fitter.setup_parameters()
+        fitter._problem = fitter._compile_problem(params)
+        etiqueta = f"{model_type} {'rev' if reversible else 'irrev'}"
+        n = REPETICIONES[model_type]
+
+        referencia = residuales_pandas(fitter, params, modelo_nuevo=True)
+        casos = [
+            ('modelo nuevo', lambda p: residuales_pandas(fitter, p, modelo_nuevo=True)),
+            ('pandas', lambda p: residuales_pandas(fitter, p, modelo_nuevo=False)),
+            ('compilado', fitter._residuals),
+        ]
+        *tiempos, t_sim = medir([funcion for _, funcion in casos]
+                                + [lambda p: solo_simulaciones(fitter, p)], params, n)
+
+        for (nombre, funcion), ms in zip(casos, tiempos):
+            iguales = np.array_equal(funcion(params), referencia)
+            print(f"{etiqueta:<16}{nombre:<18}{ms:>12.3f}{ms - t_sim:>16.3f}"
+                  f"{'sí' if iguales else 'no':>12}")
+        print(f"{etiqueta:<16}{'(solo simulate)':<18}{t_sim:>12.3f}")
+        print("-" * 78)
+
+
+if __name__ == "__main__":
+    main()
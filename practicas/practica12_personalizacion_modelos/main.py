@@ -5,69 +5,72 @@ Enfoque: AVANZADAS - Comparar modelo 1 paso vs 3 pasos y diferentes catalizadore
 """
 
 import json
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.integrate import odeint
 from pathlib import Path
 
-# ============================================================================
-# MODELOS CINÉTICOS
-# ============================================================================
+# Agregar el directorio raíz al path para importar módulos del sistema
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-def arrhenius(T_C, A, Ea):
-    """Ecuación de Arrhenius."""
-    R = 8.314e-3
-    T_K = T_C + 273.15
-    return A * np.exp(-Ea / (R * T_K))
+from src.models.kinetic_model import KineticModel
+from src.models.reaction_network import Reaction, ReactionNetwork
 
-def modelo_1_paso(y, t, k, relacion_molar):
-    """Modelo global simplificado de 1 paso: TG + 3 MeOH → 3 FAME + GL"""
-    X = y[0]
-    exceso = relacion_molar / 3.0
-    dXdt = k * (1 - X) * exceso
-    return [dXdt]
+# ============================================================================
+# MODELOS CINÉTICOS (redes de reacción declarativas)
+# ============================================================================
 
-def modelo_3_pasos(y, t, k1, k2, k3, k_inv1, k_inv2, k_inv3):
+def red_1_paso(parametros, relacion_molar):
+    """
+    Modelo global simplificado de 1 paso: TG + 3 MeOH → 3 FAME + GL
+
+    Pseudo-primer orden en TG con metanol en exceso: dX/dt = k·(1 - X)·R/3,
+    es decir, r = k'·C_TG con k' = k·R/3.
+    """
+    global_ = Reaction(
+        name='global',
+        reactants={'TG': 1, 'MeOH': 3},
+        products={'FAME': 3, 'GL': 1},
+        orders_forward={'TG': 1},
+        reversible=False,
+        A_forward=parametros['A'] * relacion_molar / 3.0,
+        Ea_forward=parametros['Ea'],
+    )
+    return ReactionNetwork(['TG', 'MeOH', 'FAME', 'GL'], [global_], name='1 paso')
+
+def red_3_pasos(parametros):
     """Modelo detallado de 3 pasos reversibles."""
-    C_TG, C_DG, C_MG, C_GL, C_MeOH, C_FAME = y
-
-    r1 = k1 * C_TG * C_MeOH - k_inv1 * C_DG * C_FAME
-    r2 = k2 * C_DG * C_MeOH - k_inv2 * C_MG * C_FAME
-    r3 = k3 * C_MG * C_MeOH - k_inv3 * C_GL * C_FAME
-
-    dC_TG = -r1
-    dC_DG = r1 - r2
-    dC_MG = r2 - r3
-    dC_GL = r3
-    dC_MeOH = -r1 - r2 - r3
-    dC_FAME = r1 + r2 + r3
-
-    return [dC_TG, dC_DG, dC_MG, dC_GL, dC_MeOH, dC_FAME]
+    gliceridos = ['TG', 'DG', 'MG', 'GL']
+    pasos = [
+        Reaction(
+            name=f'paso{i}',
+            reactants={gliceridos[i - 1]: 1, 'MeOH': 1},
+            products={gliceridos[i]: 1, 'FAME': 1},
+            A_forward=parametros[f'A{i}'], Ea_forward=parametros[f'Ea{i}'],
+            A_reverse=parametros[f'A_inv{i}'], Ea_reverse=parametros[f'Ea_inv{i}'],
+        )
+        for i in (1, 2, 3)
+    ]
+    return ReactionNetwork(['TG', 'DG', 'MG', 'GL', 'MeOH', 'FAME'], pasos, name='3 pasos')
 
 def simular_modelo_1_paso(T_C, tiempo, parametros, relacion_molar):
     """Simula con modelo de 1 paso."""
-    k = arrhenius(T_C, parametros['A'], parametros['Ea'])
-    y0 = [0.0]
-    sol = odeint(modelo_1_paso, y0, tiempo, args=(k, relacion_molar))
-    return sol[:, 0] * 100
+    modelo = KineticModel('custom', network=red_1_paso(parametros, relacion_molar),
+                          temperature=T_C)
+    resultados = modelo.simulate((tiempo[0], tiempo[-1]), {'TG': 1.0, 'MeOH': relacion_molar},
+                                 method='LSODA', t_eval=tiempo)
+    return resultados['conversion_%']
 
 def simular_modelo_3_pasos(T_C, tiempo, parametros, condiciones_iniciales):
     """Simula con modelo de 3 pasos."""
-    k1 = arrhenius(T_C, parametros['A1'], parametros['Ea1'])
-    k2 = arrhenius(T_C, parametros['A2'], parametros['Ea2'])
-    k3 = arrhenius(T_C, parametros['A3'], parametros['Ea3'])
-    k_inv1 = arrhenius(T_C, parametros['A_inv1'], parametros['Ea_inv1'])
-    k_inv2 = arrhenius(T_C, parametros['A_inv2'], parametros['Ea_inv2'])
-    k_inv3 = arrhenius(T_C, parametros['A_inv3'], parametros['Ea_inv3'])
-
-    y0 = [condiciones_iniciales['C_TG_0'], 0, 0, 0,
-          condiciones_iniciales['C_MeOH_0'], 0]
-    sol = odeint(modelo_3_pasos, y0, tiempo, args=(k1, k2, k3, k_inv1, k_inv2, k_inv3))
-
-    C_TG = sol[:, 0]
-    C_TG_0 = condiciones_iniciales['C_TG_0']
-    conversion = (C_TG_0 - C_TG) / C_TG_0 * 100
-    return conversion, sol
+    modelo = KineticModel('custom', network=red_3_pasos(parametros), temperature=T_C)
+
+    C0 = {'TG': condiciones_iniciales['C_TG_0'], 'MeOH': condiciones_iniciales['C_MeOH_0']}
+    resultados = modelo.simulate((tiempo[0], tiempo[-1]), C0, method='LSODA', t_eval=tiempo)
+
+    # Columnas en el orden de la red: TG, DG, MG, GL, MeOH, FAME
+    sol = resultados.y.T
+    return resultados['conversion_%'], sol
 
 # ============================================================================
 # VISUALIZACIÓN
@@ -145,20 +145,32 @@ class ParametricSweep:
         Ea = self.config['parametros_cineticos']['energia_activacion_J_mol']
 
         # Crear instancia del modelo
-        modelo = KineticModel(A=A, Ea=Ea)
+        # 'un_paso_irreversible' usa automáticamente la solución analítica
+        reversible = self.config['opciones_calculo'].get('modelo_tipo') != 'un_paso_irreversible'
+        modelo = KineticModel(
+            model_type='1-step',
+            reversible=reversible,
+            kinetic_params={
+                'A_forward': A,
+                'Ea_forward': Ea / 1000,  # J/mol → kJ/mol
+                'A_reverse': 0.0,
+                'Ea_reverse': 0.0,
+            },
+            temperature=T_celsius
+        )
 
         # Condiciones iniciales (simplificadas para ejemplo)
         # En implementación real, calcular a partir de masas y volumen
         C0_TG = 0.5  # mol/L (ejemplo)
         C0_MeOH = C0_TG * relacion_molar
-        C0 = [C0_TG, C0_MeOH, 0, 0]  # TG, MeOH, FAME, GL
+        C0 = {'TG': C0_TG, 'MeOH': C0_MeOH, 'FAME': 0, 'GL': 0}
 
         # Vector de tiempo
         t = np.linspace(0, tiempo_final, 100)
 
         # Resolver sistema
-        T_kelvin = T_celsius + 273.15
-        sol = modelo.resolver_sistema(C0, t, T_kelvin)
+        resultados = modelo.simulate((0, tiempo_final), C0, t_eval=t)
+        sol = np.column_stack([resultados[f'C_{s}'] for s in ['TG', 'MeOH', 'FAME', 'GL']])
 
         # Calcular conversión final
         conversion_final = (C0_TG - sol[-1, 0]) / C0_TG * 100
@@ -12,6 +12,14 @@ import matplotlib.pyplot as plt
 from matplotlib.patches import Circle
 import json
 import os
+import sys
+from pathlib import Path
+
+# Agregar raíz del proyecto al path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.models.kinetic_model import KineticModel
+from src.models.field_kinetics import FieldKinetics
 
 
 class PostprocesoCFD:
@@ -50,17 +58,11 @@ class PostprocesoCFD:
         # --- Campo de velocidades ---
         # Velocidad tangencial (rotación del ribbon impeller)
         # Mayor cerca del impulsor, menor cerca del centro y pared
-        v_theta = np.zeros_like(R_grid)
-        for i in range(nz):
-            z_pos = z[i] / H
-            # Perfil de velocidad: máximo a r = 0.7*R, decae hacia centro y pared
-            v_theta[i, :] = 0.5 * np.sin(np.pi * r / R) * (1 - abs(z_pos - 0.5))
-
-        # Velocidad axial (circulación)
-        v_z = np.zeros_like(R_grid)
-        for i in range(nz):
-            # Ascendente en centro, descendente en pared
-            v_z[i, :] = 0.2 * (1 - 2*(r/R)**2) * np.sin(2*np.pi*z[i]/H)
+        # Perfil de velocidad: máximo a r = 0.7*R, decae hacia centro y pared
+        v_theta = 0.5 * np.sin(np.pi * R_grid / R) * (1 - abs(Z_grid / H - 0.5))
+
+        # Velocidad axial (circulación): ascendente en centro, descendente en pared
+        v_z = 0.2 * (1 - 2*(R_grid/R)**2) * np.sin(2*np.pi*Z_grid/H)
 
         # --- Campo de temperatura ---
         # Temperatura ligeramente no uniforme por serpentín
@@ -69,16 +71,14 @@ class PostprocesoCFD:
         # --- Campo de conversión ---
         # Conversión aumenta con el tiempo de residencia (altura)
         # y es más uniforme cerca del impulsor (mezcla)
-        conversion = np.zeros_like(R_grid)
-        for i in range(nz):
-            z_frac = z[i] / H
-            r_frac = r / R
-            # Mayor conversión a mayor altura (más tiempo)
-            # Más uniforme en zona del ribbon (0.2 < z < 0.8)
-            if 0.2 < z_frac < 0.8:
-                conversion[i, :] = 85 + 10*z_frac + 2*np.random.randn(nr)
-            else:
-                conversion[i, :] = 70 + 15*z_frac + 5*(1-r_frac) + 3*np.random.randn(nr)
+        z_frac = Z_grid / H
+        r_frac = R_grid / R
+        ruido = np.random.randn(nz, nr)
+        # Mayor conversión a mayor altura (más tiempo)
+        # Más uniforme en zona del ribbon (0.2 < z < 0.8)
+        conversion = np.where((0.2 < z_frac) & (z_frac < 0.8),
+                              85 + 10*z_frac + 2*ruido,
+                              70 + 15*z_frac + 5*(1-r_frac) + 3*ruido)
 
         conversion = np.clip(conversion, 0, 100)
 
@@ -251,6 +251,68 @@ class PostprocesoCFD:
 
         return pct_zona_muerta
 
+    def analizar_cinetica_local(self, datos, rho=870.0):
+        """
+        Velocidad de reacción, calor liberado y Damköhler local sobre la malla
+
+        Los términos fuente se evalúan sobre los campos completos en una sola
+        pasada vectorizada (FieldKinetics). El Damköhler compara la
+        constante de consumo de TG con el tiempo local de circulación H/|v|.
+        """
+        print("\n⚗️  Analizando cinética local...")
+
+        # Las fracciones másicas sintéticas no son consistentes con el
+        # equilibrio químico: se usa solo la cinética directa
+        modelo = KineticModel('1-step', reversible=False)
+        cinetica = FieldKinetics(modelo)
+
+        Y = {especie: datos[f'Y_{especie}'] for especie in ['TG', 'MeOH', 'FAME', 'GL']}
+        C = cinetica.concentrations_from_mass_fractions(Y, rho)
+
+        H = datos['z'][-1]
+        v_mag = np.sqrt(datos['v_theta']**2 + datos['v_z']**2)
+        t_circulacion = H / np.maximum(v_mag, 1e-3) / 60  # min
+
+        campos = cinetica.evaluate(C, datos['T'] - 273.15, t_ref=t_circulacion)
+
+        q_kW = campos['q_W_m3'] / 1000
+        Da = campos['Da']
+        pct_limitado_mezcla = np.sum(Da > 1) / Da.size * 100
+
+        print(f"  - Calor liberado promedio: {np.mean(q_kW):.2f} kW/m³ (máx. {np.max(q_kW):.2f})")
+        print(f"  - Damköhler local: mediana {np.median(Da):.2f}, máx. {np.max(Da):.2f}")
+        print(f"  - Volumen limitado por mezcla (Da > 1): {pct_limitado_mezcla:.2f}%")
+
+        fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+
+        im1 = axes[0].contourf(datos['Z_grid']*100, datos['R_grid']*100,
+                               q_kW, levels=20, cmap='inferno')
+        axes[0].set_xlabel('Altura (cm)')
+        axes[0].set_ylabel('Radio (cm)')
+        axes[0].set_title('Calor Liberado por Reacción (kW/m³)')
+        plt.colorbar(im1, ax=axes[0])
+
+        im2 = axes[1].contourf(datos['Z_grid']*100, datos['R_grid']*100,
+                               np.log10(np.maximum(Da, 1e-6)), levels=20, cmap='RdYlBu_r')
+        axes[1].contour(datos['Z_grid']*100, datos['R_grid']*100, Da, levels=[1.0],
+                        colors='black', linewidths=2, linestyles='dashed')
+        axes[1].set_xlabel('Altura (cm)')
+        axes[1].set_ylabel('Radio (cm)')
+        axes[1].set_title('log₁₀ Damköhler Local (Da = 1 punteado)')
+        plt.colorbar(im2, ax=axes[1])
+
+        plt.tight_layout()
+        plt.savefig('resultados/campos_cfd/cinetica_local.png', dpi=150)
+        print("  ✓ Guardado: resultados/campos_cfd/cinetica_local.png")
+
+        return {
+            'calor_liberado_promedio_kW_m3': float(np.mean(q_kW)),
+            'calor_liberado_maximo_kW_m3': float(np.max(q_kW)),
+            'damkohler_mediana': float(np.median(Da)),
+            'damkohler_maximo': float(np.max(Da)),
+            'porcentaje_limitado_por_mezcla': float(pct_limitado_mezcla),
+        }
+
     def generar_perfiles_axiales(self, datos):
         """Generar perfiles axiales en diferentes radios"""
         print("\n📉 Generando perfiles axiales...")
@@ -296,7 +358,7 @@ class PostprocesoCFD:
         plt.savefig('resultados/campos_cfd/perfiles_axiales.png', dpi=150)
         print("  ✓ Guardado: resultados/campos_cfd/perfiles_axiales.png")
 
-    def generar_reporte(self, datos, pct_zona_muerta):
+    def generar_reporte(self, datos, pct_zona_muerta, cinetica=None):
         """Generar reporte de resultados"""
         print("\n📄 Generando reporte de resultados...")
 
@@ -331,6 +393,7 @@ class PostprocesoCFD:
                 'porcentaje_zona_muerta': float(pct_zona_muerta),
                 'calidad_mezcla': 'Buena' if pct_zona_muerta < 5 else 'Aceptable' if pct_zona_muerta < 10 else 'Pobre'
             },
+            'analisis_cinetico': cinetica or {},
             'conclusiones': [
                 f"Conversión promedio de {conversion_promedio:.1f}% ± {conversion_std:.1f}%",
                 f"Temperatura uniforme: {T_promedio:.1f}°C ± {T_std:.1f}°C",
@@ -371,10 +434,11 @@ def main():
 
     # Análisis avanzado
     pct_zona_muerta = postproc.analizar_zonas_muertas(datos)
+    cinetica = postproc.analizar_cinetica_local(datos)
     postproc.generar_perfiles_axiales(datos)
 
     # Reporte
-    postproc.generar_reporte(datos, pct_zona_muerta)
+    postproc.generar_reporte(datos, pct_zona_muerta, cinetica)
 
     print("\n" + "=" * 70)
     print(" " * 20 + "✅ POSTPROCESO COMPLETADO")
@@ -385,6 +449,7 @@ def main():
     print("  - conversion.png")
     print("  - especies.png")
     print("  - zonas_muertas.png")
+    print("  - cinetica_local.png")
     print("  - perfiles_axiales.png")
     print("  - reporte_cfd.json")
     print("\nRevisa analisis.md para interpretar los resultados.")
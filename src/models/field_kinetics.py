@@ -0,0 +1,243 @@
+"""
+Cinética Local sobre Campos CFD
+
+Evalúa sobre campos completos (arreglos de NumPy de cualquier forma, p. ej.
+la malla nr×nz de un postproceso o una exportación de Fluent) y en una sola
+pasada vectorizada por bloque:
+
+    - Velocidades netas de reacción r_j y de producción R_i = Σ_j S_ij·r_j
+    - Calor liberado q = -Σ_j ΔH_j·r_j (ReactionThermodynamics.delta_H_r)
+    - Número de Damköhler local Da = t_ref·k', con k' la constante de
+      pseudo-primer orden de consumo directo de la especie clave (TG)
+
+Los campos se recorren por bloques de celdas para acotar la memoria de los
+temporales, y evaluate_chunks() procesa mallas exportadas que no caben en
+memoria leyendo y escribiendo un bloque a la vez (p. ej. read_csv_chunks()).
+
+Author: Sistema de Modelado de Esterificación
+Date: 2025-11-19
+"""
+
+from typing import Dict, Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from .kinetic_model import KineticModel
+from .properties import ThermophysicalProperties, ReactionThermodynamics
+
+
+# Especie del modelo → clave de ThermophysicalProperties.MW (g/mol)
+SPECIES_MW_KEYS = {
+    'TG': 'average_TG',
+    'DG': 'average_DG',
+    'MG': 'average_MG',
+    'FAME': 'average_FAME',
+    'MeOH': 'methanol',
+    'GL': 'glycerol',
+}
+
+# Reacción de las redes integradas → clave de ReactionThermodynamics.delta_H_r
+REACTION_ENTHALPY_KEYS = {
+    '1-step': {'global': '1-step'},
+    '3-step': {'step1': 'step1_TG_DG', 'step2': 'step2_DG_MG', 'step3': 'step3_MG_GL'},
+}
+
+# kJ/(L·min) → W/m³
+KJ_PER_L_MIN_TO_W_PER_M3 = 1000.0 * 1000.0 / 60.0
+
+
+class FieldKinetics:
+    """
+    Términos fuente de reacción evaluados sobre campos completos.
+
+    Attributes:
+        model (KineticModel): Modelo cinético (red, parámetros, reversibilidad)
+        species (List[str]): Especies del modelo
+        delta_H (np.ndarray): Entalpía de cada reacción (kJ/mol de avance)
+        key_species (str): Especie de referencia del número de Damköhler
+    """
+
+    def __init__(self,
+                 model: KineticModel,
+                 delta_H: Optional[Dict[str, float]] = None,
+                 key_species: str = 'TG'):
+        """
+        Inicializa el evaluador.
+
+        Args:
+            model: Instancia de KineticModel
+            delta_H: Entalpías {reacción: kJ/mol} (si None, las de
+                     ReactionThermodynamics para las redes integradas)
+            key_species: Especie de referencia del número de Damköhler
+
+        Raises:
+            ValueError: Si falta la entalpía de alguna reacción
+        """
+        self.model = model
+        self.species = list(model.species)
+        self.key_species = key_species
+
+        if delta_H is None:
+            thermo = ReactionThermodynamics()
+            keys = REACTION_ENTHALPY_KEYS.get(model.model_type, {})
+            delta_H = {name: thermo.delta_H_r[key] for name, key in keys.items()}
+        missing = [name for name in model.network.reaction_names if name not in delta_H]
+        if missing:
+            raise ValueError(f"Falta la entalpía de reacción de: {missing}")
+        self.delta_H = np.array([delta_H[name] for name in model.network.reaction_names])
+
+        # Consumo directo de la especie clave en cada reacción (|ν| de reactivo)
+        S_key = model.network.S[self.species.index(key_species)]
+        self._key_consumption = np.maximum(-S_key, 0.0)
+
+    # ------------------------------------------------------------------
+    # Conversión de campos
+    # ------------------------------------------------------------------
+
+    def concentrations_from_mass_fractions(self,
+                                           Y: Dict[str, np.ndarray],
+                                           rho) -> Dict[str, np.ndarray]:
+        """
+        Concentraciones molares C_i = ρ·Y_i / MW_i (mol/L).
+
+        Args:
+            Y: Fracciones másicas {especie: campo}
+            rho: Densidad de la mezcla (kg/m³), escalar o campo
+
+        Returns:
+            Dict {especie: campo de concentración (mol/L)}
+        """
+        MW = ThermophysicalProperties().MW
+        return {species: np.asarray(rho) * np.asarray(Y[species]) / MW[SPECIES_MW_KEYS[species]]
+                for species in Y}
+
+    # ------------------------------------------------------------------
+    # Evaluación
+    # ------------------------------------------------------------------
+
+    def _evaluate_flat(self, C: np.ndarray, T: np.ndarray,
+                       t_ref: Optional[np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Evalúa un bloque de celdas.
+
+        Args:
+            C: Concentraciones, forma (n_especies, m)
+            T: Temperaturas (°C), forma (m,)
+            t_ref: Tiempos de referencia (min), forma (m,) o None
+
+        Returns:
+            Dict con los campos del bloque, forma (m,)
+        """
+        network = self.model.network
+        k_f, k_r = self.model.rate_constant_array(T)
+        k_f, k_r = k_f.T, k_r.T                                   # (n_reacciones, m)
+
+        P_f, _ = network.mass_action_terms(C)
+        r = network.rates(C, k_f, k_r)                            # (n_reacciones, m)
+        R = network.S @ r                                         # (n_especies, m)
+
+        results = {f'r_{name}': r[j] for j, name in enumerate(network.reaction_names)}
+        results.update({f'R_{species}': R[i] for i, species in enumerate(self.species)})
+        results['q_W_m3'] = -(self.delta_H @ r) * KJ_PER_L_MIN_TO_W_PER_M3
+
+        # k' = consumo directo de la especie clave por unidad de concentración
+        C_key = C[self.species.index(self.key_species)]
+        consumption = self._key_consumption @ (k_f * P_f)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            k_eff = np.where(C_key > 0, consumption / C_key, 0.0)
+        results['k_eff'] = k_eff
+        if t_ref is not None:
+            results['Da'] = t_ref * k_eff
+        return results
+
+    def evaluate(self,
+                 C: Dict[str, np.ndarray],
+                 T_celsius,
+                 t_ref=None,
+                 chunk_size: int = 65536) -> Dict[str, np.ndarray]:
+        """
+        Términos fuente sobre campos completos (por bloques de celdas).
+
+        Args:
+            C: Concentraciones {especie: campo (mol/L)}; las especies ausentes
+               se toman como cero. Todos los campos tienen la misma forma
+            T_celsius: Temperatura (°C), escalar o campo
+            t_ref: Tiempo de referencia para Da (min): escalar o campo (p. ej.
+                   tiempo local de circulación). Si None, no se calcula Da
+            chunk_size: Celdas por bloque
+
+        Returns:
+            Dict de campos con la forma de entrada: 'r_<reacción>' y
+            'R_<especie>' (mol/(L·min)), 'q_W_m3' (calor liberado, W/m³),
+            'k_eff' (1/min) y 'Da' (si se da t_ref)
+        """
+        shape = np.shape(next(iter(C.values())))
+        n_cells = int(np.prod(shape))
+        flat = {species: np.broadcast_to(np.asarray(C.get(species, 0.0), dtype=float),
+                                         shape).reshape(-1)
+                for species in self.species}
+        T = np.broadcast_to(np.asarray(T_celsius, dtype=float), shape).reshape(-1)
+        if t_ref is not None:
+            t_ref = np.broadcast_to(np.asarray(t_ref, dtype=float), shape).reshape(-1)
+
+        out = None
+        for start in range(0, n_cells, chunk_size):
+            block = slice(start, start + chunk_size)
+            C_block = np.stack([flat[species][block] for species in self.species])
+            results = self._evaluate_flat(C_block, T[block],
+                                          None if t_ref is None else t_ref[block])
+            if out is None:
+                out = {key: np.empty(n_cells) for key in results}
+            for key, values in results.items():
+                out[key][block] = values
+
+        return {key: values.reshape(shape) for key, values in out.items()}
+
+    def evaluate_chunks(self,
+                        chunks: Iterable[Dict[str, np.ndarray]],
+                        temperature_key: str = 'T',
+                        t_ref_key: Optional[str] = None,
+                        kelvin: bool = False) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Evalúa una malla exportada bloque a bloque (sin cargarla completa).
+
+        Args:
+            chunks: Iterable de bloques {columna: arreglo} con las
+                    concentraciones de las especies (mol/L) y la temperatura
+            temperature_key: Columna de temperatura
+            t_ref_key: Columna del tiempo de referencia de Da (min), opcional
+            kelvin: Si la temperatura está en K (exportaciones de Fluent)
+
+        Yields:
+            Dict con los campos de cada bloque (ver evaluate())
+        """
+        for chunk in chunks:
+            T = np.asarray(chunk[temperature_key], dtype=float)
+            if kelvin:
+                T = T - 273.15
+            C = {species: np.asarray(chunk[species], dtype=float)
+                 for species in self.species if species in chunk}
+            t_ref = None if t_ref_key is None else chunk[t_ref_key]
+            yield self.evaluate(C, T, t_ref=t_ref, chunk_size=len(T) or 1)
+
+
+def read_csv_chunks(filepath: str,
+                    chunk_size: int = 100000,
+                    columns: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Lee una exportación CSV de la malla por bloques de filas.
+
+    Args:
+        filepath: Archivo CSV (una fila por celda)
+        chunk_size: Filas por bloque
+        columns: Renombrado {columna del archivo: nombre} (p. ej.
+                 {'temperature': 'T', 'molef-tg': 'TG'})
+
+    Yields:
+        Dict {columna: arreglo} de cada bloque
+    """
+    for frame in pd.read_csv(filepath, chunksize=chunk_size, skipinitialspace=True):
+        if columns:
+            frame = frame.rename(columns=columns)
+        yield {column: frame[column].to_numpy() for column in frame.columns}
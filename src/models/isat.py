@@ -0,0 +1,512 @@
+"""
+Tabulación Adaptativa In Situ (ISAT) de la Química para Acoplamiento CFD
+
+En el desdoblamiento de operadores (operator splitting) de un CFD, cada
+celda integra la química a temperatura constante durante el paso Δt:
+
+    φ = (C_1, …, C_n, T)  →  R(φ) = C(Δt)
+
+ISATTable aproxima R con registros linealizados (Pope, 1997):
+
+    R(φ) ≈ R(φ_0) + A·(φ - φ_0),   A = ∂R/∂φ
+
+cada uno válido dentro de su elipsoide de precisión (EOA)
+{φ : (φ - φ_0)ᵀ M (φ - φ_0) ≤ 1}, en variables escaladas. Para cada consulta:
+
+    1. Recuperación: si φ cae en el EOA de uno de los registros más cercanos
+       (árbol KD sobre los centros), se usa la aproximación lineal
+    2. Si no, integración directa (exacta) y, según el error ‖R - R_lin‖ del
+       registro más cercano:
+         - ≤ tol: crecimiento del EOA hasta incluir φ
+         - > tol: se agrega un registro nuevo (A por diferencias finitas con
+           las d + 1 corridas integradas juntas en simulate_batch)
+
+tol acota el error de la aproximación lineal en los puntos con los que se
+crece cada EOA; como en todo ISAT, el error de recuperación en el interior
+puede superarlo ligeramente (típicamente 2-3 veces tol).
+
+Las consultas se procesan por bloques de celdas (recuperación vectorizada),
+de modo que un paso de química sobre 10⁵–10⁶ celdas se vuelve
+principalmente búsquedas en la tabla. La tabla se guarda en .npz y se
+exporta como encabezado C para la UDF de Fluent
+(practicas/practica9_upscaling_cfd/parte_D_udf_cinetica.c).
+
+Author: Sistema de Modelado de Esterificación
+Date: 2025-11-19
+"""
+
+import json
+from typing import Dict, Optional
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from .kinetic_model import KineticModel
+
+
+# Versión del formato de archivo
+ISAT_FORMAT_VERSION = 1
+
+# Paso relativo (en variables escaladas) de las diferencias finitas de A
+FD_STEP = 1e-4
+
+# Corridas por integración directa conjunta (simulate_batch)
+DIRECT_BATCH_SIZE = 256
+
+# Registros nuevos que se acumulan antes de reconstruir el árbol KD
+TREE_REBUILD_EVERY = 64
+
+
+class ISATTable:
+    """
+    Tabla ISAT de la composición reaccionada C(Δt) a temperatura constante.
+
+    Attributes:
+        model (KineticModel): Modelo cinético que se tabula
+        dt (float): Paso de química Δt (min)
+        tol (float): Error admitido en la composición escalada (‖ΔC/C_scale‖₂)
+        C_scale (np.ndarray): Escala de concentración por especie (mol/L)
+        T_scale (float): Escala de temperatura (°C)
+        max_records (int): Registros máximos (después solo integración directa)
+        stats (Dict): Contadores 'retrieve', 'grow', 'add', 'direct'
+    """
+
+    def __init__(self,
+                 model: KineticModel,
+                 dt: float,
+                 tol: float = 1e-4,
+                 C_scale: Optional[Dict[str, float]] = None,
+                 T_scale: float = 10.0,
+                 max_records: int = 50000,
+                 n_candidates: int = 8,
+                 max_radius: float = 1.0,
+                 method: str = 'LSODA',
+                 rtol: float = 1e-9,
+                 atol: float = 1e-12):
+        """
+        Inicializa una tabla vacía.
+
+        Args:
+            model: Instancia de KineticModel
+            dt: Paso de química Δt (min)
+            tol: Error admitido en la composición escalada
+            C_scale: Escalas de concentración {especie: mol/L} (por defecto 1)
+            T_scale: Escala de temperatura (°C)
+            max_records: Registros máximos
+            n_candidates: Registros cercanos que se prueban en cada consulta
+            max_radius: Semieje máximo de los EOA iniciales (variables escaladas)
+            method: Método de integración directa ('Radau', 'BDF', 'LSODA')
+            rtol: Tolerancia relativa de la integración directa
+            atol: Tolerancia absoluta de la integración directa
+        """
+        self.model = model
+        self.species = list(model.species)
+        self.dt = float(dt)
+        self.tol = float(tol)
+        C_scale = C_scale or {}
+        self.C_scale = np.array([C_scale.get(species, 1.0) for species in self.species])
+        self.T_scale = float(T_scale)
+        self.max_records = max_records
+        self.n_candidates = n_candidates
+        self.max_radius = max_radius
+        self.method = method
+        self.rtol = rtol
+        self.atol = atol
+
+        n = len(self.species)
+        d = n + 1
+        self.phi0 = np.empty((0, d))    # centros escalados
+        self.R0 = np.empty((0, n))      # composición reaccionada escalada
+        self.A = np.empty((0, n, d))    # ∂R/∂φ escalado
+        self.M = np.empty((0, d, d))    # EOA: δᵀ M δ ≤ 1
+        self.stats = {'retrieve': 0, 'grow': 0, 'add': 0, 'direct': 0}
+
+        self._tree = None
+        self._n_indexed = 0
+
+    @property
+    def n_records(self) -> int:
+        return len(self.phi0)
+
+    @property
+    def _phi_scale(self) -> np.ndarray:
+        return np.append(self.C_scale, self.T_scale)
+
+    # ------------------------------------------------------------------
+    # Integración directa
+    # ------------------------------------------------------------------
+
+    def _integrate(self, x: np.ndarray) -> np.ndarray:
+        """
+        Composición reaccionada escalada de los estados escalados x (m, d).
+
+        Todas las corridas se integran en una sola llamada a simulate_batch.
+        """
+        phi = np.maximum(x * self._phi_scale, 0.0)
+        phi[:, -1] = x[:, -1] * self.T_scale
+        C0_list = [dict(zip(self.species, row[:-1])) for row in phi]
+        results = self.model.simulate_batch((0.0, self.dt), C0_list, temperatures=phi[:, -1],
+                                            method=self.method, t_eval=np.array([self.dt]),
+                                            rtol=self.rtol, atol=self.atol)
+        return results['C'][:, -1, :] / self.C_scale
+
+    def _linearize(self, x: np.ndarray) -> np.ndarray:
+        """Matriz A = ∂R/∂φ (escalada) en x por diferencias finitas hacia adelante."""
+        steps = FD_STEP * np.maximum(np.abs(x), 1.0)
+        X = np.vstack([x, x + np.diag(steps)])
+        R = self._integrate(X)
+        return ((R[1:] - R[0]) / steps[:, None]).T
+
+    def _initial_eoa(self, A: np.ndarray) -> np.ndarray:
+        """
+        EOA inicial {δ : ‖A δ‖ ≤ tol}, con semiejes acotados por max_radius.
+        """
+        _, sigma, Vt = np.linalg.svd(A, full_matrices=True)
+        sigma_full = np.zeros(Vt.shape[0])
+        sigma_full[:len(sigma)] = sigma
+        sigma_full = np.maximum(sigma_full, self.tol / self.max_radius)
+        return (Vt.T * (sigma_full / self.tol) ** 2) @ Vt
+
+    # ------------------------------------------------------------------
+    # Búsqueda
+    # ------------------------------------------------------------------
+
+    def _candidates(self, x: np.ndarray) -> np.ndarray:
+        """Índices de los registros candidatos de cada punto, forma (m, k)."""
+        if self._tree is None or self.n_records - self._n_indexed > TREE_REBUILD_EVERY:
+            self._tree = cKDTree(self.phi0)
+            self._n_indexed = self.n_records
+        k = min(self.n_candidates, self._n_indexed)
+        _, idx = self._tree.query(x, k=k)
+        idx = idx.reshape(len(x), k)
+        # Registros aún no indexados: se prueban todos
+        pending = np.arange(self._n_indexed, self.n_records)
+        if len(pending):
+            idx = np.hstack([idx, np.broadcast_to(pending, (len(x), len(pending)))])
+        return idx
+
+    def _retrieve(self, x: np.ndarray):
+        """
+        Recuperación vectorizada.
+
+        Returns:
+            Tupla (R, found): composición escalada aproximada (m, n) y máscara
+            de los puntos dentro de algún EOA
+        """
+        R = np.full((len(x), len(self.species)), np.nan)
+        found = np.zeros(len(x), dtype=bool)
+        if self.n_records == 0:
+            return R, found
+
+        idx = self._candidates(x)
+        delta = x[:, None, :] - self.phi0[idx]                   # (m, k, d)
+        q = np.einsum('mki,mkij,mkj->mk', delta, self.M[idx], delta)
+        found = (q <= 1.0).any(axis=1)
+        rows = np.nonzero(found)[0]
+        # Entre los EOA que contienen el punto, el de menor distancia relativa
+        best = idx[rows, np.argmin(q[rows], axis=1)]
+        R[rows] = self.R0[best] + np.einsum('mij,mj->mi', self.A[best],
+                                            x[rows] - self.phi0[best])
+        return R, found
+
+    def _nearest(self, x: np.ndarray) -> int:
+        """Registro de centro más cercano a x (árbol + registros pendientes)."""
+        idx = self._candidates(x[None, :])[0]
+        return int(idx[np.argmin(np.sum((self.phi0[idx] - x) ** 2, axis=1))])
+
+    # ------------------------------------------------------------------
+    # Crecimiento y registro
+    # ------------------------------------------------------------------
+
+    def _grow(self, i: int, x: np.ndarray):
+        """
+        Crece el EOA del registro i (centro fijo) hasta incluir x.
+
+        Con M = L Lᵀ y p = Lᵀ(x - φ_0), el elipsoide mínimo centrado que
+        contiene la esfera unitaria y p es I - (1 - 1/|p|²) p̂ p̂ᵀ.
+        """
+        L = np.linalg.cholesky(self.M[i])
+        p = L.T @ (x - self.phi0[i])
+        norm2 = p @ p
+        if norm2 <= 1.0:
+            return
+        p_hat = p / np.sqrt(norm2)
+        self.M[i] = L @ (np.eye(len(p)) - (1 - 1 / norm2) * np.outer(p_hat, p_hat)) @ L.T
+
+    def _add(self, x: np.ndarray, R: np.ndarray):
+        """Agrega un registro en x con resultado exacto R."""
+        A = self._linearize(x)
+        self.phi0 = np.vstack([self.phi0, x])
+        self.R0 = np.vstack([self.R0, R])
+        self.A = np.concatenate([self.A, A[None]])
+        self.M = np.concatenate([self.M, self._initial_eoa(A)[None]])
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+
+    def react(self,
+              C: np.ndarray,
+              T_celsius,
+              chunk_size: int = 20000) -> np.ndarray:
+        """
+        Composición tras el paso de química Δt en cada celda.
+
+        Args:
+            C: Concentraciones por celda, forma (m, n_especies) en el orden de
+               model.species (mol/L)
+            T_celsius: Temperatura por celda (°C), escalar o forma (m,)
+            chunk_size: Celdas por bloque de recuperación vectorizada
+
+        Returns:
+            Concentraciones reaccionadas, forma (m, n_especies)
+        """
+        C = np.atleast_2d(np.asarray(C, dtype=float))
+        T = np.broadcast_to(np.asarray(T_celsius, dtype=float), (len(C),))
+        out = np.empty_like(C)
+        for start in range(0, len(C), chunk_size):
+            block = slice(start, start + chunk_size)
+            x = np.column_stack([C[block] / self.C_scale, T[block] / self.T_scale])
+            out[block] = self._react_scaled(x) * self.C_scale
+        return out
+
+    def _react_scaled(self, x: np.ndarray) -> np.ndarray:
+        R, found = self._retrieve(x)
+        self.stats['retrieve'] += int(found.sum())
+
+        misses = np.nonzero(~found)[0]
+        if len(misses) == 0:
+            return R
+
+        # Resultado exacto de las celdas no cubiertas, integradas por lotes
+        for batch in np.array_split(misses, -(-len(misses) // DIRECT_BATCH_SIZE)):
+            R[batch] = self._integrate(x[batch])
+        self.stats['direct'] += len(misses)
+
+        # Actualización secuencial de la tabla (cada registro nuevo cubre a los siguientes)
+        for m in misses:
+            if self.n_records > 0:
+                i = self._nearest(x[m])
+                delta = x[m] - self.phi0[i]
+                if delta @ self.M[i] @ delta <= 1.0:
+                    continue
+                error = np.linalg.norm(R[m] - self.R0[i] - self.A[i] @ delta)
+                if error <= self.tol:
+                    self._grow(i, x[m])
+                    self.stats['grow'] += 1
+                    continue
+            if self.n_records < self.max_records:
+                self._add(x[m], R[m])
+                self.stats['add'] += 1
+        return R
+
+    # ------------------------------------------------------------------
+    # Persistencia y exportación
+    # ------------------------------------------------------------------
+
+    def _meta(self) -> Dict:
+        return {'format_version': ISAT_FORMAT_VERSION, 'species': self.species,
+                'dt': self.dt, 'tol': self.tol, 'C_scale': self.C_scale.tolist(),
+                'T_scale': self.T_scale, 'model': self.model.get_info()}
+
+    def save(self, filepath: str):
+        """Guarda los registros en un archivo .npz comprimido."""
+        np.savez_compressed(filepath, phi0=self.phi0, R0=self.R0, A=self.A, M=self.M,
+                            meta=json.dumps(self._meta(), default=str))
+
+    def load(self, filepath: str):
+        """
+        Carga registros guardados con save() (mismo modelo, Δt y escalas).
+
+        Raises:
+            ValueError: Si el archivo es de otro formato, especies, Δt o escalas
+        """
+        with np.load(filepath) as data:
+            meta = json.loads(str(data['meta']))
+            if (meta['format_version'] != ISAT_FORMAT_VERSION
+                    or meta['species'] != self.species or meta['dt'] != self.dt
+                    or not np.allclose(meta['C_scale'], self.C_scale)
+                    or meta['T_scale'] != self.T_scale):
+                raise ValueError("Tabla ISAT incompatible con esta configuración")
+            self.phi0, self.R0, self.A, self.M = (data[key] for key in ('phi0', 'R0', 'A', 'M'))
+        self._tree = None
+        self._n_indexed = 0
+
+    def _partition_tree(self, leaf_size: int):
+        """
+        Árbol KD estático de los centros para la exportación a C.
+
+        Cada nodo divide por la mediana de la coordenada de mayor rango; las
+        hojas guardan hasta leaf_size registros. Los puntos del hijo izquierdo
+        tienen coordenada ≤ división y los del derecho ≥ división.
+
+        Returns:
+            Tupla (nodos, orden, profundidad): nodos (dim, división, izq, der),
+            con dim = -1 en las hojas e [izq, der) su tramo de orden; orden es
+            la permutación de los registros
+        """
+        order = np.arange(self.n_records)
+        nodes = []
+        depth = [0]
+
+        def build(lo: int, hi: int, level: int) -> int:
+            node = len(nodes)
+            nodes.append([-1, 0.0, lo, hi])
+            depth[0] = max(depth[0], level)
+            points = self.phi0[order[lo:hi]]
+            if hi - lo <= leaf_size:
+                return node
+            spread = points.max(axis=0) - points.min(axis=0)
+            dim = int(np.argmax(spread))
+            if spread[dim] == 0:
+                return node
+            order[lo:hi] = order[lo:hi][np.argsort(points[:, dim], kind='stable')]
+            mid = (lo + hi) // 2
+            split = float(self.phi0[order[mid], dim])
+            left = build(lo, mid, level + 1)
+            right = build(mid, hi, level + 1)
+            nodes[node] = [dim, split, left, right]
+            return node
+
+        if self.n_records:
+            build(0, self.n_records, 0)
+        return nodes, order, depth[0]
+
+    def export_c_header(self, filepath: str, prefix: str = 'ISAT', leaf_size: int = 8):
+        """
+        Exporta la tabla como encabezado C para la UDF de Fluent.
+
+        El encabezado define los registros en variables escaladas, un árbol KD
+        de sus centros y la función <prefix>_retrieve(C, T_K, C_out), que
+        busca en el árbol los n_candidates centros más cercanos (como
+        react()), retorna 1 y escribe la composición reaccionada si el estado
+        cae en alguno de sus EOA, o 0 si la UDF debe calcular las velocidades
+        directamente. El costo por celda es logarítmico en el número de
+        registros.
+
+        Args:
+            filepath: Ruta del archivo .h
+            prefix: Prefijo de macros y símbolos
+            leaf_size: Registros máximos por hoja del árbol
+        """
+        n = len(self.species)
+        d = n + 1
+        scale = self._phi_scale
+        nodes, order, depth = self._partition_tree(leaf_size)
+        k = max(1, min(self.n_candidates, self.n_records))
+
+        def array(values, fmt='.17g') -> str:
+            return ', '.join(f'{v:{fmt}}' for v in np.ravel(values)) or '0'
+
+        def column(j):
+            return [node[j] for node in nodes]
+
+        lines = [
+            '/* Tabla ISAT generada por src/models/isat.py */',
+            f'/* Especies (orden de C): {", ".join(self.species)} */',
+            f'/* Paso de química: {self.dt:g} min ({self.dt * 60:g} s); '
+            f'tolerancia {self.tol:g} (composición escalada) */',
+            f'#ifndef {prefix}_TABLE_H',
+            f'#define {prefix}_TABLE_H',
+            '',
+            f'#define {prefix}_N_RECORDS {self.n_records}',
+            f'#define {prefix}_N_SPECIES {n}',
+            f'#define {prefix}_N_CANDIDATES {k}',
+            f'#define {prefix}_TREE_DEPTH {depth}',
+            f'#define {prefix}_T_OFFSET 273.15',
+            '',
+            f'static const double {prefix}_SCALE[{d}] = {{{array(scale)}}};',
+            f'static const double {prefix}_PHI0[{max(self.n_records, 1) * d}] = '
+            f'{{{array(self.phi0)}}};',
+            f'static const double {prefix}_R0[{max(self.n_records, 1) * n}] = '
+            f'{{{array(self.R0)}}};',
+            f'static const double {prefix}_A[{max(self.n_records, 1) * n * d}] = '
+            f'{{{array(self.A)}}};',
+            f'static const double {prefix}_M[{max(self.n_records, 1) * d * d}] = '
+            f'{{{array(self.M)}}};',
+            '',
+            '/* Árbol KD: dim < 0 en las hojas, con registros ORDER[left..right) */',
+            f'static const int {prefix}_NODE_DIM[{max(len(nodes), 1)}] = '
+            f'{{{array(column(0), "d")}}};',
+            f'static const double {prefix}_NODE_SPLIT[{max(len(nodes), 1)}] = '
+            f'{{{array(column(1))}}};',
+            f'static const int {prefix}_NODE_LEFT[{max(len(nodes), 1)}] = '
+            f'{{{array(column(2), "d")}}};',
+            f'static const int {prefix}_NODE_RIGHT[{max(len(nodes), 1)}] = '
+            f'{{{array(column(3), "d")}}};',
+            f'static const int {prefix}_ORDER[{max(self.n_records, 1)}] = '
+            f'{{{array(order, "d")}}};',
+            '',
+            f'static int {prefix}_retrieve(const double *C, double T_K, double *C_out)',
+            '{',
+            f'    double x[{d}], delta[{d}];',
+            f'    double best_dist[{prefix}_N_CANDIDATES], stack_dist[{prefix}_TREE_DEPTH + 2];',
+            f'    int best_rec[{prefix}_N_CANDIDATES], stack_node[{prefix}_TREE_DEPTH + 2];',
+            '    int n_best = 0, top = 0, best = -1;',
+            '    double q_best = 1.0;',
+            '    int i, j, k, c;',
+            f'    if ({prefix}_N_RECORDS == 0) return 0;',
+            f'    for (j = 0; j < {n}; j++) x[j] = C[j] / {prefix}_SCALE[j];',
+            f'    x[{n}] = (T_K - {prefix}_T_OFFSET) / {prefix}_SCALE[{n}];',
+            '',
+            '    /* Centros más cercanos: búsqueda en profundidad con poda por plano */',
+            '    stack_node[0] = 0;',
+            '    stack_dist[0] = 0.0;',
+            '    top = 1;',
+            '    while (top > 0) {',
+            '        int node = stack_node[--top];',
+            f'        if (n_best == {prefix}_N_CANDIDATES && stack_dist[top] > best_dist[n_best - 1])',
+            '            continue;',
+            f'        while ({prefix}_NODE_DIM[node] >= 0) {{',
+            f'            double diff = x[{prefix}_NODE_DIM[node]] - {prefix}_NODE_SPLIT[node];',
+            f'            int near_child = diff <= 0.0 ? {prefix}_NODE_LEFT[node] : {prefix}_NODE_RIGHT[node];',
+            f'            stack_node[top] = diff <= 0.0 ? {prefix}_NODE_RIGHT[node] : {prefix}_NODE_LEFT[node];',
+            '            stack_dist[top++] = diff * diff;',
+            '            node = near_child;',
+            '        }',
+            f'        for (c = {prefix}_NODE_LEFT[node]; c < {prefix}_NODE_RIGHT[node]; c++) {{',
+            f'            int r = {prefix}_ORDER[c];',
+            f'            const double *phi0 = {prefix}_PHI0 + r * {d};',
+            '            double dist = 0.0;',
+            f'            for (j = 0; j < {d}; j++) dist += (x[j] - phi0[j]) * (x[j] - phi0[j]);',
+            f'            if (n_best == {prefix}_N_CANDIDATES && dist >= best_dist[n_best - 1]) continue;',
+            f'            if (n_best < {prefix}_N_CANDIDATES) n_best++;',
+            '            for (i = n_best - 1; i > 0 && best_dist[i - 1] > dist; i--) {',
+            '                best_dist[i] = best_dist[i - 1];',
+            '                best_rec[i] = best_rec[i - 1];',
+            '            }',
+            '            best_dist[i] = dist;',
+            '            best_rec[i] = r;',
+            '        }',
+            '    }',
+            '',
+            '    /* Entre los EOA que contienen el estado, el de menor distancia relativa */',
+            '    for (c = 0; c < n_best; c++) {',
+            '        int r = best_rec[c];',
+            f'        const double *phi0 = {prefix}_PHI0 + r * {d};',
+            f'        const double *M = {prefix}_M + r * {d * d};',
+            '        double q = 0.0;',
+            f'        for (j = 0; j < {d}; j++) delta[j] = x[j] - phi0[j];',
+            f'        for (j = 0; j < {d}; j++)',
+            f'            for (k = 0; k < {d}; k++) q += delta[j] * M[j * {d} + k] * delta[k];',
+            '        if (q <= q_best) {',
+            '            q_best = q;',
+            '            best = r;',
+            '        }',
+            '    }',
+            '    if (best < 0) return 0;',
+            '',
+            f'    for (j = 0; j < {d}; j++) delta[j] = x[j] - {prefix}_PHI0[best * {d} + j];',
+            f'    for (i = 0; i < {n}; i++) {{',
+            f'        double R = {prefix}_R0[best * {n} + i];',
+            f'        for (j = 0; j < {d}; j++) R += {prefix}_A[(best * {n} + i) * {d} + j] * delta[j];',
+            f'        C_out[i] = R * {prefix}_SCALE[i];',
+            '    }',
+            '    return 1;',
+            '}',
+            '',
+            f'#endif /* {prefix}_TABLE_H */',
+            '',
+        ]
+        with open(filepath, 'w') as f:
+            f.write('\n'.join(lines))
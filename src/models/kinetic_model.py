@@ -8,41 +8,109 @@ Author: Sistema de Modelado de Esterificación
 Date: 2025-11-19
 """
 
+import copy
+import json
+import time
 import numpy as np
+from dataclasses import dataclass
+from functools import partial
 from scipy.integrate import solve_ivp
+from scipy.sparse import bsr_matrix
 from typing import Dict, List, Tuple, Optional, Callable
 import warnings
 
-from .properties import ThermophysicalProperties, LiteratureKinetics, arrhenius
+from .properties import (ThermophysicalProperties, LiteratureKinetics,
+                         ReactionThermodynamics, arrhenius)
+from .reaction_network import ReactionNetwork, BUILTIN_NETWORKS
+from .simulation_result import SimulationResult
+from .simulation_cache import content_hash, get_default_cache
+from .master_curve import MasterCurveTable, get_master_curve_table
+
+
+# Redes integradas (especies en el orden del vector de estado)
+SPECIES = {model_type: build().species for model_type, build in BUILTIN_NETWORKS.items()}
+
+# Matrices estequiométricas (especies × reacciones)
+STOICHIOMETRY = {model_type: build().S for model_type, build in BUILTIN_NETWORKS.items()}
+
+# Puntos de salida por defecto de la solución analítica cuando t_eval es None
+# (malla geométrica desde ANALYTIC_FIRST_STEP veces el tiempo característico
+# 1/(k·C_MeOH0), para resolver el transitorio)
+ANALYTIC_NUM_POINTS = 101
+ANALYTIC_FIRST_STEP = 1e-3
+
+# Metas admitidas como eventos en simulate()
+TARGETS = ('conversion_%', 'FAME_yield_%')
+
+# Variables de estado admitidas en simulate()
+FORMULATIONS = ('concentration', 'log', 'extent')
+
+# Métodos implícitos (reciben el Jacobiano analítico)
+IMPLICIT_METHODS = ('Radau', 'BDF', 'LSODA')
+
+# Cadenas de respaldo de method='auto' según la prueba de rigidez. LSODA (que
+# conmuta solo entre Adams y BDF) resulta el más rápido en tiempo de pared en
+# ambos regímenes; la prueba decide el respaldo: implícito si el sistema es rígido
+AUTO_METHODS = {
+    'stiff': ('LSODA', 'Radau', 'BDF'),
+    'nonstiff': ('LSODA', 'RK45', 'Radau'),
+}
+
+# Índice de rigidez max|Re λ|·(t_f - t_0) a partir del cual se usa un método implícito
+STIFFNESS_THRESHOLD = 500.0
+
+# Piso relativo (× max C0) de las especies con C0 = 0 en la formulación logarítmica
+LOG_CONCENTRATION_FLOOR = 1e-12
+
+# Factor de atol de las sensibilidades respecto al de las concentraciones: el
+# Jacobiano de Gauss-Newton solo requiere unas pocas cifras significativas
+SENSITIVITY_ATOL_FACTOR = 100.0
 
 
 class KineticModel:
     """
     Clase base para modelos cinéticos de transesterificación.
 
+    Las velocidades, el lado derecho de las EDOs y el Jacobiano se generan a
+    partir de una red de reacción (ReactionNetwork): las redes integradas de
+    1 y 3 pasos o una red arbitraria con model_type='custom'.
+
     Attributes:
-        model_type (str): Tipo de modelo ('1-step' o '3-step')
+        model_type (str): Tipo de modelo ('1-step', '3-step' o 'custom')
         reversible (bool): Si el modelo considera reversibilidad
         params (Dict): Parámetros cinéticos (Ea, A para cada reacción)
+        network (ReactionNetwork): Red de reacción del modelo
+        species (List[str]): Especies (orden del vector de estado)
         properties (ThermophysicalProperties): Propiedades del sistema
+        cache (SimulationCache): Caché de resultados de simulate() (None: desactivado)
     """
 
     def __init__(self,
                  model_type: str = '1-step',
                  reversible: bool = True,
                  kinetic_params: Optional[Dict] = None,
-                 temperature: float = 65.0):
+                 temperature: float = 65.0,
+                 network: Optional[ReactionNetwork] = None,
+                 cache=None):
         """
         Inicializa el modelo cinético.
 
         Args:
-            model_type: Tipo de modelo ('1-step' o '3-step')
+            model_type: Tipo de modelo ('1-step', '3-step' o 'custom')
             reversible: Si considerar reacciones reversibles
-            kinetic_params: Parámetros cinéticos personalizados
+            kinetic_params: Parámetros cinéticos personalizados (para 'custom',
+                            {reacción: {'Ea_forward': ..., ...}}; por defecto
+                            los de la especificación de la red)
             temperature: Temperatura de operación (°C)
+            network: Red de reacción (requerida con model_type='custom')
+            cache: SimulationCache para simulate(); None usa el caché por
+                   defecto (get_default_cache(), activo si se define
+                   ESTERIFICACION_CACHE_DIR) y False lo desactiva
         """
-        if model_type not in ['1-step', '3-step']:
-            raise ValueError("model_type debe ser '1-step' o '3-step'")
+        if model_type not in ['1-step', '3-step', 'custom']:
+            raise ValueError("model_type debe ser '1-step', '3-step' o 'custom'")
+        if (model_type == 'custom') != (network is not None):
+            raise ValueError("network se requiere (solo) con model_type='custom'")
 
         self.model_type = model_type
         self.reversible = reversible
@@ -54,10 +122,22 @@ class KineticModel:
 
         # Cargar parámetros cinéticos
         if kinetic_params is None:
-            self.params = self._load_default_params()
+            self.params = self._load_default_params() if network is None else network.parameters()
         else:
             self.params = kinetic_params
 
+        # Red de reacción (los parámetros vigentes son los de self.params)
+        if network is None:
+            network = BUILTIN_NETWORKS[model_type](self.params, reversible=reversible)
+        self.network = network
+        self.species = network.species
+        self._reverse_mask = network.reversible & reversible
+        self._extent_basis_cache = None
+
+        # Caché de resultados de simulate()
+        self.cache = get_default_cache() if cache is None else (cache or None)
+        self._network_spec = None
+
         # Constantes de velocidad actuales (se actualizan con temperatura)
         self.k = {}
         self._update_rate_constants(temperature)
@@ -97,6 +177,18 @@ class KineticModel:
                 },
             }
 
+    def _reaction_prefixes(self) -> List[str]:
+        """Prefijo de los nombres planos de parámetros de cada reacción."""
+        if self.model_type == '1-step':
+            return ['']
+        return [f'{name}_' for name in self.network.reaction_names]
+
+    def _reaction_parameters(self, params: Dict) -> List[Dict]:
+        """Parámetros de Arrhenius de cada reacción, en el orden de la red."""
+        if self.model_type == '1-step':
+            return [params]
+        return [params[name] for name in self.network.reaction_names]
+
     def _update_rate_constants(self, T_celsius: float):
         """
         Actualiza constantes de velocidad usando Arrhenius.
@@ -105,32 +197,15 @@ class KineticModel:
             T_celsius: Temperatura (°C)
         """
         self.temperature = T_celsius
+        self._k_f, self._k_r = self.rate_constant_array(T_celsius)
 
-        if self.model_type == '1-step':
-            self.k['forward'] = arrhenius(
-                T_celsius,
-                self.params['A_forward'],
-                self.params['Ea_forward']
-            )
-            if self.reversible:
-                self.k['reverse'] = arrhenius(
-                    T_celsius,
-                    self.params['A_reverse'],
-                    self.params['Ea_reverse']
-                )
-        else:  # 3-step
-            for step in ['step1', 'step2', 'step3']:
-                self.k[f'{step}_forward'] = arrhenius(
-                    T_celsius,
-                    self.params[step]['A_forward'],
-                    self.params[step]['Ea_forward']
-                )
-                if self.reversible:
-                    self.k[f'{step}_reverse'] = arrhenius(
-                        T_celsius,
-                        self.params[step]['A_reverse'],
-                        self.params[step]['Ea_reverse']
-                    )
+        # Vista por nombre: 'forward'/'reverse' (1 paso) o '<reacción>_forward'
+        self.k = {}
+        for prefix, k_f, k_r, reversible in zip(self._reaction_prefixes(), self._k_f,
+                                                self._k_r, self._reverse_mask):
+            self.k[f'{prefix}forward'] = k_f
+            if reversible:
+                self.k[f'{prefix}reverse'] = k_r
 
     def set_temperature(self, T_celsius: float):
         """
@@ -143,7 +218,9 @@ class KineticModel:
 
     def odes(self, t: float, y: np.ndarray) -> np.ndarray:
         """
-        Sistema de ecuaciones diferenciales ordinarias.
+        Sistema de ecuaciones diferenciales ordinarias, dC/dt = S·r(C).
+
+        Las concentraciones negativas se recortan a cero en las velocidades.
 
         Args:
             t: Tiempo (min)
@@ -152,96 +229,473 @@ class KineticModel:
         Returns:
             dydt: Derivadas de concentraciones
         """
-        if self.model_type == '1-step':
-            return self._odes_1step(t, y)
+        return self.network.rhs(y, self._k_f, self._k_r)
+
+    def jac(self, t: float, y: np.ndarray) -> np.ndarray:
+        """
+        Jacobiano analítico del sistema de EDOs, J = ∂(dy/dt)/∂y = S·∂r/∂y.
+
+        Las especies recortadas a cero en odes tienen derivada nula.
+
+        Args:
+            t: Tiempo (min)
+            y: Vector de concentraciones
+
+        Returns:
+            Matriz Jacobiana (n_especies × n_especies)
+        """
+        return self.network.jacobian(y, self._k_f, self._k_r)
+
+    def rate_constant_array(self,
+                            T_celsius,
+                            params: Optional[Dict] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Constantes de velocidad como arreglos (vectorizado sobre temperatura).
+
+        Args:
+            T_celsius: Temperatura (°C), escalar o arreglo de forma (N,)
+            params: Parámetros cinéticos (si None, usa self.params)
+
+        Returns:
+            Tupla (k_forward, k_reverse) con forma (..., n_reacciones).
+            k_reverse es cero en las reacciones irreversibles.
+        """
+        if params is None:
+            params = self.params
+        return self.network.rate_constants(T_celsius, self._reaction_parameters(params),
+                                           reversible=self.reversible)
+
+    def _mass_action_terms(self, C: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Términos de acción de masas (productos de concentraciones) de cada reacción.
+
+        r = k_f · P_f - k_r · P_r
+
+        Args:
+            C: Concentraciones, forma (N, n_especies, k)
+
+        Returns:
+            Tupla (P_f, P_r), cada uno con forma (N, n_reacciones, k)
+        """
+        P_f, P_r = self.network.mass_action_terms(C.transpose(1, 0, 2))
+        return P_f.transpose(1, 0, 2), P_r.transpose(1, 0, 2)
+
+    def _rates_batch(self,
+                     C: np.ndarray,
+                     k_f: np.ndarray,
+                     k_r: np.ndarray) -> np.ndarray:
+        """
+        Velocidades netas de reacción para un lote de estados.
+
+        Args:
+            C: Concentraciones, forma (N, n_especies, k)
+            k_f: Constantes directas, forma (N, n_reacciones)
+            k_r: Constantes inversas, forma (N, n_reacciones)
+
+        Returns:
+            Velocidades netas, forma (N, n_reacciones, k)
+        """
+        r = self.network.rates(C.transpose(1, 0, 2), k_f.T[:, :, None], k_r.T[:, :, None])
+        return r.transpose(1, 0, 2)
+
+    def _rate_jacobian_batch(self,
+                             C: np.ndarray,
+                             k_f: np.ndarray,
+                             k_r: np.ndarray) -> np.ndarray:
+        """
+        Derivadas de las velocidades netas respecto a las concentraciones.
+
+        Args:
+            C: Concentraciones, forma (N, n_especies)
+            k_f: Constantes directas, forma (N, n_reacciones)
+            k_r: Constantes inversas, forma (N, n_reacciones)
+
+        Returns:
+            ∂r/∂C, forma (N, n_reacciones, n_especies)
+        """
+        return self.network.rate_jacobian(C.T, k_f.T, k_r.T).transpose(2, 0, 1)
+
+    def _integrate_batch(self,
+                         t_span: Tuple[float, float],
+                         Y0: np.ndarray,
+                         k_f: np.ndarray,
+                         k_r: np.ndarray,
+                         method: str,
+                         t_eval: Optional[np.ndarray],
+                         rtol: float,
+                         atol: float,
+                         formulation: str = 'concentration') -> Dict:
+        """
+        Integra el sistema apilado de simulate_batch().
+
+        Args:
+            t_span: Tupla (t_initial, t_final) en minutos
+            Y0: Condiciones iniciales, forma (N, n_especies)
+            k_f: Constantes directas, forma (N, n_reacciones)
+            k_r: Constantes inversas, forma (N, n_reacciones)
+            method: Método de integración
+            t_eval: Tiempos específicos para evaluar la solución
+            rtol: Tolerancia relativa (por corrida)
+            atol: Tolerancia absoluta (por corrida)
+            formulation: 'concentration' o 'extent' (avances independientes
+                         por corrida, ver _state_formulation)
+
+        Returns:
+            Dict con 't', 'C' (N, n_t, n_especies) y estadísticas del integrador
+        """
+        N, n_species = Y0.shape
+        network = self.network
+
+        # Constantes con las reacciones en el primer eje: (n_reacciones, N, 1)
+        k_f_columns = k_f.T[:, :, None]
+        k_r_columns = k_r.T[:, :, None]
+
+        # Jacobiano analítico diagonal por bloques (N bloques n_estados × n_estados)
+        block_indices = np.arange(N)
+        block_indptr = np.arange(N + 1)
+
+        if formulation == 'extent':
+            B, P = self._extent_basis()
+            n_state = B.shape[1]
+            x0 = np.zeros(N * n_state)
+
+            def fun(t, y):
+                xi = y.reshape(N, n_state, -1)
+                C = Y0.T[:, :, None] + np.einsum('sm,nmk->snk', B, xi)
+                r = network.rates(C, k_f_columns, k_r_columns)
+                return np.einsum('mr,rnk->nmk', P, r).reshape(y.shape)
+
+            def jac(t, y):
+                C = Y0 + y.reshape(N, n_state) @ B.T
+                dr = network.rate_jacobian(C.T, k_f.T, k_r.T).transpose(2, 0, 1)
+                blocks = P @ dr @ B
+                return bsr_matrix((blocks, block_indices, block_indptr),
+                                  shape=(N * n_state, N * n_state))
         else:
-            return self._odes_3step(t, y)
+            n_state = n_species
+            x0 = Y0.ravel()
+
+            def fun(t, y):
+                C = y.reshape(N, n_species, -1).transpose(1, 0, 2)
+                dCdt = network.rhs(C, k_f_columns, k_r_columns)
+                return dCdt.transpose(1, 0, 2).reshape(y.shape)
+
+            def jac(t, y):
+                C = y.reshape(N, n_species)
+                blocks = network.jacobian(C.T, k_f.T, k_r.T).transpose(2, 0, 1)
+                return bsr_matrix((blocks, block_indices, block_indptr),
+                                  shape=(N * n_species, N * n_species))
+
+        options = {}
+        if method in ('Radau', 'BDF'):
+            options['jac'] = jac
+        elif method == 'LSODA':
+            options['jac'] = lambda t, y: jac(t, y).toarray()
+
+        scale = np.sqrt(N)
+        solution = solve_ivp(
+            fun=fun,
+            t_span=t_span,
+            y0=x0,
+            method=method,
+            t_eval=t_eval,
+            rtol=rtol / scale,
+            atol=atol / scale,
+            vectorized=True,
+            **options
+        )
+
+        if not solution.success:
+            warnings.warn(f"Integración falló: {solution.message}")
+
+        # (N*n_estados, n_t) → (N, n_t, n_especies)
+        C = solution.y.reshape(N, n_state, -1).transpose(0, 2, 1)
+        if formulation == 'extent':
+            C = Y0[:, None, :] + C @ B.T
+
+        return {
+            't': solution.t,
+            'C': C,
+            'species': self.species,
+            'success': solution.success,
+            'message': solution.message,
+            'nfev': solution.nfev,
+            'njev': solution.njev,
+            'nlu': solution.nlu,
+        }
 
-    def _odes_1step(self, t: float, y: np.ndarray) -> np.ndarray:
+    def simulate_batch(self,
+                       t_span: Tuple[float, float],
+                       C0_list,
+                       temperatures=None,
+                       params_list: Optional[List[Dict]] = None,
+                       method: str = 'Radau',
+                       t_eval: Optional[np.ndarray] = None,
+                       rtol: float = 1e-6,
+                       atol: float = 1e-8,
+                       analytic: Optional[bool] = None,
+                       formulation: str = 'concentration') -> Dict:
         """
-        EDOs para modelo de 1 paso.
+        Simula N corridas independientes en una sola integración.
+
+        Las N corridas (distintas temperaturas, condiciones iniciales y/o
+        parámetros cinéticos) se apilan en un único sistema de EDOs con
+        Jacobiano diagonal por bloques y lado derecho vectorizado, evitando
+        N llamadas separadas a solve_ivp.
+
+        Como la norma del error de solve_ivp es el RMS sobre todo el sistema,
+        las tolerancias se dividen entre sqrt(N) para garantizar en cada
+        corrida la misma precisión que con simulate().
 
-        Reacción: TG + 3 MeOH ⇌ 3 FAME + GL
+        Args:
+            t_span: Tupla (t_initial, t_final) en minutos
+            C0_list: Lista de condiciones iniciales (o un solo diccionario
+                     compartido por todas las corridas)
+            temperatures: Temperaturas (°C) de cada corrida (si None, usa la actual)
+            params_list: Parámetros cinéticos de cada corrida (si None, usa self.params)
+            method: Método de integración ('Radau', 'BDF', 'LSODA')
+            t_eval: Tiempos específicos para evaluar la solución
+            rtol: Tolerancia relativa (por corrida)
+            atol: Tolerancia absoluta (por corrida)
+            analytic: Si usar la solución cerrada del modelo de 1 paso
+                      irreversible (None: automático cuando aplica)
+            formulation: 'concentration' o 'extent' (integra solo los avances
+                         de reacción independientes de cada corrida: bloques
+                         del Jacobiano más pequeños y balances de masa exactos)
 
-        y = [C_TG, C_MeOH, C_FAME, C_GL]
+        Returns:
+            Dict con 't', 'C' de forma (N, n_t, n_especies), 'species',
+            'temperatures', 'conversion_%' y 'FAME_yield_%' de forma (N, n_t)
         """
-        C_TG, C_MeOH, C_FAME, C_GL = y
+        species_names = self.species
+        if formulation not in ('concentration', 'extent'):
+            raise ValueError("simulate_batch admite formulation='concentration' o 'extent'")
+
+        if isinstance(C0_list, dict):
+            C0_list = [C0_list]
+        if temperatures is None:
+            temperatures = [self.temperature]
+        temperatures = np.atleast_1d(np.asarray(temperatures, dtype=float))
+        if params_list is None:
+            params_list = [self.params]
+
+        N = max(len(C0_list), len(temperatures), len(params_list))
+        for name, seq in [('C0_list', C0_list), ('temperatures', temperatures),
+                          ('params_list', params_list)]:
+            if len(seq) not in (1, N):
+                raise ValueError(f"{name} debe tener longitud 1 o {N}")
+
+        if len(C0_list) == 1:
+            C0_list = list(C0_list) * N
+        if len(temperatures) == 1:
+            temperatures = np.repeat(temperatures, N)
+
+        # Constantes de velocidad de cada corrida, forma (N, n_reacciones)
+        if len(params_list) == 1:
+            k_f, k_r = self.rate_constant_array(temperatures, params_list[0])
+        else:
+            k_pairs = [self.rate_constant_array(T, p)
+                       for T, p in zip(temperatures, params_list)]
+            k_f = np.array([k[0] for k in k_pairs])
+            k_r = np.array([k[1] for k in k_pairs])
+
+        Y0 = np.array([[C0.get(species, 0) for species in species_names]
+                       for C0 in C0_list], dtype=float)
+
+        if analytic is None:
+            analytic = self.has_analytic_solution()
+        elif analytic and not self.has_analytic_solution():
+            raise ValueError("Solución analítica disponible solo para '1-step' irreversible")
+
+        if analytic:
+            if t_eval is None:
+                # Malla común: la escala de tiempo de la corrida más rápida
+                t_eval = analytic_time_grid(t_span, np.max(k_f[:, 0] * Y0[:, 1]))
+            t_eval = np.asarray(t_eval, dtype=float)
+
+            # Solución cerrada para todas las corridas a la vez: (N, n_t)
+            C_TG0, C_MeOH0, C_FAME0, C_GL0 = (Y0[:, i:i + 1] for i in range(4))
+            C_TG = analytic_1step_irreversible(t_eval - t_span[0], k_f[:, :1], C_TG0, C_MeOH0)
+            extent = C_TG0 - C_TG
+            C = np.stack([C_TG, C_MeOH0 - 3.0 * extent,
+                          C_FAME0 + 3.0 * extent, C_GL0 + extent], axis=-1)
+
+            results = {
+                't': t_eval,
+                'C': C,
+                'species': species_names,
+                'temperatures': temperatures,
+                'success': True,
+                'message': 'Solución analítica (1 paso irreversible)',
+                'nfev': 0,
+                'njev': 0,
+                'nlu': 0,
+            }
+        else:
+            results = self._integrate_batch(t_span, Y0, k_f, k_r, method, t_eval, rtol, atol,
+                                            formulation)
+            results['temperatures'] = temperatures
+
+        # Conversión y rendimiento por corrida (NaN si C_TG0 = 0)
+        C_TG0 = Y0[:, species_names.index('TG')][:, None]
+        C_TG = results['C'][:, :, species_names.index('TG')]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            results['conversion_%'] = np.where(C_TG0 > 0, (C_TG0 - C_TG) / C_TG0 * 100, np.nan)
+            if 'FAME' in species_names:
+                C_FAME = results['C'][:, :, species_names.index('FAME')]
+                results['FAME_yield_%'] = np.where(C_TG0 > 0, C_FAME / (3.0 * C_TG0) * 100,
+                                                   np.nan)
+
+        return results
 
-        # Evitar concentraciones negativas
-        C_TG = max(0, C_TG)
-        C_MeOH = max(0, C_MeOH)
-        C_FAME = max(0, C_FAME)
-        C_GL = max(0, C_GL)
+    def has_analytic_solution(self) -> bool:
+        """Indica si el modelo admite solución cerrada (1 paso irreversible)."""
+        return self.model_type == '1-step' and not self.reversible
 
-        # Velocidad de reacción (pseudo-2° orden)
-        r_forward = self.k['forward'] * C_TG * C_MeOH
+    def analytic_solution(self,
+                          t,
+                          C0: Dict,
+                          T_celsius=None,
+                          params: Optional[Dict] = None) -> Dict:
+        """
+        Solución exacta del modelo de 1 paso irreversible (vectorizada).
 
-        r_reverse = 0.0
-        if self.reversible:
-            r_reverse = self.k['reverse'] * (C_FAME ** 3) * C_GL
+        t, T_celsius y los valores de C0 pueden ser escalares o arreglos
+        compatibles por broadcasting (p. ej. una malla de tiempos ×
+        temperaturas × relaciones molares).
 
-        r_net = r_forward - r_reverse
+        Args:
+            t: Tiempo(s) desde el inicio de la reacción (min)
+            C0: Condiciones iniciales {componente: concentración (mol/L)}
+            T_celsius: Temperatura(s) (°C), si None usa la actual
+            params: Parámetros cinéticos (si None, self.params)
 
-        # Balances de materia
-        dC_TG_dt = -r_net
-        dC_MeOH_dt = -3.0 * r_net
-        dC_FAME_dt = 3.0 * r_net
-        dC_GL_dt = r_net
+        Returns:
+            Dict con 'C_<especie>', 'conversion_%' y 'FAME_yield_%'
+        """
+        if not self.has_analytic_solution():
+            raise ValueError("Solución analítica disponible solo para '1-step' irreversible")
+
+        if T_celsius is None:
+            T_celsius = self.temperature
+        if params is None:
+            params = self.params
+        k = arrhenius(np.asarray(T_celsius, dtype=float),
+                      params['A_forward'], params['Ea_forward'])
+
+        C_TG0 = np.asarray(C0.get('TG', 0), dtype=float)
+        C_MeOH0 = np.asarray(C0.get('MeOH', 0), dtype=float)
+        C_TG = analytic_1step_irreversible(t, k, C_TG0, C_MeOH0)
+
+        # Estequiometría: TG + 3 MeOH → 3 FAME + GL
+        extent = C_TG0 - C_TG
+        results = {
+            'C_TG': C_TG,
+            'C_MeOH': C_MeOH0 - 3.0 * extent,
+            'C_FAME': C0.get('FAME', 0) + 3.0 * extent,
+            'C_GL': C0.get('GL', 0) + extent,
+        }
+        with np.errstate(divide='ignore', invalid='ignore'):
+            results['conversion_%'] = extent / C_TG0 * 100
+            results['FAME_yield_%'] = results['C_FAME'] / (3.0 * C_TG0) * 100
 
-        return np.array([dC_TG_dt, dC_MeOH_dt, dC_FAME_dt, dC_GL_dt])
+        return results
 
-    def _odes_3step(self, t: float, y: np.ndarray) -> np.ndarray:
+    def master_curve_conversion(self,
+                                t,
+                                C0: Dict,
+                                T_celsius=None,
+                                params: Optional[Dict] = None,
+                                table: Optional[MasterCurveTable] = None) -> Dict:
         """
-        EDOs para modelo de 3 pasos.
+        Conversión del modelo de 1 paso interpolada de la curva maestra (sin EDO).
+
+        Usa los grupos τ = k_f·C_TG0·t, R = C_MeOH0/C_TG0 y κ = k_r·C_TG0²/k_f
+        (ver master_curve.py). t, T_celsius y los valores de C0 pueden ser
+        escalares o arreglos compatibles por broadcasting.
 
-        Reacciones:
-        1) TG + MeOH ⇌ DG + FAME
-        2) DG + MeOH ⇌ MG + FAME
-        3) MG + MeOH ⇌ GL + FAME
+        Args:
+            t: Tiempo(s) desde el inicio de la reacción (min)
+            C0: Condiciones iniciales {componente: concentración (mol/L)},
+                sin FAME ni glicerol
+            T_celsius: Temperatura(s) (°C), si None usa la actual
+            params: Parámetros cinéticos (si None, self.params)
+            table: Tabla de curvas maestras (si None, get_master_curve_table())
 
-        y = [C_TG, C_DG, C_MG, C_GL, C_FAME, C_MeOH]
+        Returns:
+            Dict con 'C_<especie>', 'conversion_%', 'FAME_yield_%' y
+            'error_bound_%' (cota validada del error de conversión)
+
+        Raises:
+            ValueError: Si el modelo no es de 1 paso, hay FAME o GL inicial, o
+                        el punto está fuera del dominio de la tabla
         """
-        C_TG, C_DG, C_MG, C_GL, C_FAME, C_MeOH = y
+        if self.model_type != '1-step':
+            raise ValueError("Curva maestra disponible solo para el modelo '1-step'")
+        if np.any(np.asarray(C0.get('FAME', 0)) != 0) or np.any(np.asarray(C0.get('GL', 0)) != 0):
+            raise ValueError("La curva maestra requiere C_FAME0 = C_GL0 = 0")
+
+        if T_celsius is None:
+            T_celsius = self.temperature
+        if table is None:
+            table = get_master_curve_table()
+        k_f, k_r = self.rate_constant_array(np.asarray(T_celsius, dtype=float), params)
+
+        C_TG0 = np.asarray(C0.get('TG', 0), dtype=float)
+        C_MeOH0 = np.asarray(C0.get('MeOH', 0), dtype=float)
+        X = table.conversion(k_f[..., 0] * C_TG0 * np.asarray(t, dtype=float),
+                             C_MeOH0 / C_TG0,
+                             k_r[..., 0] * C_TG0 ** 2 / k_f[..., 0])
+
+        # Estequiometría: TG + 3 MeOH → 3 FAME + GL
+        extent = C_TG0 * X
+        return {
+            'C_TG': C_TG0 - extent,
+            'C_MeOH': C_MeOH0 - 3.0 * extent,
+            'C_FAME': 3.0 * extent,
+            'C_GL': extent,
+            'conversion_%': X * 100,
+            'FAME_yield_%': X * 100,
+            'error_bound_%': table.error_bound * 100,
+        }
 
-        # Evitar concentraciones negativas
-        C_TG = max(0, C_TG)
-        C_DG = max(0, C_DG)
-        C_MG = max(0, C_MG)
-        C_GL = max(0, C_GL)
-        C_FAME = max(0, C_FAME)
-        C_MeOH = max(0, C_MeOH)
+    def _rate_constants_for(self,
+                            temperature: Optional[float] = None,
+                            params: Optional[Dict] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Constantes (k_f, k_r) de una simulación sin modificar el modelo.
 
-        # Velocidades de cada paso
-        # Paso 1: TG + MeOH ⇌ DG + FAME
-        r1_forward = self.k['step1_forward'] * C_TG * C_MeOH
-        r1_reverse = 0.0
-        if self.reversible:
-            r1_reverse = self.k['step1_reverse'] * C_DG * C_FAME
-        r1_net = r1_forward - r1_reverse
+        Args:
+            temperature: Temperatura (°C) (si None, la actual)
+            params: Parámetros cinéticos (si None, self.params)
 
-        # Paso 2: DG + MeOH ⇌ MG + FAME
-        r2_forward = self.k['step2_forward'] * C_DG * C_MeOH
-        r2_reverse = 0.0
-        if self.reversible:
-            r2_reverse = self.k['step2_reverse'] * C_MG * C_FAME
-        r2_net = r2_forward - r2_reverse
+        Returns:
+            Tupla (k_forward, k_reverse) de forma (n_reacciones,)
+        """
+        if temperature is None and params is None:
+            return self._k_f, self._k_r
+        if temperature is None:
+            temperature = self.temperature
+        return self.rate_constant_array(temperature, params)
 
-        # Paso 3: MG + MeOH ⇌ GL + FAME
-        r3_forward = self.k['step3_forward'] * C_MG * C_MeOH
-        r3_reverse = 0.0
-        if self.reversible:
-            r3_reverse = self.k['step3_reverse'] * C_GL * C_FAME
-        r3_net = r3_forward - r3_reverse
+    def _ode_functions(self, k_f: np.ndarray, k_r: np.ndarray) -> Tuple[Callable, Callable]:
+        """
+        Funciones fun(t, y) y jac(t, y) para solve_ivp con constantes fijas.
+
+        Con las constantes vigentes del modelo devuelve self.odes y self.jac;
+        en otro caso, clausuras sobre k_f y k_r que no dependen del estado.
+        """
+        if k_f is self._k_f and k_r is self._k_r:
+            return self.odes, self.jac
+        network = self.network
+
+        def fun(t, y):
+            return network.rhs(y, k_f, k_r)
 
-        # Balances de materia
-        dC_TG_dt = -r1_net
-        dC_DG_dt = r1_net - r2_net
-        dC_MG_dt = r2_net - r3_net
-        dC_GL_dt = r3_net
-        dC_FAME_dt = r1_net + r2_net + r3_net
-        dC_MeOH_dt = -(r1_net + r2_net + r3_net)
+        def jac(t, y):
+            return network.jacobian(y, k_f, k_r)
 
-        return np.array([dC_TG_dt, dC_DG_dt, dC_MG_dt, dC_GL_dt, dC_FAME_dt, dC_MeOH_dt])
+        return fun, jac
 
     def simulate(self,
                  t_span: Tuple[float, float],
@@ -249,79 +703,951 @@ class KineticModel:
                  method: str = 'Radau',
                  t_eval: Optional[np.ndarray] = None,
                  rtol: float = 1e-6,
-                 atol: float = 1e-8) -> Dict:
+                 atol: float = 1e-8,
+                 use_jacobian: bool = True,
+                 analytic: Optional[bool] = None,
+                 targets: Optional[Dict[str, float]] = None,
+                 stop_at_target: bool = False,
+                 events: Optional[List[Callable]] = None,
+                 dense_output: bool = False,
+                 final_only: bool = False,
+                 temperature: Optional[float] = None,
+                 params: Optional[Dict] = None,
+                 formulation: str = 'concentration',
+                 use_cache: bool = True) -> SimulationResult:
         """
         Simula la cinética de reacción integrando las EDOs.
 
+        Para el modelo de 1 paso irreversible se usa por defecto la solución
+        cerrada (analytic_solution) en lugar de integrar numéricamente.
+
+        Con temperature y/o params la simulación no lee ni modifica el estado
+        del modelo (self.temperature, self.k): una misma instancia puede
+        evaluarse en paralelo desde varios hilos.
+
         Args:
             t_span: Tupla (t_initial, t_final) en minutos
             C0: Condiciones iniciales {componente: concentración (mol/L)}
-            method: Método de integración ('Radau', 'BDF', 'LSODA')
+            method: Método de integración ('Radau', 'BDF', 'LSODA', 'RK45', ...)
+                    o 'auto': elige según stiffness_probe() y, si la integración
+                    falla, reintenta con el siguiente método de AUTO_METHODS
+                    (intentos en results['solver_attempts'])
             t_eval: Tiempos específicos para evaluar la solución
             rtol: Tolerancia relativa
             atol: Tolerancia absoluta
+            use_jacobian: Si pasar el Jacobiano analítico a los métodos
+                          implícitos (si False, se aproxima por diferencias finitas)
+            analytic: Si usar la solución cerrada (None: automático cuando aplica).
+                      Sin t_eval, se evalúa en ANALYTIC_NUM_POINTS tiempos en malla
+                      geométrica escalada a 1/(k·C_MeOH0) (ver analytic_time_grid)
+            targets: Metas a detectar como eventos, p. ej.
+                     {'conversion_%': 95.0, 'FAME_yield_%': 90.0}. El tiempo exacto
+                     del primer cruce se reporta en results['t_target'] (NaN si no
+                     se alcanza dentro de t_span)
+            stop_at_target: Si detener la integración al cruzar la primera meta
+            events: Funciones evento adicionales event(t, y) para solve_ivp
+                    (resultados en results['t_events'] y results['y_events'])
+            dense_output: Si conservar el interpolante para consultas
+                          results.sol(t) entre los tiempos de salida
+            final_only: Modo ligero: guardar solo el estado final (t_final o el
+                        instante de la meta terminal), sin almacenar los pasos
+                        intermedios. Ignora t_eval; los arreglos tienen longitud 1
+                        y results['conversion_%'][-1] sigue siendo válido
+            temperature: Temperatura (°C) de esta simulación (si None, la actual)
+            params: Parámetros cinéticos de esta simulación (si None, self.params)
+            formulation: Variables de estado del integrador:
+                         'concentration' (C, recortadas en cero en las velocidades) o
+                         'log' (z = ln C: positividad exacta y lado derecho suave
+                         cerca del agotamiento, útil a conversión muy alta y con
+                         órdenes fraccionarios) o 'extent' (solo los avances de
+                         reacción independientes, C = C0 + S·ξ: sistema más
+                         pequeño y balances de masa exactos). Los resultados
+                         siempre son concentraciones
+            use_cache: Si consultar/guardar en self.cache (no aplica con events
+                       ni dense_output). Un acierto trae results['cached'] = True,
+                       nfev/njev/nlu en 0 y wall_time igual al tiempo de búsqueda
 
         Returns:
-            Dict con resultados de la simulación
+            SimulationResult (acceso tipo dict: 't', 'C_<especie>',
+            'conversion_%', 'FAME_yield_%', ...). nfev, njev y nlu suman todos
+            los intentos; method y wall_time indican el método usado y el
+            tiempo de pared (ver results.solver_stats())
         """
+        if use_cache and self.cache is not None and not events and not dense_output:
+            key = self._cache_key(t_span=t_span, C0=C0, method=method, t_eval=t_eval,
+                                  rtol=rtol, atol=atol, use_jacobian=use_jacobian,
+                                  analytic=analytic, targets=targets,
+                                  stop_at_target=stop_at_target, final_only=final_only,
+                                  temperature=temperature, params=params,
+                                  formulation=formulation)
+            results = self.cache.get(key)
+            if results is None:
+                results = self.simulate(t_span, C0, method, t_eval, rtol, atol, use_jacobian,
+                                        analytic, targets, stop_at_target,
+                                        final_only=final_only, temperature=temperature,
+                                        params=params, formulation=formulation,
+                                        use_cache=False)
+                self.cache.put(key, results)
+            return results
+
+        start = time.perf_counter()
+        targets = targets or {}
+        for name in targets:
+            if name not in TARGETS:
+                raise ValueError(f"Meta '{name}' no reconocida (opciones: {TARGETS})")
+        C_TG0 = C0.get('TG', 0)
+        if targets and C_TG0 <= 0:
+            raise ValueError("Las metas de conversión/rendimiento requieren C_TG0 > 0")
+
+        if analytic is None:
+            analytic = self.has_analytic_solution() and not events
+        elif analytic and not self.has_analytic_solution():
+            raise ValueError("Solución analítica disponible solo para '1-step' irreversible")
+        elif analytic and events:
+            raise ValueError("La solución analítica no admite funciones evento arbitrarias")
+
+        if final_only and dense_output:
+            raise ValueError("final_only no admite dense_output")
+        if formulation not in FORMULATIONS:
+            raise ValueError(f"formulation debe ser una de {FORMULATIONS}")
+
+        k_f, k_r = self._rate_constants_for(temperature, params)
+
+        if analytic:
+            results = self._simulate_analytic(t_span, C0, t_eval, targets, stop_at_target,
+                                              dense_output, final_only, k_f[0])
+            results.wall_time = time.perf_counter() - start
+            return results
+
+        if final_only:
+            t_eval = [t_span[1]]
+
         # Preparar vector de condiciones iniciales
-        if self.model_type == '1-step':
-            y0 = np.array([
-                C0.get('TG', 0),
-                C0.get('MeOH', 0),
-                C0.get('FAME', 0),
-                C0.get('GL', 0),
-            ])
-            species_names = ['TG', 'MeOH', 'FAME', 'GL']
-        else:  # 3-step
-            y0 = np.array([
-                C0.get('TG', 0),
-                C0.get('DG', 0),
-                C0.get('MG', 0),
-                C0.get('GL', 0),
-                C0.get('FAME', 0),
-                C0.get('MeOH', 0),
-            ])
-            species_names = ['TG', 'DG', 'MG', 'GL', 'FAME', 'MeOH']
-
-        # Integrar EDOs
-        solution = solve_ivp(
-            fun=self.odes,
-            t_span=t_span,
-            y0=y0,
-            method=method,
-            t_eval=t_eval,
-            rtol=rtol,
-            atol=atol,
-            dense_output=True
-        )
+        species_names = self.species
+        y0 = np.array([C0.get(species, 0) for species in species_names], dtype=float)
+
+        fun, jac = self._ode_functions(k_f, k_r)
+        x0, to_concentration = y0, None
+        if formulation != 'concentration':
+            fun, jac, x0, atol, to_concentration = self._state_formulation(
+                formulation, k_f, k_r, y0, atol)
+
+        # Eventos: metas primero, luego los del usuario
+        target_events = [self._target_event(name, value, C_TG0, stop_at_target)
+                         for name, value in targets.items()]
+        all_events = target_events + list(events or [])
+        if to_concentration is not None:
+            # Los eventos se evalúan sobre concentraciones
+            all_events = [_mapped_event(event, to_concentration) for event in all_events]
+
+        if method == 'auto':
+            methods = self._stiffness_probe(y0, k_f, k_r, t_span)['methods']
+        else:
+            methods = (method,)
+
+        # Integrar EDOs (con method='auto', hasta que un método tenga éxito)
+        attempts = []
+        solution = None
+        for method in methods:
+            options = {}
+            if use_jacobian and method in IMPLICIT_METHODS:
+                # Jacobiano analítico solo para métodos implícitos
+                options['jac'] = jac
+            if all_events:
+                options['events'] = all_events
+
+            attempt_start = time.perf_counter()
+            try:
+                solution = solve_ivp(
+                    fun=fun,
+                    t_span=t_span,
+                    y0=x0,
+                    method=method,
+                    t_eval=t_eval,
+                    rtol=rtol,
+                    atol=atol,
+                    dense_output=dense_output,
+                    **options
+                )
+            except (ValueError, ArithmeticError, np.linalg.LinAlgError) as error:
+                # p. ej. Jacobiano no finito: pasar al siguiente método
+                attempts.append({'method': method, 'success': False, 'message': str(error),
+                                 'nfev': 0, 'njev': 0, 'nlu': 0,
+                                 'wall_time': time.perf_counter() - attempt_start})
+                continue
+
+            if solution.success and len(methods) > 1 and not np.all(np.isfinite(solution.y)):
+                # Éxito aparente con valores no finitos: también se reintenta
+                solution.success = False
+                solution.message = 'La solución contiene valores no finitos'
+            attempts.append({'method': method, 'success': solution.success,
+                             'message': solution.message, 'nfev': int(solution.nfev),
+                             'njev': int(solution.njev), 'nlu': int(solution.nlu),
+                             'wall_time': time.perf_counter() - attempt_start})
+            if solution.success:
+                break
+
+        if solution is None:
+            # Todos los métodos lanzaron excepción: resultado fallido con el
+            # estado inicial y el diagnóstico de los intentos
+            message = attempts[-1]['message']
+            warnings.warn(f"Integración falló: {message}")
+            results = SimulationResult(
+                t=np.array([t_span[0]]),
+                y=y0[:, None],
+                species=species_names,
+                C_TG0=C_TG0,
+                success=False,
+                message=message,
+                nfev=0, njev=0, nlu=0,
+                method=method,
+                wall_time=time.perf_counter() - start,
+            )
+            results['solver_attempts'] = attempts
+            if targets:
+                results['t_target'] = {name: np.nan for name in targets}
+            return results
 
         if not solution.success:
             warnings.warn(f"Integración falló: {solution.message}")
 
-        # Organizar resultados
-        results = {
-            't': solution.t,
-            'success': solution.success,
-            'message': solution.message,
-            'nfev': solution.nfev,  # Número de evaluaciones de función
+        t_out, y_out = solution.t, solution.y
+        if final_only and solution.status == 1:
+            # Detenida por un evento terminal: el estado final es el del evento
+            t_stop, i_event = max((t_cross[-1], i) for i, t_cross in enumerate(solution.t_events)
+                                  if t_cross.size)
+            t_out = np.array([t_stop])
+            y_out = solution.y_events[i_event][-1][:, None]
+
+        sol = solution.sol
+        y_events = solution.y_events
+        if to_concentration is not None:
+            y_out = to_concentration(y_out)
+            if sol is not None:
+                sol = partial(_mapped_solution, sol=sol, transform=to_concentration)
+            if y_events is not None:
+                y_events = [to_concentration(y.T).T if y.size else y for y in y_events]
+
+        # Organizar resultados (conversión y rendimiento se calculan al consultarlos)
+        results = SimulationResult(
+            t=t_out,
+            y=y_out,
+            species=species_names,
+            C_TG0=C_TG0,
+            success=solution.success,
+            message=solution.message,
+            # Evaluaciones de función/Jacobiano y factorizaciones LU (todos los intentos)
+            nfev=sum(attempt['nfev'] for attempt in attempts),
+            njev=sum(attempt['njev'] for attempt in attempts),
+            nlu=sum(attempt['nlu'] for attempt in attempts),
+            method=method,
+            wall_time=time.perf_counter() - start,
+            sol=sol,
+        )
+
+        if len(methods) > 1:
+            results['solver_attempts'] = attempts
+
+        if targets:
+            results['t_target'] = {
+                name: t_cross[0] if t_cross.size else np.nan
+                for name, t_cross in zip(targets, solution.t_events)
+            }
+        if events:
+            results['t_events'] = solution.t_events[len(target_events):]
+            results['y_events'] = y_events[len(target_events):]
+
+        return results
+
+    def _cache_key(self, temperature: Optional[float], params: Optional[Dict], **options) -> str:
+        """Clave de contenido de una llamada a simulate() (ver SimulationCache)."""
+        if self._network_spec is None:
+            self._network_spec = self.network.to_dict()
+        return self.cache.key(
+            model_type=self.model_type,
+            reversible=self.reversible,
+            network=self._network_spec,
+            temperature=self.temperature if temperature is None else temperature,
+            params=self.params if params is None else params,
+            **options,
+        )
+
+    def stiffness_probe(self,
+                        t_span: Tuple[float, float],
+                        C0: Dict[str, float],
+                        temperature: Optional[float] = None,
+                        params: Optional[Dict] = None) -> Dict:
+        """
+        Prueba de rigidez en el punto de operación (usada por method='auto').
+
+        Calcula los valores propios del Jacobiano en C0 y el índice de rigidez
+        max|Re λ|·(t_f - t_0): número aproximado de pasos que necesitaría un
+        método explícito solo por estabilidad. Por encima de
+        STIFFNESS_THRESHOLD se elige un método implícito.
+
+        Args:
+            t_span: Tupla (t_initial, t_final) en minutos
+            C0: Condiciones iniciales {componente: concentración (mol/L)}
+            temperature: Temperatura (°C) (si None, la actual)
+            params: Parámetros cinéticos (si None, self.params)
+
+        Returns:
+            Dict con 'eigenvalues', 'stiffness_index', 'stiffness_ratio'
+            (max|Re λ| / min|Re λ| de los modos no nulos), 'stiff' y 'methods'
+            (cadena de métodos a intentar, en orden)
+        """
+        y0 = np.array([C0.get(species, 0) for species in self.species], dtype=float)
+        k_f, k_r = self._rate_constants_for(temperature, params)
+        return self._stiffness_probe(y0, k_f, k_r, t_span)
+
+    def _stiffness_probe(self,
+                         y0: np.ndarray,
+                         k_f: np.ndarray,
+                         k_r: np.ndarray,
+                         t_span: Tuple[float, float]) -> Dict:
+        """stiffness_probe() con el estado y las constantes ya evaluados."""
+        J = self.network.jacobian(y0, k_f, k_r)
+        if not np.all(np.isfinite(J)):
+            # Rigidez indeterminada: se prueba la cadena de métodos rígidos
+            return {
+                'eigenvalues': np.full(len(y0), np.nan),
+                'stiffness_index': np.nan,
+                'stiffness_ratio': np.nan,
+                'stiff': True,
+                'methods': AUTO_METHODS['stiff'],
+            }
+        eigenvalues = np.linalg.eigvals(J)
+        decay = np.abs(eigenvalues.real)
+        active = decay[decay > 1e-12 * max(decay.max(), 1e-300)]
+
+        stiffness_index = float(decay.max() * abs(t_span[1] - t_span[0]))
+        stiff = stiffness_index > STIFFNESS_THRESHOLD
+        return {
+            'eigenvalues': eigenvalues,
+            'stiffness_index': stiffness_index,
+            'stiffness_ratio': float(active.max() / active.min()) if active.size else 1.0,
+            'stiff': stiff,
+            'methods': AUTO_METHODS['stiff' if stiff else 'nonstiff'],
         }
 
-        # Agregar concentraciones por especie
-        for i, species in enumerate(species_names):
-            results[f'C_{species}'] = solution.y[i]
+    def _state_formulation(self,
+                           formulation: str,
+                           k_f: np.ndarray,
+                           k_r: np.ndarray,
+                           y0: np.ndarray,
+                           atol: float) -> Tuple[Callable, Callable, np.ndarray, float, Callable]:
+        """
+        Sistema de EDOs en variables de estado alternativas a C.
+
+        'log': z = ln C, dz/dt = f(C)/C y
+        ∂(dz_i/dt)/∂z_j = J_ij·C_j/C_i - δ_ij·f_i/C_i. Las concentraciones
+        nunca son negativas, por lo que el recorte en cero de las velocidades
+        no se activa y el lado derecho es suave. Las especies con C0 = 0 parten
+        de LOG_CONCENTRATION_FLOOR·max(C0); por debajo de LOG_CONCENTRATION_FLOOR²
+        ·max(C0) (agotamiento total en modelos irreversibles) C se evalúa en
+        ese valor para que f/C y C_j/C_i sigan siendo finitos.
+
+        'extent': C = C0 + B·ξ con S = B·P (B = S y P = I si las reacciones son
+        independientes), dξ/dt = P·r(C) y ∂(dξ/dt)/∂ξ = P·(∂r/∂C)·B. Los balances
+        de átomos y de glicéridos se cumplen exactamente por construcción.
 
-        # Calcular conversión y rendimiento
+        Args:
+            formulation: Variables de estado ('log' o 'extent')
+            k_f: Constantes directas (n_reacciones,)
+            k_r: Constantes inversas (n_reacciones,)
+            y0: Concentraciones iniciales (n_especies,)
+            atol: Tolerancia absoluta en concentración
+
+        Returns:
+            Tupla (fun, jac, x0, atol_x, to_concentration), donde
+            to_concentration(x) convierte estados (n_estados, ...) a
+            concentraciones (n_especies, ...)
+        """
+        network = self.network
+
+        if formulation == 'extent':
+            B, P = self._extent_basis()
+
+            def fun(t, xi):
+                return P @ network.rates(y0 + B @ xi, k_f, k_r)
+
+            def jac(t, xi):
+                return P @ network.rate_jacobian(y0 + B @ xi, k_f, k_r) @ B
+
+            to_concentration = partial(_extent_to_concentration, y0=y0, B=B)
+            return fun, jac, np.zeros(B.shape[1]), atol, to_concentration
+
+        C_scale = max(float(np.max(y0)), np.finfo(float).tiny)
+
+        # Error absoluto en z ≈ error relativo en C: atol equivale a C_scale·atol_z
+        x0 = np.log(np.maximum(y0, LOG_CONCENTRATION_FLOOR * C_scale))
+        atol_x = atol / C_scale
+        z_min = np.log(LOG_CONCENTRATION_FLOOR ** 2 * C_scale)
+
+        def fun(t, z):
+            C = np.exp(np.maximum(z, z_min))
+            return network.rhs(C, k_f, k_r) / C
+
+        def jac(t, z):
+            # Por debajo de z_min, C no depende de z
+            active = z > z_min
+            C = np.exp(np.where(active, z, z_min))
+            J = network.jacobian(C, k_f, k_r) * (np.where(active, C, 0.0) / C[:, None])
+            J[np.diag_indices_from(J)] -= np.where(active, network.rhs(C, k_f, k_r) / C, 0.0)
+            return J
+
+        return fun, jac, x0, atol_x, np.exp
+
+    def _extent_basis(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Base de avances de reacción independientes.
+
+        Returns:
+            Tupla (B, P) con S = B·P: B = S y P = I si las columnas de S son
+            linealmente independientes; si no, B es una base ortonormal del
+            espacio de columnas de S (n_especies × rango) y P = Bᵀ·S
+        """
+        if self._extent_basis_cache is None:
+            S = self.network.S
+            rank = np.linalg.matrix_rank(S)
+            if rank == S.shape[1]:
+                B, P = S, np.eye(rank)
+            else:
+                U = np.linalg.svd(S, full_matrices=False)[0]
+                B = U[:, :rank]
+                P = B.T @ S
+            self._extent_basis_cache = (B, P)
+        return self._extent_basis_cache
+
+    def _target_event(self,
+                      name: str,
+                      value: float,
+                      C_TG0: float,
+                      terminal: bool) -> Callable:
+        """
+        Construye la función evento de solve_ivp para una meta.
+
+        Args:
+            name: 'conversion_%' o 'FAME_yield_%'
+            value: Valor meta (%)
+            C_TG0: Concentración inicial de TG (mol/L)
+            terminal: Si el evento detiene la integración
+
+        Returns:
+            Función event(t, y) que cruza cero (creciente) al alcanzar la meta
+        """
+        species_names = self.species
+        i_TG = species_names.index('TG')
+        i_FAME = species_names.index('FAME')
+
+        if name == 'conversion_%':
+            def event(t, y):
+                return (C_TG0 - y[i_TG]) / C_TG0 * 100 - value
+        else:  # FAME_yield_%
+            def event(t, y):
+                return y[i_FAME] / (3.0 * C_TG0) * 100 - value
+
+        event.terminal = terminal
+        event.direction = 1
+        return event
+
+    def _simulate_analytic(self,
+                           t_span: Tuple[float, float],
+                           C0: Dict[str, float],
+                           t_eval: Optional[np.ndarray],
+                           targets: Dict[str, float],
+                           stop_at_target: bool,
+                           dense_output: bool = False,
+                           final_only: bool = False,
+                           k: Optional[float] = None) -> SimulationResult:
+        """
+        simulate() con la solución cerrada del modelo de 1 paso irreversible.
+
+        Los tiempos de cruce de las metas se obtienen invirtiendo la solución
+        exacta (analytic_1step_irreversible_time).
+        """
+        t0, t_final = t_span
         C_TG0 = C0.get('TG', 0)
-        if C_TG0 > 0:
-            results['conversion_%'] = (C_TG0 - results['C_TG']) / C_TG0 * 100
-            results['FAME_yield_%'] = results['C_FAME'] / (3.0 * C_TG0) * 100
+        if k is None:
+            k = self.k['forward']
+
+        t_target = {}
+        for name, value in targets.items():
+            if name == 'conversion_%':
+                C_TG_target = C_TG0 * (1 - value / 100)
+            else:  # FAME_yield_%: C_FAME = C_FAME0 + 3·(C_TG0 - C_TG)
+                C_TG_target = C_TG0 - (3.0 * C_TG0 * value / 100 - C0.get('FAME', 0)) / 3.0
+            t_cross = t0 + float(analytic_1step_irreversible_time(
+                C_TG_target, k, C_TG0, C0.get('MeOH', 0)))
+            t_target[name] = t_cross if t_cross <= t_final else np.nan
+
+        # Detener en la primera meta alcanzada (como un evento terminal)
+        reached = [t for t in t_target.values() if np.isfinite(t)]
+        if stop_at_target and reached:
+            t_final = min(reached)
+
+        if final_only:
+            t_eval = [t_final]
+        elif t_eval is None:
+            t_eval = analytic_time_grid((t0, t_final), k * C0.get('MeOH', 0))
+        t_eval = np.asarray(t_eval, dtype=float)
+        t_eval = t_eval[t_eval <= t_final]
+
+        species_names = self.species
+        y0 = np.array([C0.get(species, 0) for species in species_names], dtype=float)
+        profile = partial(analytic_1step_irreversible_profile, k=k, y0=y0, t0=t0)
+
+        results = SimulationResult(
+            t=t_eval,
+            y=profile(t_eval),
+            species=species_names,
+            C_TG0=C_TG0,
+            message='Solución analítica (1 paso irreversible)',
+            method='analytic',
+            sol=profile if dense_output else None,
+        )
+
+        if targets:
+            results['t_target'] = t_target
 
         return results
 
-    def calculate_equilibrium(self, C0: Dict[str, float], T_celsius: Optional[float] = None) -> Dict:
+    def kinetic_parameter_names(self) -> List[str]:
+        """
+        Nombres planos de los parámetros cinéticos del modelo.
+
+        1-step: 'Ea_forward', 'A_forward', ...; 3-step: 'step1_Ea_forward', ...
+        (mismos nombres que usa ParameterFitter en lmfit); redes 'custom':
+        '<reacción>_Ea_forward', ... Los parámetros inversos solo se incluyen
+        para las reacciones reversibles.
+        """
+        return [f'{prefix}{kind}_{direction}'
+                for prefix, reversible in zip(self._reaction_prefixes(), self._reverse_mask)
+                for direction in (['forward', 'reverse'] if reversible else ['forward'])
+                for kind in ['Ea', 'A']]
+
+    def _split_param_name(self, param_name: str, params: Optional[Dict] = None) -> Tuple[Dict, str]:
+        """Diccionario de la reacción y clave de un nombre plano de parámetro."""
+        if params is None:
+            params = self.params
+        if self.model_type == '1-step':
+            return params, param_name
+        reaction, kind, direction = param_name.rsplit('_', 2)
+        return params[reaction], f'{kind}_{direction}'
+
+    def _get_param(self, param_name: str, params: Optional[Dict] = None) -> float:
+        """Obtiene un parámetro cinético a partir de su nombre plano."""
+        reaction_params, key = self._split_param_name(param_name, params)
+        return reaction_params[key]
+
+    def _set_param(self, param_name: str, value: float, params: Optional[Dict] = None):
+        """Modifica un parámetro cinético a partir de su nombre plano."""
+        reaction_params, key = self._split_param_name(param_name, params)
+        reaction_params[key] = value
+
+    def copy_params(self) -> Dict:
+        """Copia independiente de self.params (un nivel por reacción)."""
+        return {key: dict(value) if isinstance(value, dict) else value
+                for key, value in self.params.items()}
+
+    def simulate_sensitivities(self,
+                               t_span: Tuple[float, float],
+                               C0: Dict[str, float],
+                               method: str = 'auto',
+                               t_eval: Optional[np.ndarray] = None,
+                               rtol: float = 1e-6,
+                               atol: float = 1e-8,
+                               temperature: Optional[float] = None,
+                               params: Optional[Dict] = None,
+                               analytic: Optional[bool] = None) -> Dict:
+        """
+        Sensibilidades directas (forward) dC/dθ en una sola integración.
+
+        Integra el sistema aumentado
+
+            dC/dt = f(C, k)
+            dS/dt = J·S + ∂f/∂ln k,   S = ∂C/∂ln k,  S(0) = 0
+
+        y transforma a los parámetros de Arrhenius con la regla de la cadena:
+        ∂ln k/∂A = 1/A,  ∂ln k/∂Ea = -1000/(R·T).
+
+        El Jacobiano del sistema aumentado es exacto (segundas derivadas de
+        la red). Con method='auto' elige los métodos como simulate() (prueba
+        de rigidez, con respaldo si uno falla).
+
+        Args:
+            t_span: Tupla (t_initial, t_final) en minutos
+            C0: Condiciones iniciales {componente: concentración (mol/L)}
+            method: Método de integración ('auto', 'Radau', 'BDF', 'LSODA', ...)
+            t_eval: Tiempos específicos para evaluar la solución
+            rtol: Tolerancia relativa
+            atol: Tolerancia absoluta de las concentraciones (la de S es
+                  SENSITIVITY_ATOL_FACTOR veces mayor)
+            temperature: Temperatura (°C) (si None, la actual; no modifica el modelo)
+            params: Parámetros cinéticos (si None, self.params)
+            analytic: Si usar la solución cerrada (None: automático cuando
+                      aplica); las sensibilidades se obtienen de ella sin integrar
+
+        Returns:
+            Dict con 't', 'C' (n_t, n_especies), 'S' (n_t, n_especies, n_parámetros)
+            respecto a 'param_names', 'S_lnk' (n_t, n_especies, n_k) respecto
+            a los logaritmos de las constantes de velocidad ('lnk_names') y
+            'solver_attempts' (intentos de integración, como en simulate())
         """
-        Calcula concentraciones de equilibrio (simulación a tiempo largo).
+        species_names = self.species
+        S_matrix = self.network.S
+        n_species, n_reactions = S_matrix.shape
+        reverse = self._reverse_mask
+        n_k = n_reactions + int(reverse.sum())
+
+        if temperature is None:
+            temperature = self.temperature
+        if params is None:
+            params = self.params
+        k_f, k_r = self.rate_constant_array(temperature, params)
+
+        network = self.network
+        S_reverse = S_matrix[:, reverse]
+        forcing = np.empty((n_species, n_k))   # S·∂r/∂ln k
+
+        def fun(t, y):
+            C = y[:n_species]
+            sens = y[n_species:].reshape(n_k, n_species).T
+
+            P_f, P_r = network.mass_action_terms(C)
+            rate_f = k_f * P_f
+            rate_r = k_r * P_r
+
+            # ∂r/∂ln k: columnas [k_f de cada reacción, k_r de cada reacción]
+            np.multiply(S_matrix, rate_f, out=forcing[:, :n_reactions])
+            np.multiply(S_reverse, -rate_r[reverse], out=forcing[:, n_reactions:])
+
+            dCdt = S_matrix @ (rate_f - rate_r)
+            dSdt = network.jacobian(C, k_f, k_r) @ sens + forcing
+
+            return np.concatenate([dCdt, dSdt.T.ravel()])
+
+        def jac(t, y):
+            # Bloques diagonales J (dS/dt es lineal en S) y columna exacta
+            # ∂(dS_p/dt)/∂C = S·(∂²r/∂C∂C · S_p + ∂²r/∂C∂ln k_p)
+            C = y[:n_species]
+            sens = y[n_species:].reshape(n_k, n_species)
+            J_aug = np.kron(np.eye(1 + n_k), network.jacobian(C, k_f, k_r))
+
+            cross_f, cross_r = network.rate_cross_derivatives(C, k_f, k_r)
+            coupling = np.einsum('jlm,pl->pjm', network.rate_hessian(C, k_f, k_r), sens)
+            coupling[np.arange(n_reactions), np.arange(n_reactions)] += cross_f
+            coupling[n_reactions + np.arange(n_k - n_reactions), np.flatnonzero(reverse)] += \
+                cross_r[reverse]
+            J_aug[n_species:, :n_species] = (S_matrix @ coupling).reshape(n_k * n_species,
+                                                                           n_species)
+            return J_aug
+
+        y0 = np.zeros(n_species * (1 + n_k))
+        y0[:n_species] = [C0.get(species, 0) for species in species_names]
+        atol_aug = np.full(y0.size, SENSITIVITY_ATOL_FACTOR * atol)
+        atol_aug[:n_species] = atol
+
+        if analytic is None:
+            analytic = self.has_analytic_solution()
+        elif analytic and not self.has_analytic_solution():
+            raise ValueError("Solución analítica disponible solo para '1-step' irreversible")
+
+        if analytic:
+            # Con una sola constante C(t) = G(k·(t - t0)), así que
+            # ∂C/∂ln k = (t - t0)·dC/dt, exacto y sin integrar
+            results = self.simulate(t_span, C0, t_eval=t_eval, temperature=temperature,
+                                    params=params, analytic=True, use_cache=False)
+            t_out = results.t
+            S_lnk = (t_out - t_span[0]) * network.rhs(results.y, k_f[:, None], k_r[:, None])
+            y_out = np.vstack([results.y, S_lnk])
+            attempts = []
+            success, message, nfev = results.success, results.message, 0
+        else:
+            if method == 'auto':
+                methods = self._stiffness_probe(y0[:n_species], k_f, k_r, t_span)['methods']
+            else:
+                methods = (method,)
+
+            attempts = []
+            solution = None
+            for method in methods:
+                options = {}
+                if method in IMPLICIT_METHODS:
+                    options['jac'] = jac
+                attempt_start = time.perf_counter()
+                try:
+                    solution = solve_ivp(
+                        fun=fun,
+                        t_span=t_span,
+                        y0=y0,
+                        method=method,
+                        t_eval=t_eval,
+                        rtol=rtol,
+                        atol=atol_aug,
+                        **options
+                    )
+                except (ValueError, ArithmeticError, np.linalg.LinAlgError) as error:
+                    attempts.append({'method': method, 'success': False, 'message': str(error),
+                                     'nfev': 0, 'njev': 0, 'nlu': 0,
+                                     'wall_time': time.perf_counter() - attempt_start})
+                    continue
+                if solution.success and len(methods) > 1 and not np.all(np.isfinite(solution.y)):
+                    solution.success = False
+                    solution.message = 'La solución contiene valores no finitos'
+                attempts.append({'method': method, 'success': solution.success,
+                                 'message': solution.message, 'nfev': int(solution.nfev),
+                                 'njev': int(solution.njev), 'nlu': int(solution.nlu),
+                                 'wall_time': time.perf_counter() - attempt_start})
+                if solution.success:
+                    break
+
+            if solution is None:
+                # Todos los métodos lanzaron excepción: solo el estado inicial
+                t_out, y_out = np.array([t_span[0]]), y0[:, None]
+                success, message, nfev = False, attempts[-1]['message'], 0
+            else:
+                t_out, y_out = solution.t, solution.y
+                success, message, nfev = solution.success, solution.message, solution.nfev
+        if not success:
+            warnings.warn(f"Integración falló: {message}")
+
+        n_t = t_out.size
+        C = y_out[:n_species].T
+        S_lnk = y_out[n_species:].reshape(n_k, n_species, n_t).transpose(2, 1, 0)
+
+        # Regla de la cadena ln k → (Ea, A)
+        prefixes = self._reaction_prefixes()
+        lnk_names = ([f'{prefix}ln_k_forward' for prefix in prefixes] +
+                     [f'{prefix}ln_k_reverse' for prefix, rev in zip(prefixes, reverse) if rev])
+        param_names = self.kinetic_parameter_names()
+
+        T_kelvin = temperature + 273.15
+        dlnk_dtheta = np.zeros((n_k, len(param_names)))
+        for col, name in enumerate(param_names):
+            kind, direction = name.rsplit('_', 2)[-2:]
+            prefix = name[:-len(f'{kind}_{direction}')]
+            row = lnk_names.index(f'{prefix}ln_k_{direction}')
+            if kind == 'A':
+                dlnk_dtheta[row, col] = 1.0 / self._get_param(name, params)
+            else:  # Ea (kJ/mol)
+                dlnk_dtheta[row, col] = -1000.0 / (ThermophysicalProperties.R * T_kelvin)
+
+        return {
+            't': t_out,
+            'C': C,
+            'S': S_lnk @ dlnk_dtheta,
+            'S_lnk': S_lnk,
+            'species': species_names,
+            'param_names': param_names,
+            'lnk_names': lnk_names,
+            'success': success,
+            'message': message,
+            'nfev': nfev,
+            'solver_attempts': attempts,
+        }
+
+    def calculate_equilibrium(self,
+                              C0: Dict[str, float],
+                              T_celsius=None,
+                              method: str = 'algebraic',
+                              thermodynamics: Optional[ReactionThermodynamics] = None) -> Dict:
+        """
+        Calcula concentraciones de equilibrio.
+
+        Con method='algebraic' (por defecto) resuelve directamente las
+        condiciones de acción de masas en coordenadas de avance de reacción,
+        vectorizado sobre temperatura. Con method='integration' simula hasta
+        t = 10000 min (método original; único disponible para redes 'custom').
+
+        Args:
+            C0: Condiciones iniciales
+            T_celsius: Temperatura(s) (°C), escalar o arreglo; si None usa la actual
+            method: 'algebraic' o 'integration'
+            thermodynamics: Si se indica, impone K_eq de
+                            ReactionThermodynamics.equilibrium_constant() en lugar
+                            de k_f/k_r (en 3 pasos se reescalan las K_i para que
+                            su producto coincida con la K_eq global)
+
+        Returns:
+            Concentraciones de equilibrio (arreglos si T_celsius es arreglo)
+        """
+        if method == 'integration':
+            return self._equilibrium_by_integration(C0, T_celsius)
+        if method != 'algebraic':
+            raise ValueError(f"Método '{method}' no reconocido")
+        if self.model_type == 'custom':
+            raise ValueError("Equilibrio algebraico no disponible para redes 'custom'; "
+                             "use method='integration'")
+
+        if T_celsius is None:
+            T_celsius = self.temperature
+        T = np.atleast_1d(np.asarray(T_celsius, dtype=float))
+
+        if thermodynamics is not None and not self.reversible:
+            raise ValueError("La restricción termodinámica requiere un modelo reversible")
+
+        species_names = self.species
+        y0 = {species: float(C0.get(species, 0)) for species in species_names}
+
+        equilibrium = {}
+        if self.reversible:
+            k_f, k_r = self.rate_constant_array(T)
+            # K_i = k_f/k_r, forma (n_T, n_reacciones)
+            log_K = np.log(k_f) - np.log(k_r)
+            equilibrium['K_eq_kinetic'] = np.exp(log_K.sum(axis=1))
+
+            if thermodynamics is not None:
+                K_thermo = thermodynamics.equilibrium_constant(T, '1-step')
+                # Reparto geométrico de la corrección entre los pasos
+                log_K += ((np.log(K_thermo) - log_K.sum(axis=1)) / log_K.shape[1])[:, None]
+                equilibrium['K_eq_thermo'] = K_thermo
+
+            equilibrium['K_eq'] = np.exp(log_K.sum(axis=1))
+
+        if self.model_type == '1-step':
+            concentrations = self._equilibrium_1step(y0, log_K[:, 0] if self.reversible else None)
+        else:
+            concentrations = self._equilibrium_3step(y0, log_K if self.reversible else None, T)
+
+        for species in species_names:
+            equilibrium[f'C_{species}'] = np.broadcast_to(concentrations[species], T.shape)
+
+        C_TG0 = y0['TG']
+        if C_TG0 > 0:
+            equilibrium['conversion_%'] = (C_TG0 - equilibrium['C_TG']) / C_TG0 * 100
+            equilibrium['FAME_yield_%'] = equilibrium['C_FAME'] / (3.0 * C_TG0) * 100
+
+        equilibrium['t_equilibrium'] = np.full(T.shape, np.inf)
+        equilibrium['temperature'] = T
+
+        if np.ndim(T_celsius) == 0:
+            equilibrium = {key: value[0] for key, value in equilibrium.items()}
+
+        return equilibrium
+
+    @staticmethod
+    def _bisect(func, lo: np.ndarray, hi: np.ndarray, n_iter: int = 100) -> np.ndarray:
+        """
+        Bisección vectorizada para funciones crecientes con func(lo) < 0 < func(hi).
+
+        Args:
+            func: Función vectorizada
+            lo: Cotas inferiores
+            hi: Cotas superiores
+            n_iter: Iteraciones (100 agotan la precisión de punto flotante)
+
+        Returns:
+            Raíces
+        """
+        lo = np.array(lo, dtype=float)
+        hi = np.array(hi, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for _ in range(n_iter):
+                mid = 0.5 * (lo + hi)
+                positive = func(mid) > 0
+                hi = np.where(positive, mid, hi)
+                lo = np.where(positive, lo, mid)
+        return 0.5 * (lo + hi)
+
+    def _equilibrium_1step(self, y0: Dict[str, float], log_K: Optional[np.ndarray]) -> Dict:
+        """
+        Equilibrio de TG + 3 MeOH ⇌ 3 FAME + GL en función del avance ξ.
+
+        ln K + ln C_TG + ln C_MeOH - 3 ln C_FAME - ln C_GL = 0
+
+        es monótona decreciente en ξ, con raíz única entre los avances
+        extremos que mantienen todas las concentraciones no negativas.
+        """
+        T0, M0, F0, G0 = y0['TG'], y0['MeOH'], y0['FAME'], y0['GL']
+        xi_max = min(T0, M0 / 3.0)
+        xi_min = -min(F0 / 3.0, G0)
+
+        if log_K is None:
+            # Irreversible: se agota el reactivo limitante
+            xi = np.array(xi_max)
+        else:
+            def residual(xi):
+                # Negativo de la condición de equilibrio (creciente en ξ)
+                return -(log_K + np.log(T0 - xi) + np.log(M0 - 3.0 * xi)
+                         - 3.0 * np.log(F0 + 3.0 * xi) - np.log(G0 + xi))
+
+            xi = self._bisect(residual,
+                              np.full(log_K.shape, xi_min),
+                              np.full(log_K.shape, xi_max))
+
+        return {
+            'TG': T0 - xi,
+            'MeOH': M0 - 3.0 * xi,
+            'FAME': F0 + 3.0 * xi,
+            'GL': G0 + xi,
+        }
+
+    def _equilibrium_3step(self,
+                           y0: Dict[str, float],
+                           log_K: Optional[np.ndarray],
+                           T: np.ndarray) -> Dict:
+        """
+        Equilibrio de las 3 reacciones consecutivas.
+
+        Para un avance total s (FAME formado), Q = C_FAME/C_MeOH fija el reparto
+        de glicéridos: C_DG = C_TG·K1/Q, C_MG = C_DG·K2/Q, C_GL = C_MG·K3/Q, con
+        TG+DG+MG+GL constante. El balance de cadenas de ácido graso
+
+            3·TG + 2·DG + MG + FAME = constante
+
+        es creciente en s y determina la raíz única.
+        """
+        TG0, DG0, MG0, GL0 = y0['TG'], y0['DG'], y0['MG'], y0['GL']
+        F0, M0 = y0['FAME'], y0['MeOH']
+        glycerides = TG0 + DG0 + MG0 + GL0
+        chains = 3.0 * TG0 + 2.0 * DG0 + MG0
+
+        if log_K is None:
+            if M0 < chains:
+                # Irreversible con metanol limitante: el estado final depende
+                # de la cinética, no de un equilibrio
+                warnings.warn("Metanol limitante en modelo irreversible: "
+                              "se calcula el equilibrio por integración")
+                final = [self._equilibrium_by_integration(y0, T_i) for T_i in T]
+                return {species: np.array([f[f'C_{species}'] for f in final])
+                        for species in SPECIES['3-step']}
+            return {
+                'TG': 0.0, 'DG': 0.0, 'MG': 0.0,
+                'GL': glycerides,
+                'FAME': F0 + chains,
+                'MeOH': M0 - chains,
+            }
+
+        # Pesos logarítmicos acumulados de TG, DG, MG, GL relativos a TG
+        cum_log_K = np.concatenate([np.zeros((log_K.shape[0], 1)),
+                                    np.cumsum(log_K, axis=1)], axis=1)
+
+        def distribution(s):
+            log_Q = np.log(F0 + s) - np.log(M0 - s)
+            log_w = cum_log_K - np.arange(4) * log_Q[:, None]
+            log_w -= log_w.max(axis=1, keepdims=True)
+            w = np.exp(log_w)
+            return glycerides * w / w.sum(axis=1, keepdims=True)
+
+        def residual(s):
+            G = distribution(s)
+            return 3.0 * G[:, 0] + 2.0 * G[:, 1] + G[:, 2] + s - chains
+
+        s = self._bisect(residual,
+                         np.full(T.shape, -F0),
+                         np.full(T.shape, M0))
+        G = distribution(s)
+
+        return {
+            'TG': G[:, 0], 'DG': G[:, 1], 'MG': G[:, 2], 'GL': G[:, 3],
+            'FAME': F0 + s,
+            'MeOH': M0 - s,
+        }
+
+    def _equilibrium_by_integration(self, C0: Dict[str, float], T_celsius=None) -> Dict:
+        """
+        Calcula concentraciones de equilibrio simulando a tiempo largo.
 
         Args:
             C0: Condiciones iniciales
@@ -330,14 +1656,15 @@ class KineticModel:
         Returns:
             Concentraciones de equilibrio
         """
-        if T_celsius is not None:
-            self.set_temperature(T_celsius)
+        if T_celsius is None:
+            T_celsius = self.temperature
 
-        # Simular hasta t = 10000 min (tiempo muy largo)
+        # Simular hasta t = 10000 min (tiempo muy largo), sin modificar el modelo
         results = self.simulate(
             t_span=(0, 10000),
             C0=C0,
-            method='Radau'
+            method='Radau',
+            temperature=T_celsius
         )
 
         # Extraer valores finales
@@ -348,7 +1675,7 @@ class KineticModel:
                     equilibrium[key] = value[-1]
 
         equilibrium['t_equilibrium'] = results['t'][-1]
-        equilibrium['temperature'] = self.temperature
+        equilibrium['temperature'] = T_celsius
 
         return equilibrium
 
@@ -356,52 +1683,72 @@ class KineticModel:
                            t_span: Tuple[float, float],
                            C0: Dict[str, float],
                            param_name: str,
-                           perturbation: float = 0.01) -> Dict:
+                           perturbation: float = 0.01,
+                           method: str = 'forward') -> Dict:
         """
         Análisis de sensibilidad local para un parámetro.
 
-        S = (dY/Y) / (dP/P) ≈ (ΔY/Y) / (ΔP/P)
+        S = (dY/Y) / (dP/P)
 
         Args:
             t_span: Rango de tiempo
             C0: Condiciones iniciales
-            param_name: Nombre del parámetro (ej. 'Ea_forward', 'A_forward')
-            perturbation: Fracción de perturbación (default 1%)
+            param_name: Nombre del parámetro (ej. 'Ea_forward', 'step1_A_forward')
+            perturbation: Fracción de perturbación (solo para 'finite_difference')
+            method: 'forward' (ecuaciones de sensibilidad, exacto) o
+                    'finite_difference' (perturbar y re-simular)
 
         Returns:
             Diccionario con sensibilidades para cada especie
         """
-        # Simulación base
-        results_base = self.simulate(t_span, C0)
+        if method == 'finite_difference':
+            return self._sensitivity_finite_difference(t_span, C0, param_name, perturbation)
+        if method != 'forward':
+            raise ValueError(f"Método '{method}' no reconocido")
 
-        # Guardar parámetro original
-        if self.model_type == '1-step':
-            original_value = self.params[param_name]
-        else:
-            # Para 3-step, asumir formato 'step1_Ea_forward'
-            step, param = param_name.split('_', 1)
-            original_value = self.params[step][param]
+        if param_name not in self.kinetic_parameter_names():
+            raise ValueError(f"Parámetro '{param_name}' no reconocido")
 
-        # Perturbar parámetro
-        perturbed_value = original_value * (1 + perturbation)
+        results = self.simulate_sensitivities(t_span, C0)
+        idx = results['param_names'].index(param_name)
+        P = self._get_param(param_name)
 
-        if self.model_type == '1-step':
-            self.params[param_name] = perturbed_value
-        else:
-            self.params[step][param] = perturbed_value
+        sensitivities = {'t': results['t']}
 
-        # Actualizar constantes de velocidad
-        self._update_rate_constants(self.temperature)
+        for i, species in enumerate(results['species']):
+            Y = results['C'][:, i]
+            dY_dP = results['S'][:, i, idx]
 
-        # Simulación perturbada
-        results_pert = self.simulate(t_span, C0, t_eval=results_base['t'])
+            # Evitar división por cero
+            with np.errstate(divide='ignore', invalid='ignore'):
+                S = dY_dP * P / Y
+                S = np.nan_to_num(S, nan=0.0, posinf=0.0, neginf=0.0)
 
-        # Restaurar parámetro original
-        if self.model_type == '1-step':
-            self.params[param_name] = original_value
-        else:
-            self.params[step][param] = original_value
-        self._update_rate_constants(self.temperature)
+            sensitivities[f'S_C_{species}'] = S
+
+        return sensitivities
+
+    def _sensitivity_finite_difference(self,
+                                       t_span: Tuple[float, float],
+                                       C0: Dict[str, float],
+                                       param_name: str,
+                                       perturbation: float = 0.01) -> Dict:
+        """
+        Sensibilidad normalizada por diferencias finitas.
+
+        S ≈ (ΔY/Y) / (ΔP/P)
+        """
+        # Simulación base
+        results_base = self.simulate(t_span, C0)
+
+        # Perturbar el parámetro sobre una copia (el modelo no se modifica)
+        original_value = self._get_param(param_name)
+        params_pert = self.copy_params()
+        self._set_param(param_name, original_value * (1 + perturbation), params_pert)
+
+        # Simulación perturbada
+        results_pert = self.simulate(t_span, C0, t_eval=results_base['t'],
+                                     params=params_pert)
 
         # Calcular sensibilidades
         sensitivities = {'t': results_base['t']}
@@ -428,12 +1775,263 @@ class KineticModel:
             'temperature': self.temperature,
             'rate_constants': self.k.copy(),
             'parameters': self.params.copy(),
+            'reactions': [reaction.equation for reaction in self.network.reactions],
         }
         return info
 
+    def fingerprint(self) -> str:
+        """
+        Huella del modelo: tipo, reversibilidad, red y parámetros cinéticos.
+
+        Dos modelos con la misma huella producen las mismas simulaciones
+        (a igual temperatura y condiciones); cambia tras un reajuste.
+
+        Returns:
+            Hash SHA-256 (hex)
+        """
+        if self._network_spec is None:
+            self._network_spec = self.network.to_dict()
+        return content_hash(model_type=self.model_type, reversible=self.reversible,
+                            network=self._network_spec, params=self.params)
+
+    def handle(self) -> 'ModelHandle':
+        """Descriptor ligero y serializable del modelo (ver ModelHandle)."""
+        return ModelHandle(
+            model_type=self.model_type,
+            reversible=self.reversible,
+            network=self.network.to_dict() if self.model_type == 'custom' else None,
+            params=copy.deepcopy(self.params),
+            temperature=self.temperature,
+        )
+
+
+# Modelos construidos por proceso a partir de ModelHandle (la red se genera una vez)
+_MODEL_CACHE: Dict[Tuple, KineticModel] = {}
+
+
+@dataclass(frozen=True)
+class ModelHandle:
+    """
+    Descriptor serializable de un KineticModel para procesos de trabajo.
+
+    Contiene solo datos (sin funciones generadas), por lo que se envía barato
+    a un ProcessPoolExecutor; cada proceso construye el modelo una vez y lo
+    reutiliza en las llamadas siguientes.
+
+    Attributes:
+        model_type (str): Tipo de modelo ('1-step', '3-step' o 'custom')
+        reversible (bool): Si el modelo considera reversibilidad
+        network (Dict): Especificación de la red (solo 'custom', ver ReactionNetwork.to_dict)
+        params (Dict): Parámetros cinéticos por defecto de las simulaciones
+        temperature (float): Temperatura por defecto (°C)
+    """
+    model_type: str = '1-step'
+    reversible: bool = True
+    network: Optional[Dict] = None
+    params: Optional[Dict] = None
+    temperature: float = 65.0
+
+    def build(self) -> KineticModel:
+        """Modelo del proceso actual para este tipo de modelo/red (en caché)."""
+        key = (self.model_type, self.reversible,
+               json.dumps(self.network, sort_keys=True) if self.network is not None else None)
+        model = _MODEL_CACHE.get(key)
+        if model is None:
+            network = ReactionNetwork.from_dict(self.network) if self.network is not None else None
+            # Parámetros por defecto: los del descriptor se pasan en cada simulación
+            model = KineticModel(self.model_type, self.reversible, network=network)
+            _MODEL_CACHE[key] = model
+        return model
+
+    def simulate(self,
+                 params: Optional[Dict],
+                 T_celsius: Optional[float],
+                 C0: Dict[str, float],
+                 t_span: Tuple[float, float],
+                 **kwargs) -> SimulationResult:
+        """
+        Simulación sin estado: el resultado depende solo de los argumentos.
+
+        Args:
+            params: Parámetros cinéticos (si None, los del descriptor)
+            T_celsius: Temperatura (°C) (si None, la del descriptor)
+            C0: Condiciones iniciales {componente: concentración (mol/L)}
+            t_span: Tupla (t_initial, t_final) en minutos
+            **kwargs: Opciones de KineticModel.simulate (method, final_only, ...)
+
+        Returns:
+            SimulationResult
+        """
+        return self.build().simulate(
+            t_span, C0,
+            temperature=self.temperature if T_celsius is None else T_celsius,
+            params=self.params if params is None else params,
+            **kwargs)
+
+
+def simulate(params: Optional[Dict],
+             T_celsius: float,
+             C0: Dict[str, float],
+             t_span: Tuple[float, float],
+             model_type: str = '1-step',
+             reversible: bool = True,
+             network: Optional[Dict] = None,
+             **kwargs) -> SimulationResult:
+    """
+    Núcleo puro de simulación: simulate(params, T, C0, t_span).
+
+    No comparte estado mutable entre llamadas, por lo que es seguro en hilos y
+    procesos (el modelo se construye una vez por proceso y tipo de red).
+
+    Args:
+        params: Parámetros cinéticos (si None, los de literatura o de la red)
+        T_celsius: Temperatura (°C)
+        C0: Condiciones iniciales {componente: concentración (mol/L)}
+        t_span: Tupla (t_initial, t_final) en minutos
+        model_type: Tipo de modelo ('1-step', '3-step' o 'custom')
+        reversible: Si considerar reacciones reversibles
+        network: Especificación de la red para 'custom' (ReactionNetwork.to_dict)
+        **kwargs: Opciones de KineticModel.simulate (method, final_only, ...)
+
+    Returns:
+        SimulationResult
+    """
+    handle = ModelHandle(model_type=model_type, reversible=reversible, network=network)
+    return handle.simulate(params, T_celsius, C0, t_span, **kwargs)
+
 
 # Funciones auxiliares
 
+def _mapped_event(event: Callable, transform: Callable) -> Callable:
+    """Evento event(t, C) evaluado sobre el estado x con C = transform(x)."""
+    def mapped(t, x):
+        return event(t, transform(x))
+
+    mapped.terminal = getattr(event, 'terminal', False)
+    mapped.direction = getattr(event, 'direction', 0)
+    return mapped
+
+
+def _extent_to_concentration(xi: np.ndarray, y0: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """Concentraciones C = C0 + B·ξ para avances ξ de forma (n_avances, ...)."""
+    C = np.tensordot(B, xi, axes=1)
+    return C + y0.reshape(y0.shape + (1,) * (C.ndim - 1))
+
+
+def _mapped_solution(t, sol: Callable, transform: Callable) -> np.ndarray:
+    """Salida densa en concentraciones a partir del interpolante del estado x."""
+    return transform(sol(t))
+
+
+def analytic_time_grid(t_span: Tuple[float, float],
+                       rate: float,
+                       num_points: int = ANALYTIC_NUM_POINTS) -> np.ndarray:
+    """
+    Tiempos de salida por defecto de la solución cerrada.
+
+    t0 seguido de una malla geométrica desde ANALYTIC_FIRST_STEP/rate hasta
+    t_final, de modo que el ascenso inicial de la conversión queda resuelto
+    aunque sea mucho más rápido que t_span. Si la cinética es lenta frente
+    a t_span (o rate ≤ 0) la malla es equiespaciada.
+
+    Args:
+        t_span: Tupla (t_initial, t_final) en minutos
+        rate: Inverso del tiempo característico, k·C_MeOH0 (1/min)
+        num_points: Número de tiempos
+
+    Returns:
+        Tiempos (min), crecientes, con t_initial y t_final incluidos
+    """
+    t0, t_final = t_span
+    duration = t_final - t0
+    first = ANALYTIC_FIRST_STEP / rate if rate > 0 else np.inf
+    if not first < duration / (num_points - 1):
+        return np.linspace(t0, t_final, num_points)
+    return np.concatenate([[t0], t0 + np.geomspace(first, duration, num_points - 1)])
+
+
+def analytic_1step_irreversible(t, k, C_TG0, C_MeOH0):
+    """
+    Concentración de TG exacta para TG + 3 MeOH → 3 FAME + GL con r = k·C_TG·C_MeOH.
+
+    Con a = C_MeOH0 - 3·C_TG0 (exceso de metanol) y z = a·k·t:
+
+        C_TG(t) = C_TG0 / (exp(z) + 3·C_TG0·k·t·(exp(z) - 1)/z)
+
+    que se reduce a C_TG0 / (1 + 3·C_TG0·k·t) en proporción estequiométrica
+    (z → 0). Todos los argumentos admiten broadcasting de numpy.
+
+    Args:
+        t: Tiempo (min)
+        k: Constante de velocidad directa (L/(mol·min))
+        C_TG0: Concentración inicial de TG (mol/L)
+        C_MeOH0: Concentración inicial de MeOH (mol/L)
+
+    Returns:
+        C_TG(t) (mol/L)
+    """
+    t = np.asarray(t, dtype=float)
+    kt = k * t
+    z = (C_MeOH0 - 3.0 * C_TG0) * kt
+
+    # exp(z) → ∞ (exceso de metanol a tiempo largo) da C_TG = 0 sin pérdida
+    with np.errstate(over='ignore', invalid='ignore'):
+        # (exp(z) - 1)/z, con límite 1 en z = 0
+        z_safe = np.where(z == 0, 1.0, z)
+        phi = np.where(z == 0, 1.0, np.expm1(z) / z_safe)
+        C_TG = C_TG0 / (np.exp(z) + 3.0 * C_TG0 * kt * phi)
+    # Sin TG inicial (0·∞ en el denominador) la concentración es nula
+    return np.where(C_TG0 == 0, 0.0, C_TG)
+
+
+def analytic_1step_irreversible_profile(t, k, y0, t0=0.0):
+    """
+    Perfil exacto [TG, MeOH, FAME, GL] del modelo de 1 paso irreversible.
+
+    Args:
+        t: Tiempo(s) (min)
+        k: Constante de velocidad directa (L/(mol·min))
+        y0: Concentraciones iniciales en el orden de SPECIES['1-step']
+        t0: Tiempo inicial (min)
+
+    Returns:
+        Arreglo (4,) o (4, len(t)) de concentraciones (mol/L)
+    """
+    C_TG0, C_MeOH0, C_FAME0, C_GL0 = y0
+    C_TG = analytic_1step_irreversible(np.asarray(t, dtype=float) - t0, k, C_TG0, C_MeOH0)
+
+    # Estequiometría: TG + 3 MeOH → 3 FAME + GL
+    extent = C_TG0 - C_TG
+    return np.array([C_TG, C_MeOH0 - 3.0 * extent, C_FAME0 + 3.0 * extent, C_GL0 + extent])
+
+
+def analytic_1step_irreversible_time(C_TG, k, C_TG0, C_MeOH0):
+    """
+    Tiempo en que el modelo de 1 paso irreversible alcanza C_TG (inversa exacta).
+
+    Con a = C_MeOH0 - 3·C_TG0 y u = (C_TG0/C_TG - 1)/C_MeOH0:
+
+        t = ln(1 + a·u) / (a·k)     (t = u/k si a = 0)
+
+    Args:
+        C_TG: Concentración de TG buscada (mol/L)
+        k: Constante de velocidad directa (L/(mol·min))
+        C_TG0: Concentración inicial de TG (mol/L)
+        C_MeOH0: Concentración inicial de MeOH (mol/L)
+
+    Returns:
+        Tiempo (min); infinito si C_TG no es alcanzable
+    """
+    a = C_MeOH0 - 3.0 * C_TG0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        u = (C_TG0 / np.asarray(C_TG, dtype=float) - 1.0) / C_MeOH0
+        a_safe = np.where(a == 0, 1.0, a)
+        t = np.where(a == 0, u / k, np.log1p(a * u) / (a_safe * k))
+
+    # Por debajo del valor asintótico (o C_TG ≤ 0) la meta no se alcanza
+    return np.where(np.isfinite(t) & (t >= 0), t, np.inf)
+
+
 def batch_reactor(model: KineticModel,
                   V_reactor: float,
                   n0: Dict[str, float],
@@ -467,51 +2065,136 @@ def batch_reactor(model: KineticModel,
 
 def residence_time_distribution(model: KineticModel,
                                 C0: Dict[str, float],
-                                tau_mean: float,
-                                num_points: int = 100) -> Dict:
+                                tau_mean,
+                                num_points: int = 100,
+                                rtd_model: str = 'cstr',
+                                n_tanks: int = 1,
+                                E_table: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+                                method: str = 'Radau',
+                                rtol: float = 1e-6,
+                                atol: float = 1e-8) -> Dict:
     """
-    Calcula la distribución de tiempos de residencia (RTD) para un CSTR.
+    Concentraciones de salida de un reactor continuo con flujo segregado.
+
+    C_out = ∫ C_batch(t)·E(t) dt
+
+    La curva batch C(t) se obtiene con una sola integración (salida densa)
+    hasta el mayor tiempo requerido, y la integral se evalúa por trapecios
+    sobre los pasos del integrador subdivididos más una malla uniforme de
+    num_points puntos por τ; la cola t > t_max se aproxima con C(t_max).
+    Con un arreglo de τ se reutiliza la misma integración para todos.
 
-    Para CSTR ideal: E(t) = (1/τ) * exp(-t/τ)
+    Modelos de RTD:
+        'cstr':            E(t) = (1/τ)·exp(-t/τ)
+        'tanks_in_series': E(t) = N^N·t^(N-1)/(τ^N·(N-1)!)·exp(-N·t/τ)
+        'tabulated':       E(t) interpolada de E_table = (t, E), normalizada;
+                           si tau_mean no es None se reescala a esa media
 
     Args:
         model: Instancia de KineticModel
         C0: Concentraciones de entrada
-        tau_mean: Tiempo de residencia promedio (min)
-        num_points: Número de puntos para integración
+        tau_mean: Tiempo de residencia promedio (min), escalar o arreglo
+        num_points: Número de puntos de la malla uniforme de E(t)
+        rtd_model: 'cstr', 'tanks_in_series' o 'tabulated'
+        n_tanks: Número de tanques para 'tanks_in_series'
+        E_table: Tupla (t, E) para 'tabulated'
+        method: Método de integración para la curva batch
+        rtol: Tolerancia relativa
+        atol: Tolerancia absoluta
 
     Returns:
-        Distribución de concentraciones de salida
+        Dict con 't_values', 'E_t', 'C_out' {especie: concentración},
+        'conversion_%' y 'tau_mean' (con una dimensión por τ si es arreglo)
     """
-    t_max = 5 * tau_mean  # 5 veces tau para cubrir >99%
-    t_values = np.linspace(0, t_max, num_points)
-
-    # Función RTD para CSTR ideal
-    E_t = (1 / tau_mean) * np.exp(-t_values / tau_mean)
-
-    # Simular para cada tiempo
-    C_out = {key: 0.0 for key in C0.keys()}
-
-    for i, t in enumerate(t_values):
-        if t == 0:
-            continue
-
-        # Simular hasta tiempo t
-        result = model.simulate((0, t), C0)
+    from scipy import stats
+    from scipy.integrate import cumulative_trapezoid, trapezoid
+
+    # Tiempos de residencia y funciones E(t), 1 - F(t) para cada τ
+    if rtd_model == 'tabulated':
+        if E_table is None:
+            raise ValueError("rtd_model='tabulated' requiere E_table = (t, E)")
+        t_tab, E_tab = (np.asarray(a, dtype=float) for a in E_table)
+        E_tab = E_tab / trapezoid(E_tab, t_tab)
+        tau_tab = trapezoid(t_tab * E_tab, t_tab)
+        F_tab = cumulative_trapezoid(E_tab, t_tab, initial=0.0)
+
+        if tau_mean is None:
+            tau_mean = tau_tab
+        taus = np.atleast_1d(np.asarray(tau_mean, dtype=float))
+
+        # Reescalado t' = t·τ/τ_tab, E'(t') = E(t)·τ_tab/τ
+        rtds = [(lambda t, s=tau / tau_tab: np.interp(t / s, t_tab, E_tab, left=0.0, right=0.0) / s,
+                 lambda t, s=tau / tau_tab: 1.0 - np.interp(t / s, t_tab, F_tab, left=0.0, right=1.0),
+                 t_tab[-1] * tau / tau_tab)
+                for tau in taus]
+
+    elif rtd_model in ('cstr', 'tanks_in_series'):
+        N = 1 if rtd_model == 'cstr' else int(n_tanks)
+        if N < 1:
+            raise ValueError("n_tanks debe ser >= 1")
+        taus = np.atleast_1d(np.asarray(tau_mean, dtype=float))
+        dists = [stats.gamma(a=N, scale=tau / N) for tau in taus]
+        # t_max: cola con probabilidad 1e-6
+        rtds = [(dist.pdf, dist.sf, dist.isf(1e-6)) for dist in dists]
+
+    else:
+        raise ValueError(f"Modelo de RTD '{rtd_model}' no reconocido")
+
+    species_names = model.species
+    t_max = max(rtd[2] for rtd in rtds)
+    uniform_grids = [np.linspace(0, rtd[2], num_points) for rtd in rtds]
+
+    # Curva batch C(t): una sola evaluación sobre todos los nodos
+    if model.has_analytic_solution():
+        step_nodes = np.concatenate([[0.0], np.geomspace(t_max * 1e-9, t_max, 1000)])
+
+        def profile(t):
+            sol = model.analytic_solution(t, C0)
+            return np.array([sol[f'C_{species}'] for species in species_names])
+    else:
+        y0 = np.array([C0.get(species, 0) for species in species_names], dtype=float)
+        options = {'jac': model.jac} if method in ('Radau', 'BDF', 'LSODA') else {}
+        solution = solve_ivp(model.odes, (0, t_max), y0, method=method,
+                             rtol=rtol, atol=atol, dense_output=True, **options)
+        if not solution.success:
+            warnings.warn(f"Integración falló: {solution.message}")
 
-        # Ponderar por RTD
-        weight = E_t[i] * (t_values[1] - t_values[0] if i < len(t_values) - 1 else 0)
+        # Cada paso del integrador subdividido en 4 para la cuadratura
+        steps = solution.t
+        fractions = np.linspace(0, 1, 5)[:-1]
+        step_nodes = np.append((steps[:-1, None] + np.diff(steps)[:, None] * fractions).ravel(),
+                               steps[-1])
+        profile = solution.sol
+
+    nodes = np.unique(np.concatenate([step_nodes] + uniform_grids))
+    C_nodes = profile(nodes)
+
+    C_out = np.zeros((len(taus), len(species_names)))
+    for i, (E_func, survival, t_end) in enumerate(rtds):
+        mask = nodes <= t_end
+        t_i = nodes[mask]
+        E_i = E_func(t_i)
+        tail = survival(t_end)
+        # Normalizar para que los pesos sumen 1 (conserva los balances lineales)
+        norm = trapezoid(E_i, t_i) + tail
+        C_out[i] = (trapezoid(C_nodes[:, mask] * E_i, t_i) + C_nodes[:, mask][:, -1] * tail) / norm
+
+    scalar = np.ndim(tau_mean) == 0
+    squeeze = (lambda a: a[0]) if scalar else (lambda a: a)
+
+    results = {
+        't_values': squeeze(np.array(uniform_grids)),
+        'E_t': squeeze(np.array([rtd[0](grid) for rtd, grid in zip(rtds, uniform_grids)])),
+        'C_out': {species: squeeze(C_out[:, j]) for j, species in enumerate(species_names)},
+        'tau_mean': squeeze(taus),
+        'rtd_model': rtd_model,
+    }
 
-        for key in C_out.keys():
-            if f'C_{key}' in result:
-                C_out[key] += result[f'C_{key}'][-1] * weight
+    C_TG0 = C0.get('TG', 0)
+    if C_TG0 > 0:
+        results['conversion_%'] = (C_TG0 - results['C_out']['TG']) / C_TG0 * 100
 
-    return {
-        't_values': t_values,
-        'E_t': E_t,
-        'C_out': C_out,
-        'tau_mean': tau_mean
-    }
+    return results
 
 
 if __name__ == "__main__":
@@ -0,0 +1,434 @@
+"""
+Curvas Maestras Adimensionales del Modelo de 1 Paso
+
+Para el modelo global TG + 3 MeOH ⇌ 3 FAME + GL con
+r = k_f·C_TG·C_MeOH - k_r·C_FAME³·C_GL y C_FAME0 = C_GL0 = 0, la conversión
+X solo depende de tres grupos adimensionales:
+
+    τ = k_f·C_TG0·t            (tiempo adimensional)
+    R = C_MeOH0 / C_TG0        (relación molar)
+    κ = k_r·C_TG0² / k_f       (reversibilidad; 0 si irreversible)
+
+    dX/dτ = (1 - X)·(R - 3X) - 27·κ·X⁴,   X(0) = 0
+
+MasterCurveTable tabula X(τ; R, κ) una sola vez (independiente de T y de los
+parámetros de Arrhenius) y la interpola sin resolver EDOs:
+
+    - τ: coordenada s = asinh(τ/τ_0) (lineal cerca de 0, logarítmica a τ
+      grande) con interpolación de Hermite cúbica usando la derivada exacta
+      dX/ds = f(X)·τ_0·cosh(s)
+    - R (coordenada u = asinh((R - 3)/R_0)) y κ (coordenada
+      v = asinh(√κ/σ_0), que incluye κ = 0): Lagrange cúbica con 4 nodos.
+      Con R → 3 y κ → 0 la conversión tiende a 1 con una capa límite de
+      ancho ~1/τ en R (X depende de (R - 3)·τ) y el equilibrio cumple
+      1 - X_eq ≈ 3·√κ, por eso los nodos se concentran en escala
+      logarítmica alrededor de R = 3 y de √κ = 0
+
+La cota de error se valida al construir la tabla contra la integración
+directa en los centros de todas las celdas (donde el error de interpolación
+es máximo) y la malla se refina hasta cumplir la tolerancia pedida.
+
+Author: Sistema de Modelado de Esterificación
+Date: 2025-11-19
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from scipy.integrate import solve_ivp
+from scipy.sparse import diags
+
+from .simulation_cache import CACHE_DIR_ENV
+
+
+# Versión del formato de archivo (cambiarla invalida las tablas guardadas)
+TABLE_FORMAT_VERSION = 1
+
+# Dominio y tolerancia por defecto
+DEFAULT_SPEC = {
+    'R_bounds': (3.0, 15.0),
+    'kappa_max': 10.0,
+    'tau_max': 1e6,
+    'tol': 1e-3,            # error máximo en X (fracción): 0.1 puntos de conversión
+}
+
+# Escalas de las coordenadas asinh (τ_0, κ_0, R_0) y centro del eje R
+TAU_SCALE = 1e-3
+KAPPA_SCALE = 1e-3     # escala de √κ
+RATIO_SCALE = 1e-2
+RATIO_CENTER = 3.0
+
+# Factor de seguridad sobre el error máximo observado en la validación
+ERROR_SAFETY_FACTOR = 2.0
+
+_default_table = None
+
+
+def _ratio_coordinate(R):
+    """Coordenada u = asinh((R - 3)/R_0) del eje de relación molar."""
+    return np.arcsinh((np.asarray(R, dtype=float) - RATIO_CENTER) / RATIO_SCALE)
+
+
+def _ratio(u):
+    """Relación molar R a partir de la coordenada u."""
+    return RATIO_CENTER + RATIO_SCALE * np.sinh(u)
+
+
+def _kappa_coordinate(kappa):
+    """Coordenada v = asinh(√κ/σ_0) del eje de reversibilidad."""
+    return np.arcsinh(np.sqrt(kappa) / KAPPA_SCALE)
+
+
+def _kappa(v):
+    """Grupo de reversibilidad κ a partir de la coordenada v."""
+    return (KAPPA_SCALE * np.sinh(v)) ** 2
+
+
+def master_curve_rhs(X: np.ndarray, R: np.ndarray, kappa: np.ndarray) -> np.ndarray:
+    """dX/dτ del modelo de 1 paso en variables adimensionales."""
+    return (1.0 - X) * (R - 3.0 * X) - 27.0 * kappa * X ** 4
+
+
+def integrate_master_curves(tau: np.ndarray,
+                            R: np.ndarray,
+                            kappa: np.ndarray,
+                            rtol: float = 1e-10,
+                            atol: float = 1e-13) -> np.ndarray:
+    """
+    Integra dX/dτ para varias parejas (R, κ) a la vez.
+
+    Args:
+        tau: Tiempos adimensionales de salida (crecientes, desde 0)
+        R: Relaciones molares, forma (N,)
+        kappa: Grupos de reversibilidad, forma (N,)
+        rtol: Tolerancia relativa
+        atol: Tolerancia absoluta
+
+    Returns:
+        X de forma (N, len(tau))
+    """
+    R = np.asarray(R, dtype=float)
+    kappa = np.asarray(kappa, dtype=float)
+
+    def fun(t, X):
+        return master_curve_rhs(X, R, kappa)
+
+    def jac(t, X):
+        # Sistemas escalares independientes: Jacobiano diagonal
+        return diags(-(R - 3.0 * X) - 3.0 * (1.0 - X) - 108.0 * kappa * X ** 3)
+
+    solution = solve_ivp(fun, (0.0, float(tau[-1])), np.zeros(R.size), method='Radau',
+                         t_eval=tau, jac=jac, rtol=rtol, atol=atol)
+    if not solution.success:
+        raise RuntimeError(f"Integración de curvas maestras falló: {solution.message}")
+    return solution.y
+
+
+def _lagrange_weights(u: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Índices y pesos de Lagrange cúbica (4 nodos) en una malla uniforme.
+
+    Args:
+        u: Coordenada en unidades de nodo (0 … n-1)
+        n: Número de nodos
+
+    Returns:
+        Tupla (i0, w) con i0 el primer nodo del esténcil y w de forma (4, ...)
+    """
+    i0 = np.clip(np.floor(u).astype(int) - 1, 0, n - 4)
+    x = u - i0  # posición dentro del esténcil [i0, i0+3]
+    w = np.stack([
+        -(x - 1) * (x - 2) * (x - 3) / 6,
+        x * (x - 2) * (x - 3) / 2,
+        -x * (x - 1) * (x - 3) / 2,
+        x * (x - 1) * (x - 2) / 6,
+    ])
+    return i0, w
+
+
+class MasterCurveTable:
+    """
+    Tabla interpolada de conversión X(τ, R, κ) del modelo de 1 paso.
+
+    Attributes:
+        spec (Dict): Dominio y tolerancia (R_bounds, kappa_max, tau_max, tol)
+        u_grid (np.ndarray): Nodos en u = asinh((R - 3)/R_0)
+        v_grid (np.ndarray): Nodos en v = asinh(√κ/σ_0)
+        s_grid (np.ndarray): Nodos en s = asinh(τ/τ_0)
+        X (np.ndarray): Conversión (fracción) en los nodos, forma (n_R, n_v, n_s)
+        error_bound (float): Cota validada del error absoluto en X (fracción)
+    """
+
+    def __init__(self,
+                 spec: Dict,
+                 u_grid: np.ndarray,
+                 v_grid: np.ndarray,
+                 s_grid: np.ndarray,
+                 X: np.ndarray,
+                 error_bound: float):
+        """
+        Inicializa la tabla (usar build() o load()).
+
+        Args:
+            spec: Dominio y tolerancia
+            u_grid: Nodos en u (uniformes)
+            v_grid: Nodos en v (uniformes)
+            s_grid: Nodos en s (uniformes)
+            X: Conversión en los nodos, forma (n_R, n_v, n_s)
+            error_bound: Cota validada del error en X
+        """
+        self.spec = dict(spec)
+        self.u_grid = u_grid
+        self.v_grid = v_grid
+        self.s_grid = s_grid
+        self.X = X
+        self.error_bound = float(error_bound)
+
+        # Derivadas exactas dX/ds en los nodos
+        R = _ratio(u_grid)[:, None, None]
+        kappa = _kappa(v_grid)[None, :, None]
+        self.dX_ds = (master_curve_rhs(X, R, kappa)
+                      * TAU_SCALE * np.cosh(s_grid)[None, None, :])
+
+    # ------------------------------------------------------------------
+    # Construcción
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(cls,
+              R_bounds: Tuple[float, float] = DEFAULT_SPEC['R_bounds'],
+              kappa_max: float = DEFAULT_SPEC['kappa_max'],
+              tau_max: float = DEFAULT_SPEC['tau_max'],
+              tol: float = DEFAULT_SPEC['tol'],
+              n_R: int = 13,
+              n_v: int = 13,
+              n_s: int = 161,
+              max_refinements: int = 4,
+              verbose: bool = False) -> 'MasterCurveTable':
+        """
+        Genera la tabla refinando la malla hasta que el error validado ≤ tol.
+
+        En cada refinamiento se duplica la densidad de los ejes cuyo error de
+        validación (variando solo ese eje) supera tol/2.
+
+        Args:
+            R_bounds: Rango de relación molar (R_min, R_max)
+            kappa_max: κ máximo (κ_min = 0)
+            tau_max: τ máximo
+            tol: Error absoluto máximo admitido en X (fracción)
+            n_R, n_v, n_s: Nodos iniciales de cada eje
+            max_refinements: Refinamientos máximos
+            verbose: Si imprimir el progreso
+
+        Returns:
+            MasterCurveTable con error_bound ≤ tol
+
+        Raises:
+            RuntimeError: Si no se alcanza tol tras max_refinements
+        """
+        spec = {'R_bounds': tuple(float(r) for r in R_bounds), 'kappa_max': float(kappa_max),
+                'tau_max': float(tau_max), 'tol': float(tol)}
+        v_max = _kappa_coordinate(kappa_max)
+        s_max = np.arcsinh(tau_max / TAU_SCALE)
+
+        for refinement in range(max_refinements + 1):
+            u_grid = np.linspace(_ratio_coordinate(R_bounds[0]), _ratio_coordinate(R_bounds[1]), n_R)
+            v_grid = np.linspace(0.0, v_max, n_v)
+            s_grid = np.linspace(0.0, s_max, n_s)
+
+            UU, VV = np.meshgrid(u_grid, v_grid, indexing='ij')
+            X = integrate_master_curves(TAU_SCALE * np.sinh(s_grid), _ratio(UU.ravel()),
+                                        _kappa(VV.ravel()))
+            table = cls(spec, u_grid, v_grid, s_grid, X.reshape(n_R, n_v, n_s), 0.0)
+
+            errors = table._validate()
+            table.error_bound = ERROR_SAFETY_FACTOR * max(errors.values())
+            if verbose:
+                print(f"Malla {n_R}×{n_v}×{n_s}: error por eje "
+                      + ", ".join(f"{axis}={err:.2e}" for axis, err in errors.items())
+                      + f" → cota {table.error_bound:.2e}")
+            if table.error_bound <= tol:
+                return table
+
+            # Refinar solo los ejes que aportan error
+            if errors['R'] > tol / (2 * ERROR_SAFETY_FACTOR):
+                n_R = 2 * n_R - 1
+            if errors['kappa'] > tol / (2 * ERROR_SAFETY_FACTOR):
+                n_v = 2 * n_v - 1
+            if errors['tau'] > tol / (2 * ERROR_SAFETY_FACTOR):
+                n_s = 2 * n_s - 1
+
+        raise RuntimeError(f"No se alcanzó tol={tol:g} (cota {table.error_bound:.2e}); "
+                           "aumente max_refinements o reduzca el dominio")
+
+    def _validate(self) -> Dict[str, float]:
+        """
+        Error máximo de interpolación en los centros de celda.
+
+        Returns:
+            Dict con el error máximo en X al evaluar en centros de celda de
+            cada eje ('R', 'kappa', 'tau') y en los centros 3-D ('cell')
+        """
+        u_mid = 0.5 * (self.u_grid[1:] + self.u_grid[:-1])
+        v_mid = 0.5 * (self.v_grid[1:] + self.v_grid[:-1])
+        s_mid = 0.5 * (self.s_grid[1:] + self.s_grid[:-1])
+
+        # Todos los tiempos (nodos y centros) en una sola integración por pareja
+        s_all = np.sort(np.concatenate([self.s_grid, s_mid]))
+        tau_all = TAU_SCALE * np.sinh(s_all)
+        is_mid = np.isin(s_all, s_mid)
+
+        errors = {}
+        for axis, u_values, v_values in [('R', u_mid, self.v_grid),
+                                         ('kappa', self.u_grid, v_mid),
+                                         ('cell', u_mid, v_mid)]:
+            UU, VV = np.meshgrid(u_values, v_values, indexing='ij')
+            error = np.zeros((UU.size, s_all.size))
+            # Por bloques de filas para acotar la memoria de la interpolación
+            for rows in np.array_split(np.arange(UU.size), max(1, UU.size // 256)):
+                u, v = UU.ravel()[rows], VV.ravel()[rows]
+                X_true = integrate_master_curves(tau_all, _ratio(u), _kappa(v))
+                X_interp = self._interpolate(u[:, None], v[:, None], s_all[None, :])
+                error[rows] = np.abs(X_interp - X_true)
+            if axis == 'cell':
+                errors['tau'] = float(np.max(error[:, is_mid]))
+                errors['cell'] = float(np.max(error))
+            else:
+                errors[axis] = float(np.max(error[:, ~is_mid]))
+        return errors
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+
+    def _interpolate(self, u: np.ndarray, v: np.ndarray, s: np.ndarray) -> np.ndarray:
+        """Interpolación en coordenadas (u, v, s) ya validadas (broadcasting)."""
+        u, v, s = np.broadcast_arrays(u, v, s)
+        n_R, n_v, n_s = self.X.shape
+
+        iR, wR = _lagrange_weights((u - self.u_grid[0]) / (self.u_grid[1] - self.u_grid[0]), n_R)
+        iv, wv = _lagrange_weights(v / (self.v_grid[1] - self.v_grid[0]), n_v)
+
+        # Hermite cúbica en s
+        h = self.s_grid[1] - self.s_grid[0]
+        js = np.clip(np.floor(s / h).astype(int), 0, n_s - 2)
+        x = s / h - js
+        h00 = (1 + 2 * x) * (1 - x) ** 2
+        h10 = x * (1 - x) ** 2
+        h01 = x ** 2 * (3 - 2 * x)
+        h11 = x ** 2 * (x - 1)
+
+        result = np.zeros(u.shape)
+        for a in range(4):
+            for b in range(4):
+                i, j = iR + a, iv + b
+                curve = (h00 * self.X[i, j, js] + h01 * self.X[i, j, js + 1]
+                         + h * (h10 * self.dX_ds[i, j, js] + h11 * self.dX_ds[i, j, js + 1]))
+                result += wR[a] * wv[b] * curve
+        return result
+
+    def conversion(self, tau, R, kappa=0.0) -> np.ndarray:
+        """
+        Conversión interpolada X(τ, R, κ) (fracción, con broadcasting).
+
+        Args:
+            tau: Tiempo adimensional k_f·C_TG0·t
+            R: Relación molar C_MeOH0/C_TG0
+            kappa: Reversibilidad k_r·C_TG0²/k_f (0: irreversible)
+
+        Returns:
+            Conversión (fracción); error absoluto ≤ self.error_bound
+
+        Raises:
+            ValueError: Si algún punto está fuera del dominio de la tabla
+        """
+        tau = np.asarray(tau, dtype=float)
+        R = np.asarray(R, dtype=float)
+        kappa = np.asarray(kappa, dtype=float)
+
+        R_min, R_max = self.spec['R_bounds']
+        if np.any((R < R_min) | (R > R_max)):
+            raise ValueError(f"Relación molar fuera de la tabla [{R_min:g}, {R_max:g}]")
+        if np.any((kappa < 0) | (kappa > self.spec['kappa_max'])):
+            raise ValueError(f"κ fuera de la tabla [0, {self.spec['kappa_max']:g}]")
+        if np.any((tau < 0) | (tau > self.spec['tau_max'])):
+            raise ValueError(f"τ fuera de la tabla [0, {self.spec['tau_max']:g}]")
+
+        return self._interpolate(_ratio_coordinate(R), _kappa_coordinate(kappa),
+                                 np.arcsinh(tau / TAU_SCALE))
+
+    # ------------------------------------------------------------------
+    # Persistencia
+    # ------------------------------------------------------------------
+
+    def save(self, filepath: str):
+        """Guarda la tabla en un archivo .npz comprimido."""
+        meta = {'format_version': TABLE_FORMAT_VERSION, 'spec': self.spec,
+                'error_bound': self.error_bound}
+        np.savez_compressed(filepath, X=self.X, u_grid=self.u_grid, v_grid=self.v_grid,
+                            s_grid=self.s_grid, meta=json.dumps(meta))
+
+    @classmethod
+    def load(cls, filepath: str) -> 'MasterCurveTable':
+        """
+        Carga una tabla guardada con save().
+
+        Raises:
+            ValueError: Si el archivo es de otra versión del formato
+        """
+        with np.load(filepath) as data:
+            meta = json.loads(str(data['meta']))
+            if meta['format_version'] != TABLE_FORMAT_VERSION:
+                raise ValueError("Tabla de curvas maestras de otra versión del formato")
+            spec = meta['spec']
+            spec['R_bounds'] = tuple(spec['R_bounds'])
+            return cls(spec, data['u_grid'], data['v_grid'], data['s_grid'], data['X'],
+                       meta['error_bound'])
+
+    @classmethod
+    def load_or_build(cls,
+                      filepath: Optional[str] = None,
+                      verbose: bool = False,
+                      **spec) -> 'MasterCurveTable':
+        """
+        Carga la tabla si existe (con el mismo dominio y tolerancia) o la genera.
+
+        Args:
+            filepath: Archivo .npz (si None, en ESTERIFICACION_CACHE_DIR si está
+                      definida; si no, la tabla no se guarda)
+            verbose: Si imprimir el progreso de la generación
+            **spec: Dominio y tolerancia (ver DEFAULT_SPEC)
+
+        Returns:
+            MasterCurveTable
+        """
+        spec = {**DEFAULT_SPEC, **spec}
+        if filepath is None and os.environ.get(CACHE_DIR_ENV):
+            digest = hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:12]
+            filepath = Path(os.environ[CACHE_DIR_ENV]).expanduser() / f'master_curve_{digest}.npz'
+
+        if filepath is not None and Path(filepath).exists():
+            try:
+                table = cls.load(filepath)
+                if table.spec == {**spec, 'R_bounds': tuple(spec['R_bounds'])}:
+                    return table
+            except (ValueError, KeyError, OSError):
+                pass
+
+        table = cls.build(verbose=verbose, **spec)
+        if filepath is not None:
+            Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+            table.save(filepath)
+        return table
+
+
+def get_master_curve_table() -> MasterCurveTable:
+    """Tabla por defecto del proceso (se carga o genera la primera vez)."""
+    global _default_table
+    if _default_table is None:
+        _default_table = MasterCurveTable.load_or_build()
+    return _default_table
@@ -8,13 +8,40 @@ Author: Sistema de Modelado de Esterificación
 Date: 2025-11-19
 """
 
+import os
+import signal
+import threading
 import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Dict, List, Tuple, Optional
 from lmfit import Parameters, Minimizer, report_fit
+from scipy.stats import qmc
 import warnings
+from functools import partial
 
-from .kinetic_model import KineticModel
+from .kinetic_model import KineticModel, ModelHandle
+from .properties import ThermophysicalProperties
+
+
+# Parametrizaciones de Arrhenius de setup_parameters()
+PARAMETERIZATIONS = ('arrhenius', 'reference')
+
+# Reducción relativa de chi² por debajo de la cual un arranque de
+# multistart_fit() se considera estancado
+STALL_RTOL = 1e-6
+
+
+def _split_parameter_name(name: str) -> Tuple[str, str, str]:
+    """
+    Descompone un nombre de parámetro de lmfit en (prefijo, tipo, dirección).
+
+    'step1_Ea_forward' → ('step1_', 'Ea', 'forward');
+    'ln_kref_reverse' → ('', 'ln_kref', 'reverse').
+    """
+    head, direction = name.rsplit('_', 1)
+    kind = 'ln_kref' if head.endswith('ln_kref') else head.rsplit('_', 1)[-1]
+    return head[:-len(kind)], kind, direction
 
 
 class ParameterFitter:
@@ -25,6 +52,9 @@ class ParameterFitter:
         model (KineticModel): Modelo cinético a ajustar
         experimental_data (List[Dict]): Lista de datasets experimentales
         weights (Dict): Pesos para diferentes componentes en la función objetivo
+        n_workers (int): Trabajadores para simular los experimentos en paralelo
+                         (1: en serie)
+        parallel_backend (str): 'thread' o 'process'
     """
 
     def __init__(self,
@@ -40,9 +70,43 @@ class ParameterFitter:
         self.model_type = model_type
         self.reversible = reversible
         self.model = None
+        self._sim_model = None  # Modelo de evaluación de residuales (sin estado)
         self.experimental_data = []
         self.weights = {'TG': 1.0, 'FAME': 1.0, 'DG': 0.5, 'MG': 0.5, 'GL': 0.5}
         self.fit_result = None
+        self.n_workers = 1
+        self.parallel_backend = 'thread'
+        self._executor = None
+        self._problem = None     # Problema compilado (ver _compile_problem)
+        self.parameterization = 'arrhenius'
+        self.T_ref = None        # °C, parametrización 'reference'
+
+    def set_parallel(self, n_workers: Optional[int] = None, backend: str = 'thread'):
+        """
+        Simula los experimentos de cada evaluación de residuales en paralelo.
+
+        Los residuales se concatenan siempre en el orden de experimental_data,
+        por lo que el resultado no depende del modo de ejecución.
+
+        Args:
+            n_workers: Trabajadores (None: os.cpu_count(); 1: en serie)
+            backend: 'thread' (ThreadPoolExecutor; el integrador libera el GIL
+                     solo en parte) o 'process' (ProcessPoolExecutor con el
+                     modelo descrito por ModelHandle)
+        """
+        if backend not in ('thread', 'process'):
+            raise ValueError("backend debe ser 'thread' o 'process'")
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.parallel_backend = backend
+
+    def _open_executor(self):
+        """Crea el pool de la configuración de set_parallel() (None si es en serie)."""
+        if self.n_workers <= 1 or len(self.experimental_data) <= 1:
+            return None
+        workers = min(self.n_workers, len(self.experimental_data))
+        if self.parallel_backend == 'process':
+            return ProcessPoolExecutor(max_workers=workers)
+        return ThreadPoolExecutor(max_workers=workers)
 
     def add_experiment(self,
                       data: pd.DataFrame,
@@ -65,6 +129,7 @@ class ParameterFitter:
             'id': experiment_id or f'exp_{len(self.experimental_data) + 1}'
         }
         self.experimental_data.append(experiment)
+        self._problem = None
 
     def set_weights(self, weights: Dict[str, float]):
         """
@@ -74,56 +139,243 @@ class ParameterFitter:
             weights: Diccionario {componente: peso}
         """
         self.weights.update(weights)
+        self._problem = None
+
+    def _compile_problem(self, params_lmfit: Parameters) -> Dict:
+        """
+        Congela los datos del ajuste en arreglos contiguos (una vez por fit()).
+
+        Por experimento guarda los tiempos, la matriz medida (n_componentes,
+        n_t), los pesos y las filas de las especies medidas en results.y, y
+        su tramo del vector de residuales. El orden de los residuales es el
+        de siempre: experimento, componente (orden de weights), tiempo.
+
+        Args:
+            params_lmfit: Parámetros de lmfit (estructura de los parámetros cinéticos)
+
+        Returns:
+            Dict con 'experiments', 'buffer', 'kinetic_params' y 'slots'
+        """
+        if self._sim_model is None:
+            self._sim_model = KineticModel(model_type=self.model_type,
+                                           reversible=self.reversible)
+        species = list(self._sim_model.species)
+
+        experiments = []
+        offset = 0
+        for exp in self.experimental_data:
+            data = exp['data']
+            components = [c for c in self.weights if f'C_{c}' in data.columns]
+            t_exp = np.ascontiguousarray(data['time'].to_numpy(dtype=float))
+            size = len(components) * len(t_exp)
+            experiments.append({
+                't': t_exp,
+                't_span': (t_exp[0], t_exp[-1]),
+                'C0': exp['C0'],
+                'temperature': exp['temperature'],
+                'rows': np.array([species.index(c) for c in components], dtype=int),
+                'C_exp': np.ascontiguousarray(
+                    data[[f'C_{c}' for c in components]].to_numpy(dtype=float).T),
+                'weights': np.array([self.weights[c] for c in components])[:, None],
+                'block': slice(offset, offset + size),
+            })
+            offset += size
+
+        # Diccionario de parámetros cinéticos reutilizado: cada evaluación solo
+        # reescribe los valores (nombre lmfit → (diccionario, clave))
+        kinetic_params = self._lmfit_to_kinetic_params(params_lmfit)
+        slots = []
+        for name in params_lmfit:
+            if self.model_type == '1-step':
+                target, key = kinetic_params, name
+            else:
+                step, key = name.split('_', 1)
+                target = kinetic_params[step]
+            if key in target:
+                slots.append((name, target, key))
+
+        # Jacobiano: ∂θ/∂p de los parámetros del modelo θ (sensibilidades de
+        # simulate_sensitivities()) respecto a los parámetros libres p de lmfit
+        # (orden de var_names), como términos (fila, columna, escala, factor):
+        # ∂θ[fila]/∂p[columna] = factor · valor(escala) (o factor si escala es None)
+        sensitivity_names = self._sim_model.kinetic_parameter_names()
+        free = [name for name, par in params_lmfit.items() if par.vary and not par.expr]
+        terms = []
+        for col, name in enumerate(free):
+            prefix, kind, direction = _split_parameter_name(name)
+            A_name = f'{prefix}A_{direction}'
+            if kind == 'ln_kref':
+                # A = k_ref·exp(c·Ea): ∂A/∂ln k_ref = A
+                terms.append((sensitivity_names.index(A_name), col, A_name, 1.0))
+                continue
+            terms.append((sensitivity_names.index(name), col, None, 1.0))
+            if kind == 'Ea' and params_lmfit[A_name].expr:
+                # ∂A/∂Ea = c·A con c = 1000/(R·T_ref)
+                terms.append((sensitivity_names.index(A_name), col, A_name,
+                              self._reference_scale()))
+
+        return {'experiments': experiments, 'buffer': np.empty(offset),
+                'kinetic_params': kinetic_params, 'slots': slots,
+                'derivative_terms': terms, 'n_sensitivities': len(sensitivity_names),
+                'jacobian': np.empty((offset, len(free))),
+                # Con Jacobiano exacto los residuales salen del mismo sistema
+                # aumentado: (valores de los parámetros, sensibilidades)
+                'use_sensitivities': False, 'sensitivities': None}
+
+    def _update_kinetic_params(self, params_lmfit: Parameters) -> Dict:
+        """Copia los valores de lmfit al diccionario de parámetros compilado."""
+        if self._problem is None:
+            self._problem = self._compile_problem(params_lmfit)
+        kinetic_params = self._problem['kinetic_params']
+        for name, target, key in self._problem['slots']:
+            target[key] = params_lmfit[name].value
+        return kinetic_params
 
     def _residuals(self, params_lmfit: Parameters) -> np.ndarray:
         """
         Calcula residuales entre modelo y datos experimentales.
 
+        Usa el problema compilado por _compile_problem() (sin pandas ni
+        reconstrucción del modelo en cada llamada).
+
         Args:
             params_lmfit: Objeto Parameters de lmfit
 
         Returns:
             Array de residuales ponderados
         """
-        # Extraer parámetros de lmfit
-        kinetic_params = self._lmfit_to_kinetic_params(params_lmfit)
+        # Actualizar en sitio los parámetros cinéticos
+        kinetic_params = self._update_kinetic_params(params_lmfit)
+        problem = self._problem
+        experiments = problem['experiments']
+
+        buffer = problem['buffer']
+        if problem['use_sensitivities']:
+            # Una integración aumentada por experimento; _residual_jacobian()
+            # reutiliza sus sensibilidades en los mismos parámetros
+            sensitivities = self._sensitivities(params_lmfit, kinetic_params)
+            for exp, sens in zip(experiments, sensitivities):
+                block = buffer[exp['block']].reshape(exp['C_exp'].shape)
+                np.subtract(exp['C_exp'], sens['C'].T[exp['rows']], out=block)
+                block *= exp['weights']
+            return buffer.copy()
+
+        # Simular cada experimento (en paralelo si hay un pool abierto en fit());
+        # sin caché de simulaciones: cada evaluación usa parámetros distintos
+        if self._executor is None:
+            simulations = [
+                self._sim_model.simulate(
+                    t_span=exp['t_span'],
+                    C0=exp['C0'],
+                    t_eval=exp['t'],
+                    temperature=exp['temperature'],
+                    params=kinetic_params,
+                    use_cache=False
+                )
+                for exp in experiments
+            ]
+        else:
+            if isinstance(self._executor, ProcessPoolExecutor):
+                simulate = partial(_simulate_experiment, self._sim_model.handle())
+            else:
+                simulate = partial(_simulate_experiment, self._sim_model)
+            # map conserva el orden de los experimentos
+            simulations = list(self._executor.map(
+                simulate,
+                [kinetic_params] * len(experiments),
+                [exp['temperature'] for exp in experiments],
+                [exp['C0'] for exp in experiments],
+                [exp['t'] for exp in experiments]))
+
+        # Residual ponderado de cada componente medido, escrito en su tramo
+        for exp, results in zip(experiments, simulations):
+            block = buffer[exp['block']].reshape(exp['C_exp'].shape)
+            np.subtract(exp['C_exp'], results.y[exp['rows']], out=block)
+            block *= exp['weights']
+
+        # Copia: los optimizadores conservan vectores de residuales anteriores
+        return buffer.copy()
+
+    def _residual_jacobian(self, params_lmfit: Parameters) -> np.ndarray:
+        """
+        Jacobiano exacto de los residuales a partir de sensibilidades directas.
 
-        # Crear modelo con parámetros actuales
-        self.model = KineticModel(
-            model_type=self.model_type,
-            reversible=self.reversible,
-            kinetic_params=kinetic_params,
-            temperature=65  # Se actualizará para cada experimento
-        )
+        Cada experimento integra una vez el sistema aumentado de
+        KineticModel.simulate_sensitivities() (en paralelo si hay un pool
+        abierto) y aporta el bloque de filas de sus residuales:
 
-        residuals = []
+            ∂r/∂θ = -w · ∂C/∂θ
 
-        # Iterar sobre cada experimento
-        for exp in self.experimental_data:
-            # Actualizar temperatura
-            self.model.set_temperature(exp['temperature'])
+        Los parámetros son comunes a todos los experimentos, así que cada
+        bloque es denso en columnas; los bloques se escriben en su tramo de
+        un arreglo preasignado.
 
-            # Simular
-            t_exp = exp['data']['time'].values
-            results = self.model.simulate(
-                t_span=(t_exp[0], t_exp[-1]),
-                C0=exp['C0'],
-                t_eval=t_exp
-            )
+        Args:
+            params_lmfit: Objeto Parameters de lmfit
 
-            # Calcular residuales para cada componente medido
-            for component in self.weights.keys():
-                col_name = f'C_{component}'
-                if col_name in exp['data'].columns:
-                    C_exp = exp['data'][col_name].values
-                    C_model = results[col_name]
+        Returns:
+            Jacobiano (n_residuales, n_parámetros variables), columnas en el
+            orden de var_names de lmfit
+        """
+        kinetic_params = self._update_kinetic_params(params_lmfit)
+        problem = self._problem
+        experiments = problem['experiments']
+        sensitivities = self._sensitivities(params_lmfit, kinetic_params)
+
+        jacobian = problem['jacobian']
+        dtheta_dp = np.zeros((problem['n_sensitivities'], jacobian.shape[1]))
+        for row, col, scale, factor in problem['derivative_terms']:
+            dtheta_dp[row, col] += factor * (params_lmfit[scale].value if scale else 1.0)
 
-                    # Residual ponderado
-                    weight = self.weights[component]
-                    res = weight * (C_exp - C_model)
-                    residuals.extend(res)
+        for exp, sens in zip(experiments, sensitivities):
+            # S: (n_t, n_especies, n_θ) → (componente, tiempo, parámetro libre)
+            S = (sens['S'][:, exp['rows']] @ dtheta_dp).transpose(1, 0, 2)
+            block = jacobian[exp['block']].reshape(S.shape)
+            np.multiply(S, -exp['weights'][:, :, None], out=block)
 
-        return np.array(residuals)
+        return jacobian.copy()
+
+    def _sensitivities(self, params_lmfit: Parameters, kinetic_params: Dict) -> List[Dict]:
+        """
+        Sensibilidades directas de todos los experimentos (en paralelo si hay
+        un pool abierto), reutilizadas si los parámetros no cambiaron desde
+        la última llamada.
+
+        Args:
+            params_lmfit: Objeto Parameters de lmfit
+            kinetic_params: Parámetros cinéticos ya actualizados
+
+        Returns:
+            Lista de dicts de KineticModel.simulate_sensitivities(), en el
+            orden de experimental_data
+        """
+        problem = self._problem
+        key = tuple(par.value for par in params_lmfit.values())
+        if problem['sensitivities'] is not None and problem['sensitivities'][0] == key:
+            return problem['sensitivities'][1]
+
+        experiments = problem['experiments']
+        if self._executor is None:
+            sensitivities = [
+                self._sim_model.simulate_sensitivities(
+                    exp['t_span'], exp['C0'], t_eval=exp['t'],
+                    temperature=exp['temperature'], params=kinetic_params)
+                for exp in experiments
+            ]
+        else:
+            if isinstance(self._executor, ProcessPoolExecutor):
+                sensitivity = partial(_experiment_sensitivities, self._sim_model.handle())
+            else:
+                sensitivity = partial(_experiment_sensitivities, self._sim_model)
+            sensitivities = list(self._executor.map(
+                sensitivity,
+                [kinetic_params] * len(experiments),
+                [exp['temperature'] for exp in experiments],
+                [exp['C0'] for exp in experiments],
+                [exp['t'] for exp in experiments]))
+
+        problem['sensitivities'] = (key, sensitivities)
+        return sensitivities
 
     def _lmfit_to_kinetic_params(self, params_lmfit: Parameters) -> Dict:
         """
@@ -155,17 +407,29 @@ class ParameterFitter:
 
     def setup_parameters(self,
                         initial_guess: Optional[Dict] = None,
-                        bounds: Optional[Dict] = None) -> Parameters:
+                        bounds: Optional[Dict] = None,
+                        parameterization: str = 'arrhenius',
+                        T_ref: Optional[float] = None) -> Parameters:
         """
         Configura parámetros iniciales y límites para el ajuste.
 
+        Con parameterization='reference' se ajustan ln k(T_ref) y Ea en lugar
+        de A y Ea (ver _reference_parameters()); los valores iniciales y los
+        límites se dan igualmente en A y Ea.
+
         Args:
             initial_guess: Valores iniciales de parámetros
             bounds: Límites (min, max) para cada parámetro
+            parameterization: 'arrhenius' (A, Ea) o 'reference' (ln k_ref, Ea)
+            T_ref: Temperatura de referencia (°C) de 'reference' (si None, la
+                   media de las temperaturas experimentales)
 
         Returns:
             Objeto Parameters de lmfit configurado
         """
+        if parameterization not in PARAMETERIZATIONS:
+            raise ValueError(f"Parametrización '{parameterization}' no reconocida "
+                             f"(opciones: {PARAMETERIZATIONS})")
         params = Parameters()
 
         # Límites por defecto (basados en literatura)
@@ -246,12 +510,65 @@ class ParameterFitter:
                               min=default_bounds['A'][0],
                               max=default_bounds['A'][1])
 
+        self.parameterization = parameterization
+        if parameterization == 'reference':
+            if T_ref is None:
+                if not self.experimental_data:
+                    raise ValueError("Indique T_ref o agregue experimentos primero")
+                T_ref = float(np.mean([exp['temperature'] for exp in self.experimental_data]))
+            self.T_ref = T_ref
+            params = self._reference_parameters(params)
+        else:
+            self.T_ref = None
+
         return params
 
+    def _reference_scale(self) -> float:
+        """c = 1000/(R·T_ref) (mol/kJ) de la parametrización 'reference'."""
+        return 1000.0 / (ThermophysicalProperties.R * (self.T_ref + 273.15))
+
+    def _reference_parameters(self, params: Parameters) -> Parameters:
+        """
+        Reparametriza Arrhenius alrededor de T_ref.
+
+            k(T) = k_ref·exp(-Ea·1000/R·(1/T - 1/T_ref)),  A = k_ref·exp(c·Ea)
+
+        con c = 1000/(R·T_ref). A y Ea están fuertemente correlacionados y A
+        abarca muchos órdenes de magnitud; ln k_ref y Ea son casi ortogonales
+        cuando T_ref está centrada en los datos y tienen escalas comparables.
+        A se conserva como parámetro derivado (expr de lmfit), de modo que los
+        resultados y sus errores estándar se siguen reportando en A y Ea.
+
+        Args:
+            params: Parámetros en (A, Ea)
+
+        Returns:
+            Parámetros con ln_kref_<dirección> libres y A derivados
+        """
+        c = self._reference_scale()
+        reference = Parameters()
+        expressions = []
+        for name, par in params.items():
+            prefix, kind, direction = _split_parameter_name(name)
+            if kind != 'A':
+                reference.add(name, value=par.value, min=par.min, max=par.max)
+                continue
+            Ea = params[f'{prefix}Ea_{direction}']
+            reference.add(f'{prefix}ln_kref_{direction}',
+                          value=np.log(par.value) - c * Ea.value,
+                          min=np.log(par.min) - c * Ea.max,
+                          max=np.log(par.max) - c * Ea.min)
+            expressions.append((name, f'exp({prefix}ln_kref_{direction} '
+                                      f'+ {c!r}*{prefix}Ea_{direction})'))
+        for name, expr in expressions:
+            reference.add(name, expr=expr)
+        return reference
+
     def fit(self,
             method: str = 'leastsq',
             max_nfev: int = 1000,
             verbose: bool = True,
+            use_jacobian: bool = True,
             **kwargs) -> Dict:
         """
         Ejecuta el ajuste de parámetros.
@@ -260,6 +577,11 @@ class ParameterFitter:
             method: Método de optimización ('leastsq', 'least_squares', 'differential_evolution')
             max_nfev: Número máximo de evaluaciones de función
             verbose: Si imprimir progreso
+            use_jacobian: Si pasar a 'leastsq'/'least_squares' el Jacobiano exacto
+                          de los residuales (_residual_jacobian) en lugar de
+                          aproximarlo por diferencias finitas. Los residuales
+                          salen entonces de la misma integración aumentada de
+                          sensibilidades, que el Jacobiano reutiliza
             **kwargs: Argumentos adicionales para setup_parameters
 
         Returns:
@@ -271,21 +593,52 @@ class ParameterFitter:
         # Configurar parámetros
         params = self.setup_parameters(**kwargs)
 
-        # Crear minimizador
-        minimizer = Minimizer(self._residuals, params)
-
         # Ajustar
         if verbose:
             print(f"Iniciando ajuste de parámetros ({self.model_type}, reversible={self.reversible})...")
             print(f"Número de experimentos: {len(self.experimental_data)}")
             print(f"Método: {method}")
 
-        self.fit_result = minimizer.minimize(method=method, max_nfev=max_nfev)
+        self.fit_result = self._minimize(params, method, max_nfev, use_jacobian)
+        return self._fit_results(verbose)
 
+    def _minimize(self,
+                  params: Parameters,
+                  method: str,
+                  max_nfev: int,
+                  use_jacobian: bool):
+        """
+        Ajuste local desde params (compila el problema y abre el pool).
+
+        Returns:
+            MinimizerResult de lmfit
+        """
+        self._problem = self._compile_problem(params)
+        minimizer = Minimizer(self._residuals, params)
+
+        self._executor = self._open_executor()
+        try:
+            minimize_kws = {}
+            if use_jacobian and method in ('leastsq', 'least_squares'):
+                minimize_kws['Dfun'] = self._residual_jacobian
+                self._problem['use_sensitivities'] = True
+            return minimizer.minimize(method=method, max_nfev=max_nfev, **minimize_kws)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def _fit_results(self, verbose: bool) -> Dict:
+        """Modelo ajustado y diccionario de resultados a partir de self.fit_result."""
         if verbose:
             print("\n=== Resultados del Ajuste ===")
             report_fit(self.fit_result)
 
+        # Modelo con los parámetros ajustados
+        fitted_params = self._lmfit_to_kinetic_params(self.fit_result.params)
+        self.model = KineticModel(model_type=self.model_type, reversible=self.reversible,
+                                  kinetic_params=fitted_params)
+
         # Organizar resultados
         results = {
             'success': self.fit_result.success,
@@ -295,8 +648,10 @@ class ParameterFitter:
             'redchi': self.fit_result.redchi,
             'aic': self.fit_result.aic,
             'bic': self.fit_result.bic,
-            'params': self._lmfit_to_kinetic_params(self.fit_result.params),
+            'params': fitted_params,
             'params_lmfit': self.fit_result.params,
+            'parameterization': self.parameterization,
+            'T_ref': self.T_ref,
             'covariance': self.fit_result.covar,
             'fitted_model': self.model,
         }
@@ -306,6 +661,231 @@ class ParameterFitter:
 
         return results
 
+    def multistart_fit(self,
+                       n_starts: int = 16,
+                       design: str = 'sobol',
+                       keep_fraction: float = 0.25,
+                       screening_nfev: int = 50,
+                       method: str = 'leastsq',
+                       max_nfev: int = 1000,
+                       use_jacobian: bool = True,
+                       n_workers: Optional[int] = None,
+                       distinct_tol: float = 1e-2,
+                       kref_decades: float = 2.0,
+                       start_timeout: Optional[float] = 120.0,
+                       seed: Optional[int] = None,
+                       verbose: bool = True,
+                       **kwargs) -> Dict:
+        """
+        Ajuste global por arranques múltiples en paralelo.
+
+        1. Genera n_starts puntos de arranque: el valor inicial de
+           setup_parameters (arranque 0) y un diseño de Sobol o LHS en las
+           coordenadas centradas (ln k_ref, Ea) de _reference_parameters(),
+           con Ea dentro de sus límites y ln k_ref a ±kref_decades décadas
+           del valor inicial.
+        2. Tamizado: ajusta localmente cada arranque con un presupuesto de
+           screening_nfev evaluaciones en un ProcessPoolExecutor.
+        3. Poda: solo continúan (con max_nfev) la fracción keep_fraction de
+           arranques con menor chi² parcial, los estancados (chi² igual al
+           inicial) al final; los que ya convergieron en el tamizado no se
+           repiten.
+        4. Agrupa los puntos finales en óptimos locales distintos y repule el
+           mejor con un ajuste local en este proceso (self.fit_result y
+           self.model quedan como tras fit()).
+
+        Args:
+            n_starts: Número de arranques, incluido el valor inicial
+            design: 'sobol' o 'lhs'
+            keep_fraction: Fracción de arranques que continúan tras el tamizado
+            screening_nfev: Evaluaciones de residuales del tamizado
+            method: Método de optimización local ('leastsq' o 'least_squares')
+            max_nfev: Evaluaciones máximas de cada ajuste local completo
+            use_jacobian: Si usar el Jacobiano exacto de los residuales
+            n_workers: Procesos (None: os.cpu_count(); 1: en el proceso actual)
+            distinct_tol: Distancia máxima (coordenadas normalizadas a los
+                          límites, A en escala logarítmica) entre dos puntos
+                          finales del mismo óptimo
+            kref_decades: Semiamplitud (décadas) del diseño en k(T_ref)
+                          alrededor del valor inicial
+            start_timeout: Tiempo máximo (s) de cada ajuste local; el arranque
+                           que lo excede se descarta (chi² = inf). Con
+                           constantes extremas la integración puede no
+                           terminar en un tiempo útil. None: sin límite
+                           (solo en sistemas con signal.setitimer)
+            seed: Semilla del diseño
+            verbose: Si imprimir progreso y el reporte del mejor ajuste
+            **kwargs: Argumentos adicionales para setup_parameters
+
+        Returns:
+            Diccionario de fit() del mejor óptimo, más 'optima' (óptimos
+            distintos ordenados por chi²: 'chisqr', 'params', 'values',
+            'n_starts', 'success'), 'starts' (por arranque: 'values',
+            'partial_chisqr', 'stalled', 'pruned', 'chisqr', 'nfev'), 'n_pruned' y
+            'total_nfev' (evaluaciones de todos los ajustes locales)
+        """
+        if len(self.experimental_data) == 0:
+            raise ValueError("No hay datos experimentales. Use add_experiment() primero.")
+        if design not in ('sobol', 'lhs'):
+            raise ValueError("design debe ser 'sobol' o 'lhs'")
+
+        # Arranques en las coordenadas centradas (ln k_ref, Ea) de
+        # _reference_parameters, sea cual sea la parametrización del ajuste: Ea
+        # recorre sus límites a k(T_ref) fijo, por lo que los arranques no caen
+        # en mesetas de conversión 0 % o 100 %. ln k_ref recorre ±kref_decades
+        # décadas alrededor del valor inicial
+        centered = self.setup_parameters(**{**kwargs, 'parameterization': 'reference'})
+        c = self._reference_scale()
+        natural = self.setup_parameters(**{**kwargs, 'parameterization': 'arrhenius'})
+        base = self.setup_parameters(**kwargs)
+        setup = dict(kwargs)
+        if self.T_ref is not None:
+            setup['T_ref'] = self.T_ref
+        spec = {'model_type': self.model_type, 'reversible': self.reversible,
+                'experimental_data': self.experimental_data, 'weights': self.weights,
+                'setup': setup, 'method': method, 'use_jacobian': use_jacobian,
+                'timeout': start_timeout}
+
+        design_names = [name for name, par in centered.items() if par.vary and not par.expr]
+        low = np.empty(len(design_names))
+        high = np.empty(len(design_names))
+        for j, name in enumerate(design_names):
+            par = centered[name]
+            if _split_parameter_name(name)[1] == 'ln_kref':
+                span = kref_decades * np.log(10.0)
+                low[j], high[j] = max(par.value - span, par.min), min(par.value + span, par.max)
+            else:
+                low[j], high[j] = par.min, par.max
+        if not np.all(np.isfinite(low) & np.isfinite(high)):
+            raise ValueError("Los arranques múltiples requieren límites finitos en todos los parámetros")
+
+        # El valor inicial es siempre el arranque 0; el diseño aporta el resto
+        if design == 'sobol':
+            unit = qmc.Sobol(d=len(design_names), scramble=True,
+                             seed=seed).random(1 << int(np.ceil(np.log2(max(n_starts - 1, 1)))))
+        else:
+            unit = qmc.LatinHypercube(d=len(design_names), seed=seed).random(max(n_starts - 1, 1))
+        points = [{name: centered[name].value for name in design_names}]
+        points += [dict(zip(design_names, point))
+                   for point in low + unit[:n_starts - 1] * (high - low)]
+
+        free = [name for name, par in base.items() if par.vary and not par.expr]
+        starts = []
+        for point in points:
+            start = {}
+            for name in free:
+                prefix, kind, direction = _split_parameter_name(name)
+                if kind == 'A':
+                    A = np.exp(point[f'{prefix}ln_kref_{direction}']
+                               + c * point[f'{prefix}Ea_{direction}'])
+                    start[name] = float(np.clip(A, base[name].min, base[name].max))
+                else:
+                    start[name] = point[name]
+            starts.append(start)
+
+        # Coordenadas normalizadas a los límites (A en escala logarítmica)
+        # para agrupar puntos finales en óptimos distintos
+        names = [name for name, par in natural.items() if par.vary]
+        is_log = np.array([_split_parameter_name(name)[1] == 'A' for name in names])
+        lower = np.array([natural[name].min for name in names], dtype=float)
+        upper = np.array([natural[name].max for name in names], dtype=float)
+        lower[is_log], upper[is_log] = np.log10(lower[is_log]), np.log10(upper[is_log])
+
+        def normalized(kinetic_params):
+            """Coordenadas del diseño (hipercubo unitario) de unos parámetros cinéticos."""
+            x = np.empty(len(names))
+            for j, name in enumerate(names):
+                if self.model_type == '1-step':
+                    x[j] = kinetic_params[name]
+                else:
+                    step, key = name.split('_', 1)
+                    x[j] = kinetic_params[step][key]
+            x[is_log] = np.log10(np.maximum(x[is_log], 1e-300))
+            return (x - lower) / (upper - lower)
+
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+
+        def run(tasks, budget):
+            if n_workers == 1 or len(tasks) <= 1:
+                return [_multistart_local_fit(spec, values, budget) for values in tasks]
+            with ProcessPoolExecutor(max_workers=min(n_workers, len(tasks))) as executor:
+                return list(executor.map(partial(_multistart_local_fit, spec),
+                                         tasks, [budget] * len(tasks)))
+
+        # Tamizado y poda por chi² parcial
+        if verbose:
+            print(f"Arranques múltiples: {n_starts} ({design}), tamizado con "
+                  f"{screening_nfev} evaluaciones...")
+        screening = run(starts, screening_nfev)
+        n_keep = max(1, int(np.ceil(keep_fraction * n_starts)))
+        # Los arranques estancados (chi² sin cambio) quedan detrás de los que
+        # avanzaron, aunque empaten en chi² parcial
+        ranking = sorted(range(n_starts),
+                         key=lambda i: (screening[i]['stalled'], screening[i]['chisqr']))
+        kept = set(ranking[:n_keep])
+
+        # Continuación de los arranques conservados que no convergieron (un
+        # arranque que se detuvo sin reducir chi² no cuenta como convergido)
+        pending = [i for i in sorted(kept)
+                   if not screening[i]['success'] or screening[i]['stalled']]
+        if verbose:
+            print(f"Continúan {len(kept)} arranques ({len(pending)} sin converger)...")
+        finals = dict(zip(pending, run([screening[i]['values'] for i in pending], max_nfev)))
+
+        history = []
+        for i, (values, result) in enumerate(zip(starts, screening)):
+            final = finals.get(i, result) if i in kept else None
+            history.append({
+                'values': values,
+                'partial_chisqr': result['chisqr'],
+                'stalled': result['stalled'],
+                'pruned': i not in kept,
+                'chisqr': final['chisqr'] if final else np.nan,
+                'nfev': result['nfev'] + (finals[i]['nfev'] if i in finals else 0),
+                'final': final,
+            })
+
+        # Agrupar puntos finales en óptimos distintos (del mejor al peor)
+        optima = []
+        for entry in sorted((h for h in history
+                             if h['final'] is not None and np.isfinite(h['chisqr'])),
+                            key=lambda h: h['chisqr']):
+            final = entry['final']
+            x = normalized(final['params'])
+            for optimum in optima:
+                if np.max(np.abs(x - optimum['_x'])) <= distinct_tol:
+                    optimum['n_starts'] += 1
+                    break
+            else:
+                optima.append({'chisqr': final['chisqr'], 'values': final['values'],
+                               'params': final['params'], 'n_starts': 1,
+                               'success': final['success'], '_x': x})
+        for optimum in optima:
+            del optimum['_x']
+        for entry in history:
+            del entry['final']
+        if not optima:
+            raise RuntimeError("Ningún arranque pudo ajustarse")
+
+        # Repulir el mejor óptimo (resultado completo de lmfit: covarianza, etc.)
+        params = base.copy()
+        for name, value in optima[0]['values'].items():
+            params[name].value = value
+        if verbose:
+            print(f"{len(optima)} óptimos distintos; repuliendo el mejor "
+                  f"(chi² = {optima[0]['chisqr']:.6g})...")
+        self.fit_result = self._minimize(params, method, max_nfev, use_jacobian)
+        results = self._fit_results(verbose)
+
+        results.update({
+            'optima': optima,
+            'starts': history,
+            'n_pruned': n_starts - len(kept),
+            'total_nfev': sum(entry['nfev'] for entry in history) + self.fit_result.nfev,
+        })
+        return results
+
     def _calculate_r_squared(self) -> float:
         """Calcula coeficiente de determinación R²."""
         if self.fit_result is None:
@@ -373,6 +953,109 @@ class ParameterFitter:
 
         return intervals
 
+    def propagate_uncertainty(self,
+                              C0: Dict[str, float],
+                              T_celsius: float,
+                              t_eval: np.ndarray,
+                              n_samples: int = 2000,
+                              confidence: float = 0.95,
+                              chunk_size: int = 250,
+                              n_workers: Optional[int] = None,
+                              seed: Optional[int] = None,
+                              return_samples: bool = False) -> Dict:
+        """
+        Propaga la incertidumbre de los parámetros ajustados por Monte Carlo.
+
+        Extrae n_samples vectores de parámetros de la normal multivariada
+        (valores ajustados, matriz de covarianza del ajuste, con los factores
+        A en escala logarítmica; ln k_ref ya lo está), descarta los no
+        físicos (Ea ≤ 0) y los simula por bloques de chunk_size con
+        KineticModel.simulate_batch (una integración por bloque) repartidos en
+        un ProcessPoolExecutor. Las bandas son percentiles puntuales.
+
+        Args:
+            C0: Condiciones iniciales
+            T_celsius: Temperatura (°C)
+            t_eval: Tiempos de predicción (min)
+            n_samples: Número de muestras de parámetros
+            confidence: Nivel de la banda (default 95%)
+            chunk_size: Muestras por integración (acota memoria y tamaño del sistema)
+            n_workers: Procesos (None: os.cpu_count(); 1: en el proceso actual)
+            seed: Semilla del muestreo
+            return_samples: Si incluir las curvas de todas las muestras
+
+        Returns:
+            Dict con 't' y, para 'conversion_%' y 'FAME_yield_%', un dict con
+            'mean', 'median', 'lower' y 'upper' (forma (n_t,)); además
+            'n_samples' (válidas), 'n_rejected' (Ea ≤ 0) y 'n_failed'
+            (muestras de bloques cuya integración falló)
+        """
+        if self.fit_result is None or self.fit_result.covar is None:
+            raise ValueError("Debe ejecutar fit() con covarianza disponible primero")
+
+        names = self.fit_result.var_names
+        mean = np.array([self.fit_result.params[name].value for name in names])
+
+        # Factores preexponenciales en escala logarítmica (covarianza linealizada
+        # cov(ln A) = cov(A)/A²): muestras lognormales, siempre positivas
+        is_A = np.array([_split_parameter_name(name)[1] == 'A' for name in names])
+        scale = np.where(is_A, 1.0 / mean, 1.0)
+        center = mean.copy()
+        center[is_A] = np.log(mean[is_A])
+        cov = self.fit_result.covar * np.outer(scale, scale)
+
+        rng = np.random.default_rng(seed)
+        samples = rng.multivariate_normal(center, cov, size=n_samples, method='eigh',
+                                          check_valid='ignore')
+        samples[:, is_A] = np.exp(samples[:, is_A])
+        is_Ea = np.array([_split_parameter_name(name)[1] == 'Ea' for name in names])
+        physical = np.all(samples[:, is_Ea] > 0, axis=1)
+        samples = samples[physical]
+
+        # Vector de muestra → parámetros cinéticos (parámetros fijos: valor ajustado)
+        params = self.fit_result.params.copy()
+        params_list = []
+        for values in samples:
+            for name, value in zip(names, values):
+                params[name].value = value
+            params_list.append(self._lmfit_to_kinetic_params(params))
+
+        t_eval = np.asarray(t_eval, dtype=float)
+        handle = ModelHandle(self.model_type, self.reversible)
+        chunks = [params_list[i:i + chunk_size] for i in range(0, len(params_list), chunk_size)]
+        tasks = [(handle, chunk, T_celsius, C0, t_eval) for chunk in chunks]
+
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        if n_workers == 1 or len(tasks) <= 1:
+            outputs = [_simulate_parameter_chunk(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=min(n_workers, len(tasks))) as executor:
+                outputs = list(executor.map(_simulate_parameter_chunk, *zip(*tasks)))
+
+        valid = [output for output in outputs if output['success']]
+        n_failed = sum(len(chunk) for chunk, output in zip(chunks, outputs)
+                       if not output['success'])
+        if not valid:
+            raise RuntimeError("Ninguna muestra de parámetros pudo simularse")
+
+        alpha = (1 - confidence) / 2 * 100
+        results = {'t': t_eval, 'confidence': confidence,
+                   'n_samples': sum(len(output['conversion_%']) for output in valid),
+                   'n_rejected': int(np.sum(~physical)), 'n_failed': n_failed}
+        for key in ['conversion_%', 'FAME_yield_%']:
+            curves = np.concatenate([output[key] for output in valid])
+            results[key] = {
+                'mean': curves.mean(axis=0),
+                'median': np.median(curves, axis=0),
+                'lower': np.percentile(curves, alpha, axis=0),
+                'upper': np.percentile(curves, 100 - alpha, axis=0),
+            }
+            if return_samples:
+                results[key]['samples'] = curves
+
+        return results
+
     def plot_parity(self, ax=None, components: Optional[List[str]] = None):
         """
         Genera parity plot (modelo vs experimental).
@@ -402,12 +1085,12 @@ class ParameterFitter:
         color_map = {'TG': 'blue', 'FAME': 'green', 'DG': 'orange', 'MG': 'red', 'GL': 'purple'}
 
         for exp in self.experimental_data:
-            self.model.set_temperature(exp['temperature'])
             t_exp = exp['data']['time'].values
             results = self.model.simulate(
                 t_span=(t_exp[0], t_exp[-1]),
                 C0=exp['C0'],
-                t_eval=t_exp
+                t_eval=t_exp,
+                temperature=exp['temperature']
             )
 
             for component in components:
@@ -483,6 +1166,134 @@ class ParameterFitter:
             raise NotImplementedError(f"Formato '{format}' no implementado aún")
 
 
+def _simulate_experiment(model,
+                         params: Dict,
+                         T_celsius: float,
+                         C0: Dict[str, float],
+                         t_exp: np.ndarray):
+    """
+    Simula un experimento a sus tiempos de muestreo (hilo o proceso de trabajo).
+
+    Args:
+        model: KineticModel (hilos) o ModelHandle (procesos)
+        params: Parámetros cinéticos
+        T_celsius: Temperatura del experimento (°C)
+        C0: Condiciones iniciales
+        t_exp: Tiempos de muestreo (min)
+
+    Returns:
+        SimulationResult
+    """
+    if isinstance(model, ModelHandle):
+        model = model.build()
+    return model.simulate(t_span=(t_exp[0], t_exp[-1]), C0=C0, t_eval=t_exp,
+                          temperature=T_celsius, params=params, use_cache=False)
+
+
+def _experiment_sensitivities(model,
+                              params: Dict,
+                              T_celsius: float,
+                              C0: Dict[str, float],
+                              t_exp: np.ndarray) -> Dict:
+    """
+    Sensibilidades directas de un experimento (hilo o proceso de trabajo).
+
+    Args:
+        model: KineticModel (hilos) o ModelHandle (procesos)
+        params: Parámetros cinéticos
+        T_celsius: Temperatura del experimento (°C)
+        C0: Condiciones iniciales
+        t_exp: Tiempos de muestreo (min)
+
+    Returns:
+        Dict de KineticModel.simulate_sensitivities()
+    """
+    if isinstance(model, ModelHandle):
+        model = model.build()
+    return model.simulate_sensitivities((t_exp[0], t_exp[-1]), C0, t_eval=t_exp,
+                                        temperature=T_celsius, params=params)
+
+
+def _multistart_local_fit(spec: Dict, values: Dict[str, float], max_nfev: int) -> Dict:
+    """
+    Ajuste local de un arranque (proceso de trabajo de multistart_fit).
+
+    Args:
+        spec: Problema: 'model_type', 'reversible', 'experimental_data',
+              'weights', 'setup' (argumentos de setup_parameters), 'method',
+              'use_jacobian' y 'timeout' (s o None)
+        values: Valores iniciales de los parámetros libres de lmfit
+        max_nfev: Presupuesto de evaluaciones de residuales
+
+    Returns:
+        Dict con 'values' (parámetros libres finales), 'params' (parámetros
+        cinéticos), 'chisqr', 'nfev', 'success' (lmfit terminó dentro del
+        presupuesto) y 'stalled' (chi² final igual al inicial)
+    """
+    fitter = ParameterFitter(spec['model_type'], spec['reversible'])
+    fitter.experimental_data = spec['experimental_data']
+    fitter.weights = spec['weights']
+    params = fitter.setup_parameters(**spec['setup'])
+    for name, value in values.items():
+        params[name].value = value
+
+    # Límite de tiempo por SIGALRM: solo en el hilo principal (procesos de
+    # trabajo o ejecución en serie) y donde exista setitimer (no en Windows)
+    timed = (spec['timeout'] is not None and hasattr(signal, 'setitimer')
+             and threading.current_thread() is threading.main_thread())
+    if timed:
+        def expire(signum, frame):
+            raise TimeoutError("Ajuste local excedió start_timeout")
+        previous = signal.signal(signal.SIGALRM, expire)
+        signal.setitimer(signal.ITIMER_REAL, spec['timeout'])
+
+    try:
+        chisqr0 = float(np.sum(fitter._residuals(params) ** 2))
+        result = fitter._minimize(params, spec['method'], max_nfev, spec['use_jacobian'])
+    except (ValueError, ArithmeticError, np.linalg.LinAlgError, TimeoutError):
+        # Arranque no integrable o demasiado lento (p. ej. constantes extremas): se descarta
+        return {'values': dict(values), 'params': None, 'chisqr': np.inf,
+                'nfev': 0, 'success': False, 'stalled': True}
+    finally:
+        if timed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+    return {
+        'values': {name: result.params[name].value for name in values},
+        'params': fitter._lmfit_to_kinetic_params(result.params),
+        'chisqr': float(result.chisqr),
+        'nfev': int(result.nfev),
+        'success': bool(result.success),
+        # Detenido sin reducir chi² (p. ej. en una meseta de conversión)
+        'stalled': bool(result.chisqr >= chisqr0 * (1.0 - STALL_RTOL)),
+    }
+
+
+def _simulate_parameter_chunk(handle: ModelHandle,
+                              params_list: List[Dict],
+                              T_celsius: float,
+                              C0: Dict[str, float],
+                              t_eval: np.ndarray) -> Dict:
+    """
+    Simula un bloque de muestras de parámetros en una integración (proceso de trabajo).
+
+    Returns:
+        Dict con 'success' y las curvas 'conversion_%' y 'FAME_yield_%' de
+        forma (n_muestras, n_t)
+    """
+    try:
+        results = handle.build().simulate_batch((t_eval[0], t_eval[-1]), C0,
+                                                temperatures=T_celsius,
+                                                params_list=params_list, t_eval=t_eval)
+    except (ValueError, ArithmeticError, np.linalg.LinAlgError):
+        return {'success': False}
+    if not results['success']:
+        return {'success': False}
+    return {'success': True, 'conversion_%': results['conversion_%'],
+            'FAME_yield_%': results['FAME_yield_%']}
+
+
 if __name__ == "__main__":
     # Ejemplo de uso con datos sintéticos
     print("=== Parameter Fitting - Ejemplo de Uso ===\n")
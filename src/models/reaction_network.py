@@ -0,0 +1,633 @@
+"""
+Módulo de Redes de Reacción
+
+Especificación declarativa de redes de reacción (especies, reacciones,
+órdenes y parámetros de Arrhenius) a partir de la cual se generan, en forma
+vectorizada, las velocidades de reacción, el lado derecho dC/dt = S·r y su
+Jacobiano analítico.
+
+Los modelos de transesterificación de 1 y 3 pasos se definen aquí como
+redes; otras redes (etanólisis, esterificación de ácidos grasos libres,
+saponificación, ...) se describen con la misma especificación y se simulan
+con KineticModel(model_type='custom', network=...).
+
+Author: Sistema de Modelado de Esterificación
+Date: 2025-11-19
+"""
+
+import numpy as np
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+
+from .properties import arrhenius
+
+
+# Parámetros de Arrhenius de cada reacción (mismos nombres que KineticParameters)
+ARRHENIUS_KEYS = ('Ea_forward', 'A_forward', 'Ea_reverse', 'A_reverse')
+
+
+@dataclass
+class Reaction:
+    """
+    Reacción de la red con cinética de ley de potencias.
+
+    r = k_f·Π C_i^a_i - k_r·Π C_j^b_j
+
+    Si no se indican órdenes se usa acción de masas (órdenes iguales a los
+    coeficientes estequiométricos de reactivos y productos). Con órdenes
+    menores que 1 la derivada ∂r/∂C_i (y, si el orden es negativo, el propio
+    factor C_i^a_i) se toma nula donde C_i ≤ 0.
+    """
+    name: str
+    reactants: Dict[str, float]   # {especie: coeficiente estequiométrico}
+    products: Dict[str, float]
+    Ea_forward: float = 0.0       # Energía de activación directa (kJ/mol)
+    A_forward: float = 0.0        # Factor pre-exponencial directo
+    Ea_reverse: float = 0.0       # Energía de activación inversa (kJ/mol)
+    A_reverse: float = 0.0        # Factor pre-exponencial inverso
+    reversible: bool = True
+    orders_forward: Optional[Dict[str, float]] = None   # None: acción de masas
+    orders_reverse: Optional[Dict[str, float]] = None
+
+    @property
+    def equation(self) -> str:
+        """Ecuación química, p. ej. 'TG + 3 MeOH ⇌ 3 FAME + GL'."""
+        def side(terms):
+            return ' + '.join(species if nu == 1 else f'{nu:g} {species}'
+                              for species, nu in terms.items())
+        arrow = '⇌' if self.reversible else '→'
+        return f'{side(self.reactants)} {arrow} {side(self.products)}'
+
+    def arrhenius_parameters(self) -> Dict[str, float]:
+        """Parámetros de Arrhenius {'Ea_forward': ..., 'A_forward': ..., ...}."""
+        return {key: getattr(self, key) for key in ARRHENIUS_KEYS}
+
+
+class ReactionNetwork:
+    """
+    Red de reacciones compilada.
+
+    A partir de la especificación se genera código Python específico de la
+    red (velocidades, lado derecho S·r y Jacobiano analítico con los términos
+    no nulos desarrollados), de modo que una red declarada cuesta lo mismo
+    por evaluación que una ley de velocidad escrita a mano.
+
+    Las funciones generadas usan el primer eje para especies/reacciones:
+    C de forma (n_especies,) o (n_especies, ...) y k de forma
+    (n_reacciones, ...), con broadcasting en los ejes restantes (la forma
+    que usa solve_ivp con vectorized=True).
+
+    Attributes:
+        species (List[str]): Especies (orden del vector de estado)
+        reactions (List[Reaction]): Reacciones (orden del vector de velocidades)
+        S (np.ndarray): Matriz estequiométrica (n_especies × n_reacciones)
+        orders_forward (np.ndarray): Órdenes directos (n_reacciones × n_especies)
+        orders_reverse (np.ndarray): Órdenes inversos (n_reacciones × n_especies)
+        reversible (np.ndarray): Máscara de reacciones reversibles (n_reacciones,)
+        source (str): Código generado
+    """
+
+    def __init__(self, species: List[str], reactions: List[Reaction], name: str = ''):
+        """
+        Compila la red.
+
+        Args:
+            species: Nombres de especies
+            reactions: Reacciones de la red
+            name: Nombre descriptivo
+        """
+        self.name = name
+        self.species = list(species)
+        self.reactions = list(reactions)
+
+        if len(set(self.species)) != len(self.species):
+            raise ValueError("Especies duplicadas en la red")
+        names = [reaction.name for reaction in self.reactions]
+        if len(set(names)) != len(names):
+            raise ValueError("Nombres de reacción duplicados en la red")
+
+        index = {species: i for i, species in enumerate(self.species)}
+        n_species, n_reactions = len(self.species), len(self.reactions)
+
+        self.S = np.zeros((n_species, n_reactions))
+        self.orders_forward = np.zeros((n_reactions, n_species))
+        self.orders_reverse = np.zeros((n_reactions, n_species))
+
+        for j, reaction in enumerate(self.reactions):
+            terms = [reaction.reactants, reaction.products,
+                     reaction.orders_forward or {}, reaction.orders_reverse or {}]
+            for species in set().union(*terms):
+                if species not in index:
+                    raise ValueError(f"Especie '{species}' de la reacción "
+                                     f"'{reaction.name}' no declarada en la red")
+
+            for species, nu in reaction.reactants.items():
+                self.S[index[species], j] -= nu
+            for species, nu in reaction.products.items():
+                self.S[index[species], j] += nu
+
+            for species, order in (reaction.orders_forward or reaction.reactants).items():
+                self.orders_forward[j, index[species]] = order
+            if reaction.reversible:
+                for species, order in (reaction.orders_reverse or reaction.products).items():
+                    self.orders_reverse[j, index[species]] = order
+
+        self.reversible = np.array([reaction.reversible for reaction in self.reactions],
+                                   dtype=bool)
+
+        self.source = self._generate_source()
+        namespace = {'np': np}
+        exec(compile(self.source, f'<ReactionNetwork {name}>', 'exec'), namespace)
+        self._terms = namespace['terms']
+        self._rates = namespace['rates']
+        self._rhs = namespace['rhs']
+        self._rate_jacobian = namespace['rate_jacobian']
+        self._jacobian = namespace['jacobian']
+        self._rate_cross_derivatives = namespace['rate_cross_derivatives']
+        self._rate_hessian = namespace['rate_hessian']
+
+    # ------------------------------------------------------------------
+    # Generación de código
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _power(i: int, order: float) -> str:
+        """
+        Expresión de c_i**order.
+
+        Con exponente negativo la potencia se evalúa sobre g_i (c_i con los
+        ceros sustituidos por 1) y se anula donde c_i ≤ 0, para no generar
+        inf/NaN en especies agotadas.
+        """
+        if order == 1:
+            return f'c{i}'
+        exponent = int(order) if float(order).is_integer() else float(order)
+        if order < 0:
+            return f'(g{i}**{exponent!r} * m{i})'
+        return f'c{i}**{exponent!r}'
+
+    def _monomial(self, orders: np.ndarray) -> List[str]:
+        """Factores Π c_i^orden_i."""
+        return [self._power(i, order) for i, order in enumerate(orders) if order != 0]
+
+    def _monomial_derivative(self, orders: np.ndarray, *indices: int) -> Optional[str]:
+        """Expresión de ∂ⁿ(Π c_i^orden_i)/∂c_l∂c_m..., o None si es nula."""
+        exponents = np.array(orders, dtype=float)
+        coefficient = 1.0
+        for l in indices:
+            coefficient *= exponents[l]
+            exponents[l] -= 1
+        if coefficient == 0:
+            return None
+        factors = self._monomial(exponents)
+        if coefficient != 1:
+            factors.insert(0, repr(coefficient))
+        return ' * '.join(factors) or 'one'
+
+    @staticmethod
+    def _linear_combination(terms: List[Tuple[float, str]]) -> str:
+        """Expresión de Σ coef·término (sin términos nulos), o 'zero'."""
+        parts = []
+        for coefficient, term in terms:
+            if coefficient == 0:
+                continue
+            if abs(coefficient) == 1:
+                parts.append(('- ' if coefficient < 0 else '+ ') + term)
+            else:
+                parts.append(('- ' if coefficient < 0 else '+ ') + f'{float(abs(coefficient))!r}*{term}')
+        if not parts:
+            return 'zero'
+        expression = ' '.join(parts)
+        return expression[2:] if expression.startswith('+ ') else '-' + expression[2:]
+
+    def _generate_source(self) -> str:
+        """
+        Genera el código de terms, rates, rhs, rate_jacobian, jacobian,
+        rate_cross_derivatives y rate_hessian.
+        """
+        n_species, n_reactions = self.S.shape
+        species_vars = ', '.join(f'c{i}' for i in range(n_species)) + ','
+        mask_vars = ', '.join(f'm{i}' for i in range(n_species)) + ','
+
+        unpack = [f'    {species_vars} = np.maximum(C, 0.0)']
+        # Especies con algún orden no entero menor que 2 (o negativo): alguna
+        # de sus potencias o derivadas tiene exponente negativo y se evalúa
+        # protegida
+        orders = np.vstack([self.orders_forward, self.orders_reverse])
+        guarded = [l for l in range(n_species)
+                   if np.any((orders[:, l] != 0) & (orders[:, l] != 1) & (orders[:, l] < 2))]
+        for l in guarded:
+            unpack += [f'    m{l} = C[{l}] > 0', f'    g{l} = np.where(m{l}, c{l}, 1.0)']
+        constants = ['    zero = 0.0 * (c0 * k_f[0])', '    one = zero + 1.0']
+
+        # Leyes de potencia y velocidades netas
+        P_f = [' * '.join(self._monomial(row)) or 'one' for row in self.orders_forward]
+        P_r = [' * '.join(self._monomial(row)) or 'one' if rev else 'zero'
+               for row, rev in zip(self.orders_reverse, self.reversible)]
+        rate_lines = []
+        for j in range(n_reactions):
+            expression = f'k_f[{j}] * ({P_f[j]})'
+            if self.reversible[j]:
+                expression += f' - k_r[{j}] * ({P_r[j]})'
+            rate_lines.append(f'    r{j} = {expression}')
+
+        # ∂r_j/∂c_l (sin la máscara de recorte)
+        dr = {}
+        for j in range(n_reactions):
+            for l in range(n_species):
+                terms = []
+                d_f = self._monomial_derivative(self.orders_forward[j], l)
+                if d_f is not None:
+                    terms.append((1.0, f'k_f[{j}] * ({d_f})'))
+                if self.reversible[j]:
+                    d_r = self._monomial_derivative(self.orders_reverse[j], l)
+                    if d_r is not None:
+                        terms.append((-1.0, f'k_r[{j}] * ({d_r})'))
+                if terms:
+                    dr[j, l] = self._linear_combination(terms)
+
+        dr_lines = [f'    d{j}_{l} = ({expression}) * m{l}' for (j, l), expression in dr.items()]
+
+        # ∂²r_j/∂c_l∂ln k_f,j = k_f·∂P_f/∂c_l y ∂²r_j/∂c_l∂ln k_r,j = -k_r·∂P_r/∂c_l
+        cross_f, cross_r = [], []
+        for j in range(n_reactions):
+            row_f, row_r = [], []
+            for l in range(n_species):
+                d_f = self._monomial_derivative(self.orders_forward[j], l)
+                row_f.append(f'k_f[{j}] * ({d_f}) * m{l}' if d_f is not None else 'zero')
+                d_r = (self._monomial_derivative(self.orders_reverse[j], l)
+                       if self.reversible[j] else None)
+                row_r.append(f'-k_r[{j}] * ({d_r}) * m{l}' if d_r is not None else 'zero')
+            cross_f.append(row_f)
+            cross_r.append(row_r)
+
+        # ∂²r_j/∂c_l∂c_m (simétrica en l, m)
+        hessian = []
+        for j in range(n_reactions):
+            block = []
+            for l in range(n_species):
+                row = []
+                for m in range(n_species):
+                    terms = []
+                    d_f = self._monomial_derivative(self.orders_forward[j], l, m)
+                    if d_f is not None:
+                        terms.append((1.0, f'k_f[{j}] * ({d_f})'))
+                    if self.reversible[j]:
+                        d_r = self._monomial_derivative(self.orders_reverse[j], l, m)
+                        if d_r is not None:
+                            terms.append((-1.0, f'k_r[{j}] * ({d_r})'))
+                    row.append(f'({self._linear_combination(terms)}) * m{l} * m{m}'
+                               if terms else 'zero')
+                block.append(row)
+            hessian.append(block)
+        dr_rows = [[f'd{j}_{l}' if (j, l) in dr else 'zero' for l in range(n_species)]
+                   for j in range(n_reactions)]
+        J_rows = [[self._linear_combination([(self.S[i, j], f'd{j}_{l}')
+                                             for j in range(n_reactions) if (j, l) in dr])
+                   for l in range(n_species)]
+                  for i in range(n_species)]
+        rhs_terms = [self._linear_combination([(self.S[i, j], f'r{j}') for j in range(n_reactions)])
+                     for i in range(n_species)]
+
+        def array(rows):
+            return 'np.array([' + ', '.join('[' + ', '.join(row) + ']' for row in rows) + '])'
+
+        reaction_vars = ', '.join(f'r{j}' for j in range(n_reactions))
+        terms_constants = ['    zero = 0.0 * c0', '    one = zero + 1.0']
+        source = [
+            'def terms(C):',
+            *unpack, *terms_constants,
+            f'    return np.array([{", ".join(P_f)}]), np.array([{", ".join(P_r)}])',
+            '',
+            'def rates(C, k_f, k_r):',
+            *unpack, *constants, *rate_lines,
+            f'    return np.array([{reaction_vars}])',
+            '',
+            'def rhs(C, k_f, k_r):',
+            *unpack, *constants, *rate_lines,
+            f'    return np.array([{", ".join(rhs_terms)}])',
+            '',
+            'def rate_jacobian(C, k_f, k_r):',
+            f'    {mask_vars} = C > 0',
+            *unpack, *constants, *dr_lines,
+            f'    return {array(dr_rows)}',
+            '',
+            'def jacobian(C, k_f, k_r):',
+            f'    {mask_vars} = C > 0',
+            *unpack, *constants, *dr_lines,
+            f'    return {array(J_rows)}',
+            '',
+            'def rate_cross_derivatives(C, k_f, k_r):',
+            f'    {mask_vars} = C > 0',
+            *unpack, *constants,
+            f'    return {array(cross_f)}, {array(cross_r)}',
+            '',
+            'def rate_hessian(C, k_f, k_r):',
+            f'    {mask_vars} = C > 0',
+            *unpack, *constants,
+            '    return np.array([' + ', '.join(array(block)[len('np.array('):-1]
+                                                for block in hessian) + '])',
+            '',
+        ]
+        return '\n'.join(source)
+
+    @property
+    def n_species(self) -> int:
+        return len(self.species)
+
+    @property
+    def n_reactions(self) -> int:
+        return len(self.reactions)
+
+    @property
+    def reaction_names(self) -> List[str]:
+        return [reaction.name for reaction in self.reactions]
+
+    def parameters(self) -> Dict[str, Dict[str, float]]:
+        """Parámetros de Arrhenius por reacción {nombre: {'Ea_forward': ..., ...}}."""
+        return {reaction.name: reaction.arrhenius_parameters() for reaction in self.reactions}
+
+    # ------------------------------------------------------------------
+    # Evaluación (especies/reacciones en el primer eje)
+    # ------------------------------------------------------------------
+
+    def rate_constants(self,
+                       T_celsius,
+                       params: Optional[List[Dict[str, float]]] = None,
+                       reversible: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Constantes de velocidad de Arrhenius de todas las reacciones.
+
+        Args:
+            T_celsius: Temperatura (°C), escalar o arreglo de forma (N,)
+            params: Parámetros de Arrhenius de cada reacción, en el orden de la
+                    red (si None, los de la especificación)
+            reversible: Si False, anula todas las constantes inversas
+
+        Returns:
+            Tupla (k_forward, k_reverse) con forma (..., n_reacciones); k_reverse
+            es cero en las reacciones irreversibles
+        """
+        if params is None:
+            params = [reaction.arrhenius_parameters() for reaction in self.reactions]
+
+        A_f = np.array([p['A_forward'] for p in params], dtype=float)
+        Ea_f = np.array([p['Ea_forward'] for p in params], dtype=float)
+        T = np.asarray(T_celsius, dtype=float)[..., None]
+
+        k_f = arrhenius(T, A_f, Ea_f)
+        mask = self.reversible & reversible
+        if mask.any():
+            A_r = np.array([p['A_reverse'] if rev else 0.0
+                            for p, rev in zip(params, mask)], dtype=float)
+            Ea_r = np.array([p['Ea_reverse'] if rev else 0.0
+                             for p, rev in zip(params, mask)], dtype=float)
+            k_r = arrhenius(T, A_r, Ea_r)
+        else:
+            k_r = np.zeros_like(k_f)
+
+        return k_f, k_r
+
+    def mass_action_terms(self, C: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Términos de ley de potencia de cada reacción, r = k_f·P_f - k_r·P_r.
+
+        Las concentraciones negativas se recortan a cero.
+
+        Args:
+            C: Concentraciones, forma (n_especies, ...)
+
+        Returns:
+            Tupla (P_f, P_r), cada uno con forma (n_reacciones, ...)
+        """
+        return self._terms(C)
+
+    def rates(self, C: np.ndarray, k_f: np.ndarray, k_r: np.ndarray) -> np.ndarray:
+        """
+        Velocidades netas de reacción.
+
+        Args:
+            C: Concentraciones, forma (n_especies, ...)
+            k_f: Constantes directas, forma (n_reacciones, ...)
+            k_r: Constantes inversas, forma (n_reacciones, ...)
+
+        Returns:
+            Velocidades netas, forma (n_reacciones, ...)
+        """
+        return self._rates(C, k_f, k_r)
+
+    def rhs(self, C: np.ndarray, k_f: np.ndarray, k_r: np.ndarray) -> np.ndarray:
+        """
+        Lado derecho dC/dt = S·r.
+
+        Args:
+            C: Concentraciones, forma (n_especies, ...)
+            k_f: Constantes directas, forma (n_reacciones, ...)
+            k_r: Constantes inversas, forma (n_reacciones, ...)
+
+        Returns:
+            Derivadas, forma (n_especies, ...)
+        """
+        return self._rhs(C, k_f, k_r)
+
+    def rate_jacobian(self, C: np.ndarray, k_f: np.ndarray, k_r: np.ndarray) -> np.ndarray:
+        """
+        Derivadas de las velocidades netas respecto a las concentraciones.
+
+        Las especies recortadas a cero tienen derivada nula.
+
+        Args:
+            C: Concentraciones, forma (n_especies, ...)
+            k_f: Constantes directas, forma (n_reacciones, ...)
+            k_r: Constantes inversas, forma (n_reacciones, ...)
+
+        Returns:
+            ∂r/∂C, forma (n_reacciones, n_especies, ...)
+        """
+        return self._rate_jacobian(C, k_f, k_r)
+
+    def jacobian(self, C: np.ndarray, k_f: np.ndarray, k_r: np.ndarray) -> np.ndarray:
+        """
+        Jacobiano J = S·∂r/∂C.
+
+        Args:
+            C: Concentraciones, forma (n_especies, ...)
+            k_f: Constantes directas, forma (n_reacciones, ...)
+            k_r: Constantes inversas, forma (n_reacciones, ...)
+
+        Returns:
+            Jacobiano, forma (n_especies, n_especies, ...)
+        """
+        return self._jacobian(C, k_f, k_r)
+
+    def rate_cross_derivatives(self,
+                               C: np.ndarray,
+                               k_f: np.ndarray,
+                               k_r: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Derivadas cruzadas de las velocidades respecto a C y a ln k.
+
+        Cada velocidad depende solo de sus propias constantes, así que basta
+        con ∂²r_j/∂C∂ln k_f,j = k_f,j·∂P_f,j/∂C y ∂²r_j/∂C∂ln k_r,j =
+        -k_r,j·∂P_r,j/∂C (términos de las ecuaciones de sensibilidad).
+
+        Args:
+            C: Concentraciones, forma (n_especies, ...)
+            k_f: Constantes directas, forma (n_reacciones, ...)
+            k_r: Constantes inversas, forma (n_reacciones, ...)
+
+        Returns:
+            Tupla (directas, inversas), cada una con forma
+            (n_reacciones, n_especies, ...)
+        """
+        return self._rate_cross_derivatives(C, k_f, k_r)
+
+    def rate_hessian(self, C: np.ndarray, k_f: np.ndarray, k_r: np.ndarray) -> np.ndarray:
+        """
+        Segundas derivadas de las velocidades netas respecto a las concentraciones.
+
+        Args:
+            C: Concentraciones, forma (n_especies, ...)
+            k_f: Constantes directas, forma (n_reacciones, ...)
+            k_r: Constantes inversas, forma (n_reacciones, ...)
+
+        Returns:
+            ∂²r/∂C∂C, forma (n_reacciones, n_especies, n_especies, ...)
+        """
+        return self._rate_hessian(C, k_f, k_r)
+
+    # ------------------------------------------------------------------
+    # Especificación declarativa
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_dict(cls, spec: Dict) -> 'ReactionNetwork':
+        """
+        Construye la red desde un diccionario (p. ej. leído de JSON/YAML).
+
+        {
+            'name': 'Esterificación de AGL',
+            'species': ['FFA', 'MeOH', 'FAME', 'H2O'],
+            'reactions': [
+                {'name': 'esterification',
+                 'reactants': {'FFA': 1, 'MeOH': 1},
+                 'products': {'FAME': 1, 'H2O': 1},
+                 'Ea_forward': 50.0, 'A_forward': 1e6,
+                 'Ea_reverse': 55.0, 'A_reverse': 1e5},
+            ],
+        }
+        """
+        reactions = [Reaction(**reaction) for reaction in spec['reactions']]
+        return cls(spec['species'], reactions, name=spec.get('name', ''))
+
+    def to_dict(self) -> Dict:
+        """Especificación declarativa de la red (inversa de from_dict)."""
+        return {
+            'name': self.name,
+            'species': list(self.species),
+            'reactions': [asdict(reaction) for reaction in self.reactions],
+        }
+
+    def __getstate__(self):
+        # Las funciones generadas no son serializables: se regeneran al cargar
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        reactions = [Reaction(**reaction) for reaction in state['reactions']]
+        self.__init__(state['species'], reactions, name=state['name'])
+
+    def __repr__(self) -> str:
+        equations = '; '.join(reaction.equation for reaction in self.reactions)
+        return f"ReactionNetwork({self.name!r}: {equations})"
+
+
+# Redes de transesterificación integradas
+
+def transesterification_1step(params: Optional[Dict[str, float]] = None,
+                              reversible: bool = True) -> ReactionNetwork:
+    """
+    Modelo global de 1 paso: TG + 3 MeOH ⇌ 3 FAME + GL.
+
+    Ley de velocidad pseudo-2° orden: r = k_f·C_TG·C_MeOH - k_r·C_FAME³·C_GL.
+
+    Args:
+        params: Parámetros de Arrhenius {'Ea_forward': ..., 'A_forward': ..., ...}
+        reversible: Si la reacción es reversible
+
+    Returns:
+        ReactionNetwork con especies [TG, MeOH, FAME, GL]
+    """
+    reaction = Reaction(
+        name='global',
+        reactants={'TG': 1, 'MeOH': 3},
+        products={'FAME': 3, 'GL': 1},
+        reversible=reversible,
+        orders_forward={'TG': 1, 'MeOH': 1},
+        **(params or {}),
+    )
+    return ReactionNetwork(['TG', 'MeOH', 'FAME', 'GL'], [reaction],
+                           name='Transesterificación (1 paso)')
+
+
+def transesterification_3step(params: Optional[Dict[str, Dict[str, float]]] = None,
+                              reversible: bool = True) -> ReactionNetwork:
+    """
+    Modelo mecanístico de 3 pasos consecutivos (cada paso consume 1 MeOH y
+    libera 1 FAME):
+
+        1) TG + MeOH ⇌ DG + FAME
+        2) DG + MeOH ⇌ MG + FAME
+        3) MG + MeOH ⇌ GL + FAME
+
+    Args:
+        params: Parámetros por paso {'step1': {'Ea_forward': ..., ...}, ...}
+        reversible: Si los pasos son reversibles
+
+    Returns:
+        ReactionNetwork con especies [TG, DG, MG, GL, FAME, MeOH]
+    """
+    params = params or {}
+    glycerides = ['TG', 'DG', 'MG', 'GL']
+    reactions = [
+        Reaction(
+            name=f'step{i + 1}',
+            reactants={glycerides[i]: 1, 'MeOH': 1},
+            products={glycerides[i + 1]: 1, 'FAME': 1},
+            reversible=reversible,
+            **params.get(f'step{i + 1}', {}),
+        )
+        for i in range(3)
+    ]
+    return ReactionNetwork(['TG', 'DG', 'MG', 'GL', 'FAME', 'MeOH'], reactions,
+                           name='Transesterificación (3 pasos)')
+
+
+BUILTIN_NETWORKS = {
+    '1-step': transesterification_1step,
+    '3-step': transesterification_3step,
+}
+
+
+if __name__ == "__main__":
+    # Ejemplo: transesterificación de 1 paso con esterificación de ácidos
+    # grasos libres (AGL) como reacción secundaria (parámetros ilustrativos)
+    network = ReactionNetwork.from_dict({
+        'name': 'Transesterificación + esterificación de AGL',
+        'species': ['TG', 'MeOH', 'FAME', 'GL', 'FFA', 'H2O'],
+        'reactions': [
+            {'name': 'transesterification',
+             'reactants': {'TG': 1, 'MeOH': 3}, 'products': {'FAME': 3, 'GL': 1},
+             'orders_forward': {'TG': 1, 'MeOH': 1},
+             'Ea_forward': 50.0, 'A_forward': 1e7, 'Ea_reverse': 55.0, 'A_reverse': 1e5},
+            {'name': 'esterification',
+             'reactants': {'FFA': 1, 'MeOH': 1}, 'products': {'FAME': 1, 'H2O': 1},
+             'Ea_forward': 45.0, 'A_forward': 5e6, 'Ea_reverse': 50.0, 'A_reverse': 1e6},
+        ],
+    })
+    print(network)
+    print(f"S =\n{network.S}")
+
+    C = np.array([0.5, 4.5, 0.0, 0.0, 0.05, 0.0])
+    k_f, k_r = network.rate_constants(60.0)
+    print(f"k_f = {k_f}, k_r = {k_r}")
+    print(f"dC/dt = {network.rhs(C, k_f, k_r)}")
@@ -0,0 +1,387 @@
+"""
+Caché Persistente de Simulaciones
+
+Caché direccionado por contenido para KineticModel.simulate(): la clave es un
+hash SHA-256 de todo lo que determina el resultado (red de reacción,
+parámetros cinéticos, temperatura, C0, t_span, t_eval, método, tolerancias,
+...) más la versión del código del modelo. Combina:
+
+    - LRU en memoria (acceso inmediato dentro del mismo proceso)
+    - Almacén en disco comprimido compartido entre ejecuciones, con
+      desalojo de los archivos menos usados al superar max_disk_bytes. Cada
+      entrada es un .npz con los arreglos t e y y los metadatos en JSON; se
+      lee sin pickle (allow_pickle=False), de modo que un archivo ajeno en
+      el directorio compartido no puede ejecutar código al cargarse
+    - Invalidación automática: las entradas de otra versión del código
+      (fuentes de los módulos del modelo, versiones de NumPy/SciPy) se
+      ignoran y se eliminan del disco
+
+Las entradas se guardan en <directorio>/simulation_cache/<versión>/; el caché
+solo borra dentro de simulation_cache/, nunca otros contenidos del directorio.
+
+Uso:
+    cache = SimulationCache('~/.cache/esterificacion')
+    model = KineticModel('3-step', cache=cache)
+
+o, sin modificar el código, definiendo la variable de entorno
+ESTERIFICACION_CACHE_DIR (todos los KineticModel la usan por defecto).
+
+Author: Sistema de Modelado de Esterificación
+Date: 2025-11-19
+"""
+
+import copy
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import scipy
+
+from .simulation_result import SimulationResult
+
+
+# Variable de entorno que activa el caché en disco por defecto
+CACHE_DIR_ENV = 'ESTERIFICACION_CACHE_DIR'
+
+# Subdirectorio propio del caché dentro del directorio indicado
+CACHE_SUBDIR = 'simulation_cache'
+
+# Módulos cuyo código determina los resultados de simulate() (y el formato
+# de las entradas en disco)
+_VERSIONED_MODULES = ('kinetic_model.py', 'reaction_network.py',
+                      'simulation_result.py', 'properties.py',
+                      'simulation_cache.py')
+
+# Atributos escalares de SimulationResult guardados en los metadatos JSON
+_RESULT_FIELDS = ('species', 'C_TG0', 'success', 'message', 'nfev', 'njev', 'nlu',
+                  'method', 'wall_time')
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def code_version() -> str:
+    """
+    Huella de la versión del código del modelo.
+
+    Returns:
+        Hash (16 caracteres hex) de las fuentes de los módulos del modelo y de
+        las versiones de NumPy y SciPy
+    """
+    digest = hashlib.sha256(f'numpy={np.__version__};scipy={scipy.__version__}'.encode())
+    models_dir = Path(__file__).parent
+    for name in _VERSIONED_MODULES:
+        digest.update((models_dir / name).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _canonical(value):
+    """Convierte value a una estructura JSON determinista (arreglos → listas)."""
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return {'__array__': hashlib.sha256(
+            np.ascontiguousarray(value, dtype=float).tobytes()).hexdigest(),
+            'shape': list(value.shape)}
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def content_hash(**fields) -> str:
+    """
+    Hash SHA-256 de contenido de unos campos.
+
+    Args:
+        **fields: Valores JSON, diccionarios o arreglos de NumPy
+
+    Returns:
+        Hash (hex)
+    """
+    payload = json.dumps(_canonical(fields), sort_keys=True, allow_nan=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class SimulationCache:
+    """
+    Caché de resultados de simulación (LRU en memoria + disco comprimido).
+
+    En disco solo se guardan SimulationResult sin interpolante cuyas claves
+    adicionales sean serializables en JSON; el resto queda solo en memoria.
+
+    Attributes:
+        directory (Path): Directorio del almacén en disco (None: solo memoria);
+                          las entradas van en su subdirectorio simulation_cache/
+        max_memory_items (int): Entradas máximas del LRU en memoria
+        max_disk_bytes (int): Tamaño máximo del almacén en disco (bytes)
+        version (str): Versión del código con la que se generan las claves
+        hits (int): Aciertos (memoria + disco)
+        misses (int): Fallos
+    """
+
+    def __init__(self,
+                 directory: Optional[str] = None,
+                 max_memory_items: int = 256,
+                 max_disk_bytes: int = 512 * 1024 ** 2,
+                 version: Optional[str] = None):
+        """
+        Inicializa el caché.
+
+        Args:
+            directory: Directorio del almacén en disco (None: solo memoria)
+            max_memory_items: Entradas máximas del LRU en memoria
+            max_disk_bytes: Tamaño máximo del almacén en disco (bytes)
+            version: Versión del código (si None, code_version())
+        """
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self.version = version or code_version()
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.directory = None
+        self._disk_bytes = 0
+        if directory is not None:
+            self.directory = Path(directory).expanduser()
+            self._version_dir.mkdir(parents=True, exist_ok=True)
+            self._purge_stale_versions()
+            self._disk_bytes = sum(path.stat().st_size for path in self._entries())
+
+    @property
+    def _root(self) -> Path:
+        return self.directory / CACHE_SUBDIR
+
+    @property
+    def _version_dir(self) -> Path:
+        return self._root / self.version
+
+    def _entries(self):
+        return self._version_dir.glob('*/*.npz')
+
+    def _path(self, key: str) -> Path:
+        return self._version_dir / key[:2] / f'{key}.npz'
+
+    def _purge_stale_versions(self):
+        """Elimina del disco las entradas generadas por otra versión del código."""
+        # Solo dentro del subdirectorio propio: el resto de self.directory no es del caché
+        for path in self._root.iterdir():
+            if path.is_dir() and path.name != self.version:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def key(self, **fields) -> str:
+        """
+        Clave de contenido de una simulación.
+
+        Args:
+            **fields: Todo lo que determina el resultado (valores JSON,
+                      diccionarios o arreglos de NumPy)
+
+        Returns:
+            Hash SHA-256 (hex)
+        """
+        return content_hash(version=self.version, **fields)
+
+    def get(self, key: str):
+        """
+        Busca un resultado (primero en memoria, luego en disco).
+
+        Args:
+            key: Clave de contenido
+
+        Returns:
+            Copia del resultado almacenado, o None si no existe. La copia se
+            marca como acierto (results['cached'] = True): wall_time es el
+            tiempo de la búsqueda y nfev/njev/nlu son 0, ya que no se
+            integró nada
+        """
+        start = time.perf_counter()
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return _mark_hit(copy.deepcopy(self._memory[key]), start)
+
+        result = self._read_disk(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, result)
+        return _mark_hit(copy.deepcopy(result), start)
+
+    def put(self, key: str, result):
+        """
+        Almacena un resultado en memoria y en disco.
+
+        Args:
+            key: Clave de contenido
+            result: Resultado serializable (SimulationResult)
+        """
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._remember(key, result)
+        if self.directory is not None:
+            self._write_disk(key, result)
+
+    def clear(self):
+        """Vacía la memoria y el almacén en disco."""
+        with self._lock:
+            self._memory.clear()
+            if self.directory is not None:
+                shutil.rmtree(self._version_dir, ignore_errors=True)
+                self._version_dir.mkdir(parents=True, exist_ok=True)
+                self._disk_bytes = 0
+
+    def stats(self) -> Dict:
+        """Aciertos, fallos y ocupación del caché."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'memory_items': len(self._memory),
+            'disk_bytes': self._disk_bytes,
+            'version': self.version,
+        }
+
+    def __getstate__(self):
+        # El LRU en memoria y el candado no se envían a otros procesos
+        state = self.__dict__.copy()
+        state['_memory'] = OrderedDict()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _remember(self, key: str, result):
+        """Inserta en el LRU en memoria (requiere self._lock)."""
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str):
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as entry:
+                meta = json.loads(str(entry['meta']))
+                result = SimulationResult(t=entry['t'], y=entry['y'],
+                                          **{field: meta[field] for field in _RESULT_FIELDS},
+                                          extra=meta['extra'])
+        except (OSError, EOFError, KeyError, TypeError, ValueError, zipfile.BadZipFile):
+            # Ausente, incompleta o con otro formato: se trata como fallo
+            return None
+        # La fecha de modificación marca el último uso (desalojo LRU en disco)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return result
+
+    def _write_disk(self, key: str, result):
+        if not isinstance(result, SimulationResult) or result.has_dense_output:
+            return
+        meta = {field: getattr(result, field) for field in _RESULT_FIELDS}
+        meta['species'] = list(result.species)
+        meta['extra'] = result._extra
+        try:
+            meta = json.dumps(meta, allow_nan=True, default=_json_scalar)
+        except TypeError:
+            # Claves adicionales no serializables: solo en memoria
+            return
+
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Escritura atómica: varios procesos pueden compartir el directorio
+        tmp = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp, 'wb') as f:
+            np.savez_compressed(f, t=result.t, y=result.y, meta=np.array(meta))
+        size = tmp.stat().st_size
+        previous = path.stat().st_size if path.exists() else 0
+        os.replace(tmp, path)
+
+        with self._lock:
+            self._disk_bytes += size - previous
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _evict_disk(self):
+        """Elimina los archivos menos usados hasta bajar al 90 % de max_disk_bytes."""
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = 0.9 * self.max_disk_bytes
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+        self._disk_bytes = total
+
+
+def _json_scalar(value):
+    """Escalares de NumPy para json.dumps (el resto no es serializable)."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} no es serializable en JSON")
+
+
+def _mark_hit(result, start: float):
+    """
+    Marca una copia leída del caché para que sus estadísticas no reporten
+    el costo del integrador de la corrida original.
+
+    Args:
+        result: Copia del resultado almacenado (SimulationResult)
+        start: Instante (time.perf_counter()) en que empezó la búsqueda
+
+    Returns:
+        El mismo resultado, marcado
+    """
+    result.nfev = result.njev = result.nlu = 0
+    result.wall_time = time.perf_counter() - start
+    result['cached'] = True
+    return result
+
+
+def get_default_cache() -> Optional[SimulationCache]:
+    """
+    Caché por defecto del proceso.
+
+    Returns:
+        SimulationCache en el directorio de ESTERIFICACION_CACHE_DIR, o None
+        si la variable de entorno no está definida
+    """
+    global _default_cache
+    directory = os.environ.get(CACHE_DIR_ENV)
+    if not directory:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None or _default_cache.directory != Path(directory).expanduser():
+            _default_cache = SimulationCache(directory)
+        return _default_cache
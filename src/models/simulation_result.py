@@ -0,0 +1,213 @@
+"""
+Resultado Compacto de Simulación Cinética
+
+Contenedor de los resultados de KineticModel.simulate() respaldado por un
+único arreglo contiguo (n_especies, n_t). Las métricas derivadas (conversión,
+rendimiento de FAME) se calculan al consultarlas y no se almacenan, lo que
+reduce la memoria cuando se conservan miles de corridas.
+
+Mantiene el acceso tipo diccionario (results['C_TG'], results['conversion_%'],
+keys(), items(), ...) por compatibilidad con el código existente.
+
+Author: Sistema de Modelado de Esterificación
+Date: 2025-11-19
+"""
+
+import numpy as np
+from collections.abc import MutableMapping
+from typing import Callable, Dict, Iterator, Optional, Sequence
+
+
+# Claves fijas, en el orden en que se reportan
+_META_KEYS = ('t', 'success', 'message', 'nfev', 'njev', 'nlu', 'method', 'wall_time')
+_DERIVED_KEYS = ('conversion_%', 'FAME_yield_%')
+
+
+class SimulationResult(MutableMapping):
+    """
+    Resultados de una simulación con acceso tipo diccionario.
+
+    Las concentraciones se guardan en y[i] (vistas, sin copia) y se exponen
+    como 'C_<especie>'. 'conversion_%' y 'FAME_yield_%' se calculan en cada
+    consulta a partir de C_TG0 (solo existen si C_TG0 > 0). Las claves
+    adicionales (t_target, t_events, ...) van a un diccionario auxiliar que
+    se crea solo si se usa; asignar una clave fija la sobrescribe ahí.
+
+    Attributes:
+        t (np.ndarray): Tiempos (n_t,)
+        y (np.ndarray): Concentraciones (n_especies, n_t), contiguo
+        species (tuple): Nombres de especies (orden de las filas de y)
+        C_TG0 (float): Concentración inicial de TG (mol/L)
+        success (bool): Si la integración terminó correctamente
+        message (str): Mensaje del integrador
+        nfev, njev, nlu (int): Estadísticas del integrador
+        method (str): Método de integración usado ('analytic' si solución cerrada)
+        wall_time (float): Tiempo de pared de la simulación (s)
+    """
+
+    __slots__ = ('t', 'y', 'species', 'C_TG0', 'success', 'message',
+                 'nfev', 'njev', 'nlu', 'method', 'wall_time', '_sol', '_extra')
+
+    def __init__(self,
+                 t: np.ndarray,
+                 y: np.ndarray,
+                 species: Sequence[str],
+                 C_TG0: float = 0.0,
+                 success: bool = True,
+                 message: str = '',
+                 nfev: int = 0,
+                 njev: int = 0,
+                 nlu: int = 0,
+                 method: str = '',
+                 wall_time: float = 0.0,
+                 sol: Optional[Callable] = None,
+                 extra: Optional[Dict] = None):
+        """
+        Inicializa el resultado.
+
+        Args:
+            t: Tiempos (n_t,)
+            y: Concentraciones (n_especies, n_t)
+            species: Nombres de especies
+            C_TG0: Concentración inicial de TG (mol/L)
+            success: Si la integración terminó correctamente
+            message: Mensaje del integrador
+            nfev: Número de evaluaciones de función
+            njev: Número de evaluaciones del Jacobiano
+            nlu: Número de factorizaciones LU
+            method: Método de integración usado
+            wall_time: Tiempo de pared de la simulación (s)
+            sol: Interpolante sol(t) -> (n_especies, ...) (opcional)
+            extra: Claves adicionales
+        """
+        self.t = np.asarray(t, dtype=float)
+        self.y = np.ascontiguousarray(y, dtype=float)
+        self.species = tuple(species)
+        self.C_TG0 = float(C_TG0)
+        self.success = bool(success)
+        self.message = message
+        self.nfev = int(nfev)
+        self.njev = int(njev)
+        self.nlu = int(nlu)
+        self.method = method
+        self.wall_time = float(wall_time)
+        self._sol = sol
+        self._extra = dict(extra) if extra else None
+
+        if self.y.shape != (len(self.species), len(self.t)):
+            raise ValueError(f"y debe tener forma (n_especies, n_t) = "
+                             f"{(len(self.species), len(self.t))}, no {self.y.shape}")
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    @property
+    def has_dense_output(self) -> bool:
+        """Si se conservó el interpolante de la solución."""
+        return self._sol is not None
+
+    def sol(self, t) -> np.ndarray:
+        """
+        Evalúa la solución continua en tiempos arbitrarios.
+
+        Args:
+            t: Tiempo o arreglo de tiempos (min)
+
+        Returns:
+            Concentraciones (n_especies,) o (n_especies, len(t))
+        """
+        if self._sol is None:
+            raise ValueError("Resultado sin salida densa; use simulate(..., dense_output=True)")
+        return self._sol(t)
+
+    def concentration(self, species: str) -> np.ndarray:
+        """Perfil de concentración de una especie (vista de y)."""
+        return self.y[self.species.index(species)]
+
+    def solver_stats(self) -> Dict:
+        """Estadísticas del integrador de esta simulación."""
+        stats = {'method': self.method, 'success': self.success, 'nfev': self.nfev,
+                 'njev': self.njev, 'nlu': self.nlu, 'wall_time': self.wall_time}
+        if self._extra is not None and 'solver_attempts' in self._extra:
+            stats['attempts'] = self._extra['solver_attempts']
+        if self._extra is not None and self._extra.get('cached'):
+            stats['cached'] = True
+        return stats
+
+    def final_state(self) -> Dict[str, float]:
+        """Concentraciones al último tiempo {especie: C}."""
+        return {species: float(self.y[i, -1]) for i, species in enumerate(self.species)}
+
+    def _derived(self, key: str) -> np.ndarray:
+        """Calcula 'conversion_%' o 'FAME_yield_%' a partir de y."""
+        if key == 'conversion_%':
+            return (self.C_TG0 - self.concentration('TG')) / self.C_TG0 * 100
+        return self.concentration('FAME') / (3.0 * self.C_TG0) * 100
+
+    def _core_keys(self) -> Iterator[str]:
+        """Claves respaldadas por los slots, en orden de reporte."""
+        yield from _META_KEYS
+        for species in self.species:
+            yield f'C_{species}'
+        if self.C_TG0 > 0:
+            # Redes sin FAME (p. ej. etanólisis) solo reportan la conversión
+            yield 'conversion_%'
+            if 'FAME' in self.species:
+                yield 'FAME_yield_%'
+
+    # ------------------------------------------------------------------
+    # Interfaz de diccionario
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, key: str):
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        if key in _META_KEYS:
+            return getattr(self, key)
+        if key.startswith('C_') and key[2:] in self.species:
+            return self.concentration(key[2:])
+        if key in _DERIVED_KEYS and key in self._core_keys():
+            return self._derived(key)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value):
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key: str):
+        if self._extra is None or key not in self._extra:
+            raise KeyError(f"Solo se pueden eliminar claves adicionales: {key!r}")
+        del self._extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        core = list(self._core_keys())
+        yield from core
+        if self._extra:
+            yield from (key for key in self._extra if key not in core)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key) -> bool:
+        return (self._extra is not None and key in self._extra) or key in self._core_keys()
+
+    def copy(self) -> Dict:
+        """Copia superficial como dict (equivale al antiguo dict.copy())."""
+        return dict(self)
+
+    def to_dict(self) -> Dict:
+        """Materializa todas las claves (incluidas las derivadas) en un dict."""
+        return dict(self)
+
+    def __getstate__(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    def __repr__(self) -> str:
+        return (f"SimulationResult(species={self.species}, n_t={len(self.t)}, "
+                f"success={self.success}, dense_output={self.has_dense_output})")
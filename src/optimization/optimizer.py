@@ -16,6 +16,15 @@ from scipy.optimize import OptimizeResult
 import warnings
 
 from ..models.kinetic_model import KineticModel
+from .surrogate import PolynomialChaosSurrogate
+
+
+# Salida del emulador que determina cada tipo de objetivo
+SURROGATE_OUTPUTS = {
+    'maximize_conversion': 'conversion_%',
+    'maximize_yield': 'FAME_yield_%',
+    'minimize_time': 't_target',
+}
 
 
 class OperationalOptimizer:
@@ -27,6 +36,13 @@ class OperationalOptimizer:
         bounds (Dict): Límites de variables
         objective_type (str): Tipo de objetivo ('maximize_conversion', 'minimize_time')
         optimization_result (OptimizeResult): Resultado de la optimización
+        solver_method (str): Método de integración de las simulaciones ('auto':
+                             prueba de rigidez y cadena de respaldo)
+        solver_stats (List[Dict]): Estadísticas del integrador de cada evaluación
+        surrogate (PolynomialChaosSurrogate): Emulador usado como backend de la
+                                              función objetivo (None: modelo real)
+        surrogate_margin (float): Múltiplo del error validado del emulador dentro
+                                  del cual se recurre al modelo real
     """
 
     def __init__(self,
@@ -44,6 +60,11 @@ class OperationalOptimizer:
         self.bounds = self._default_bounds()
         self.optimization_result = None
         self.history = []
+        self.solver_method = 'auto'
+        self.solver_stats = []
+        self.surrogate = None
+        self.surrogate_margin = 1.0
+        self._best_objective = np.inf
 
     def _default_bounds(self) -> Dict:
         """Define límites por defecto para variables."""
@@ -62,13 +83,103 @@ class OperationalOptimizer:
         """
         self.bounds.update(bounds)
 
+    def set_surrogate(self,
+                      surrogate: Optional[PolynomialChaosSurrogate],
+                      margin: float = 1.0):
+        """
+        Usa un emulador entrenado como backend de la función objetivo.
+
+        Cada evaluación se resuelve con el emulador, salvo que el punto esté
+        fuera de sus límites, las condiciones (C0, t_reaction, meta) o el
+        modelo (p. ej. tras un reajuste) no sean los de entrenamiento, o su
+        objetivo quede a menos de margin × error validado del mejor objetivo
+        encontrado: cerca del óptimo se recurre al modelo real.
+
+        Args:
+            surrogate: PolynomialChaosSurrogate entrenado (None: solo modelo real)
+            margin: Múltiplo del error validado para recurrir al modelo real
+
+        Raises:
+            ValueError: Si el emulador se entrenó con otro modelo (tipo, red o
+                        parámetros cinéticos distintos de self.model)
+        """
+        if surrogate is not None and surrogate.model_fingerprint != self.model.fingerprint():
+            raise ValueError("El emulador se entrenó con otro modelo cinético "
+                             "(tipo, red o parámetros distintos)")
+        self.surrogate = surrogate
+        self.surrogate_margin = margin
+
     def _objective_function(self,
                            x: np.ndarray,
                            C0: Dict[str, float],
                            t_reaction: float,
                            target_conversion: float = 95.0) -> float:
         """
-        Función objetivo para optimización.
+        Función objetivo para optimización (emulador o modelo real).
+
+        Args:
+            x: Vector de variables [temperature, rpm, catalyst_%]
+            C0: Condiciones iniciales
+            t_reaction: Tiempo de reacción (min)
+            target_conversion: Conversión objetivo (%)
+
+        Returns:
+            Valor de la función objetivo (a minimizar)
+        """
+        if self.surrogate is not None:
+            value = self._surrogate_objective(x, C0, t_reaction, target_conversion)
+            if value is not None:
+                return value
+
+        value = self._model_objective(x, C0, t_reaction, target_conversion)
+        self._best_objective = min(self._best_objective, value)
+        return value
+
+    def _surrogate_objective(self,
+                             x: np.ndarray,
+                             C0: Dict[str, float],
+                             t_reaction: float,
+                             target_conversion: float) -> Optional[float]:
+        """
+        Objetivo evaluado con el emulador.
+
+        Returns:
+            Valor del objetivo, o None si debe evaluarse con el modelo real
+        """
+        surrogate = self.surrogate
+        if (not surrogate.in_bounds(x)
+                or not surrogate.matches(C0, t_reaction, target_conversion, self.model)):
+            return None
+
+        prediction = {key: float(value[0]) for key, value in surrogate.predict(x).items()}
+        output = SURROGATE_OUTPUTS[self.objective_type]
+        value = -prediction[output] if 'maximize' in self.objective_type else prediction[output]
+
+        # Cerca del mejor objetivo el error del emulador puede invertir el orden
+        if value - self.surrogate_margin * surrogate.error_estimate(output) <= self._best_objective:
+            return None
+
+        T, rpm, cat_pct = x
+        self.history.append({
+            'temperature': T,
+            'rpm': rpm,
+            'catalyst_%': cat_pct,
+            'time_min': t_reaction,
+            'conversion_%': prediction['conversion_%'],
+            'FAME_yield_%': prediction['FAME_yield_%'],
+            'solver_method': 'surrogate',
+            'nfev': 0,
+            'wall_time': 0.0,
+        })
+        return value
+
+    def _model_objective(self,
+                         x: np.ndarray,
+                         C0: Dict[str, float],
+                         t_reaction: float,
+                         target_conversion: float = 95.0) -> float:
+        """
+        Función objetivo evaluada con el modelo real.
 
         Args:
             x: Vector de variables [temperature, rpm, catalyst_%]
@@ -81,21 +192,33 @@ class OperationalOptimizer:
         """
         T, rpm, cat_pct = x
 
-        # Actualizar temperatura del modelo
-        self.model.set_temperature(T)
+        # Simular reacción (para minimize_time, detener al alcanzar la meta)
+        if self.objective_type == 'minimize_time':
+            event_options = {
+                'targets': {'conversion_%': target_conversion},
+                'stop_at_target': True,
+            }
+        else:
+            event_options = {}
 
-        # Simular reacción
         try:
+            # La temperatura se pasa por llamada: el modelo compartido no se modifica
             results = self.model.simulate(
                 t_span=(0, t_reaction),
                 C0=C0,
-                method='Radau'
+                method=self.solver_method,
+                final_only=True,
+                temperature=T,
+                use_cache=False,
+                **event_options
             )
+            self.solver_stats.append(results.solver_stats())
 
             if not results['success']:
                 return 1e6  # Penalización por fallo
 
-            # Extraer métricas
+            # Extraer métricas (con stop_at_target, en el cruce de la meta y no
+            # en t_reaction: 'time_min' registra el instante de lectura)
             conversion_final = results['conversion_%'][-1]
             yield_final = results['FAME_yield_%'][-1]
 
@@ -104,8 +227,12 @@ class OperationalOptimizer:
                 'temperature': T,
                 'rpm': rpm,
                 'catalyst_%': cat_pct,
+                'time_min': results['t'][-1],
                 'conversion_%': conversion_final,
                 'FAME_yield_%': yield_final,
+                'solver_method': results.method,
+                'nfev': results.nfev,
+                'wall_time': results.wall_time,
             })
 
             # Calcular función objetivo según tipo
@@ -116,10 +243,9 @@ class OperationalOptimizer:
                 return -yield_final
 
             elif self.objective_type == 'minimize_time':
-                # Encontrar tiempo para alcanzar conversión objetivo
-                idx_target = np.where(results['conversion_%'] >= target_conversion)[0]
-                if len(idx_target) > 0:
-                    t_target = results['t'][idx_target[0]]
+                # Tiempo exacto de cruce de la conversión objetivo (evento)
+                t_target = results['t_target']['conversion_%']
+                if np.isfinite(t_target):
                     return t_target
                 else:
                     return t_reaction * 2  # Penalización si no alcanza
@@ -129,6 +255,9 @@ class OperationalOptimizer:
 
         except Exception as e:
             warnings.warn(f"Error en simulación: {str(e)}")
+            self.solver_stats.append({'method': self.solver_method, 'success': False,
+                                      'message': str(e), 'nfev': 0, 'njev': 0,
+                                      'nlu': 0, 'wall_time': 0.0})
             return 1e6  # Penalización por error
 
     def optimize(self,
@@ -154,6 +283,8 @@ class OperationalOptimizer:
             Diccionario con resultados de optimización
         """
         self.history = []
+        self.solver_stats = []
+        self._best_objective = np.inf
 
         # Preparar límites para scipy
         bounds_list = [
@@ -215,10 +346,12 @@ class OperationalOptimizer:
         T_opt, rpm_opt, cat_opt = result.x
 
         # Simular con condiciones óptimas para obtener métricas completas
-        self.model.set_temperature(T_opt)
         final_results = self.model.simulate(
             t_span=(0, t_reaction),
-            C0=C0
+            C0=C0,
+            method=self.solver_method,
+            final_only=True,
+            temperature=T_opt
         )
 
         optimal_conditions = {
@@ -232,6 +365,8 @@ class OperationalOptimizer:
             'message': result.message,
             'n_iterations': result.nit if hasattr(result, 'nit') else result.nfev,
             'n_evaluations': result.nfev,
+            'n_surrogate_evaluations': sum(row['solver_method'] == 'surrogate'
+                                           for row in self.history),
         }
 
         if verbose:
@@ -287,6 +422,21 @@ class OperationalOptimizer:
         if third_var not in fixed_vars:
             fixed_vars[third_var] = np.mean(self.bounds[third_var])
 
+        # Modelo con solución cerrada: evaluar toda la malla en una sola llamada
+        if self.model.has_analytic_solution():
+            grid = {var1: X1, var2: X2}
+            grid.update(fixed_vars)
+            T_grid = np.broadcast_to(grid['temperature'], X1.shape)
+            results = self.model.analytic_solution(t_reaction, C0, T_grid)
+
+            return {
+                var1: X1,
+                var2: X2,
+                'conversion_%': np.broadcast_to(results['conversion_%'], X1.shape).copy(),
+                'FAME_yield_%': np.broadcast_to(results['FAME_yield_%'], X1.shape).copy(),
+                'fixed_vars': fixed_vars,
+            }
+
         # Evaluar superficie
         for i in range(n_points):
             for j in range(n_points):
@@ -302,12 +452,13 @@ class OperationalOptimizer:
                 ])
 
                 # Simular
-                self.model.set_temperature(x['temperature'])
                 try:
                     results = self.model.simulate(
                         t_span=(0, t_reaction),
                         C0=C0,
-                        method='Radau'
+                        method=self.solver_method,
+                        final_only=True,
+                        temperature=x['temperature']
                     )
 
                     Z_conversion[i, j] = results['conversion_%'][-1]
@@ -346,18 +497,20 @@ class OperationalOptimizer:
         def multi_objective(x):
             T, rpm, cat_pct = x
 
-            self.model.set_temperature(T)
-            results = self.model.simulate((0, t_reaction), C0)
+            # Evento no terminal: se necesita también la conversión a t_reaction
+            results = self.model.simulate((0, t_reaction), C0,
+                                          method=self.solver_method,
+                                          targets={'conversion_%': 95.0},
+                                          final_only=True, temperature=T,
+                                          use_cache=False)
 
             # Objetivo 1: Maximizar conversión
             conversion = results['conversion_%'][-1]
             obj1 = -conversion / 100  # Normalizado
 
-            # Objetivo 2: Minimizar tiempo
-            idx_95 = np.where(results['conversion_%'] >= 95)[0]
-            if len(idx_95) > 0:
-                time_to_95 = results['t'][idx_95[0]]
-            else:
+            # Objetivo 2: Minimizar tiempo (cruce exacto del 95%)
+            time_to_95 = results['t_target']['conversion_%']
+            if not np.isfinite(time_to_95):
                 time_to_95 = t_reaction
             obj2 = time_to_95 / t_reaction  # Normalizado
 
@@ -388,8 +541,8 @@ class OperationalOptimizer:
         T_opt, rpm_opt, cat_opt = result.x
 
         # Simular con condiciones óptimas
-        self.model.set_temperature(T_opt)
-        final_results = self.model.simulate((0, t_reaction), C0)
+        final_results = self.model.simulate((0, t_reaction), C0, method=self.solver_method,
+                                            final_only=True, temperature=T_opt)
 
         return {
             'temperature_C': T_opt,
@@ -404,11 +557,36 @@ class OperationalOptimizer:
         """
         Retorna historial de evaluaciones de optimización.
 
+        'conversion_%' y 'FAME_yield_%' son los valores en 'time_min':
+        t_reaction, o el cruce de la conversión meta con 'minimize_time'
+        (la simulación se detiene en la meta).
+
         Returns:
             DataFrame con historial
         """
         return pd.DataFrame(self.history)
 
+    def get_solver_stats(self) -> pd.DataFrame:
+        """
+        Resumen por método de las integraciones de la última optimización.
+
+        Returns:
+            DataFrame indexado por método con número de llamadas, fallos,
+            nfev/njev/nlu totales y tiempo de pared total (s)
+        """
+        stats = pd.DataFrame(self.solver_stats)
+        if stats.empty:
+            return stats
+        stats['failed'] = ~stats['success'].astype(bool)
+        return stats.groupby('method').agg(
+            calls=('success', 'size'),
+            failures=('failed', 'sum'),
+            nfev=('nfev', 'sum'),
+            njev=('njev', 'sum'),
+            nlu=('nlu', 'sum'),
+            wall_time=('wall_time', 'sum'),
+        )
+
     def export_results(self, filepath: str, format: str = 'excel'):
         """
         Exporta resultados de optimización.
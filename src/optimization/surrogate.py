@@ -0,0 +1,309 @@
+"""
+Modelo Sustituto (Emulador) para Optimización Operacional
+
+Ajusta un caos polinomial (PCE, base de Legendre de grado total ≤ p) a las
+salidas de KineticModel sobre los límites operacionales del optimizador:
+
+    x = [temperatura, rpm, catalizador_%] → conversión, rendimiento de FAME
+                                             y tiempo hasta la conversión meta
+
+El diseño de entrenamiento es un hipercubo latino (LHS) y el grado se elige
+por validación cruzada leave-one-out (exacta para mínimos cuadrados). El
+error se valida con un segundo diseño LHS independiente que no interviene
+en el ajuste.
+
+OperationalOptimizer.set_surrogate() lo usa como backend de la función
+objetivo: las evaluaciones se resuelven con el emulador, salvo cuando su
+valor queda dentro del margen de error validado del mejor objetivo
+encontrado (cerca del óptimo el emulador no distingue los candidatos), en
+cuyo caso se recurre al modelo real.
+
+Author: Sistema de Modelado de Esterificación
+Date: 2025-11-19
+"""
+
+import itertools
+from typing import Dict, List, Optional
+
+import numpy as np
+from numpy.polynomial import legendre
+from scipy.stats import qmc
+
+from ..models.kinetic_model import KineticModel
+
+
+# Orden de las variables operacionales (igual que en OperationalOptimizer)
+VARIABLES = ('temperature', 'rpm', 'catalyst_%')
+
+# Salidas emuladas
+OUTPUTS = ('conversion_%', 'FAME_yield_%', 't_target')
+
+
+def total_degree_indices(n_dims: int, degree: int) -> np.ndarray:
+    """
+    Multi-índices de la base de grado total ≤ degree.
+
+    Args:
+        n_dims: Número de variables
+        degree: Grado total máximo
+
+    Returns:
+        Arreglo (n_términos, n_dims) de grados por variable
+    """
+    return np.array([alpha for alpha in itertools.product(range(degree + 1), repeat=n_dims)
+                     if sum(alpha) <= degree])
+
+
+def legendre_design_matrix(xi: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """
+    Matriz de diseño de polinomios de Legendre (ortonormales en [-1, 1]).
+
+    Args:
+        xi: Puntos escalados a [-1, 1], forma (n, n_dims)
+        indices: Multi-índices (n_términos, n_dims)
+
+    Returns:
+        Matriz (n, n_términos)
+    """
+    degree = int(indices.max())
+    # P_k(ξ_j) para todos los grados: (n_dims, degree+1, n)
+    values = np.stack([legendre.legvander(xi[:, j], degree).T for j in range(xi.shape[1])])
+    values *= np.sqrt(2 * np.arange(degree + 1) + 1)[None, :, None]
+    columns = np.ones((len(indices), xi.shape[0]))
+    for j in range(xi.shape[1]):
+        columns *= values[j, indices[:, j]]
+    return columns.T
+
+
+class PolynomialChaosSurrogate:
+    """
+    Emulador PCE de las salidas de KineticModel en los límites operacionales.
+
+    Attributes:
+        model (KineticModel): Modelo cinético emulado
+        model_fingerprint (str): Huella del modelo al crear el emulador
+                                 (KineticModel.fingerprint)
+        bounds (Dict): Límites {variable: (min, max)}
+        C0 (Dict): Condiciones iniciales de entrenamiento
+        t_reaction (float): Tiempo de reacción (min)
+        target_conversion (float): Conversión meta para 't_target' (%)
+        degree (int): Grado total elegido por validación cruzada
+        coefficients (np.ndarray): Coeficientes (n_términos, n_salidas)
+        validation (Dict): Errores por salida ('rmse', 'max_abs' en el diseño
+                           de validación, 'loo_rmse' del entrenamiento)
+        n_model_evaluations (int): Simulaciones usadas (entrenamiento + validación)
+    """
+
+    def __init__(self,
+                 model: KineticModel,
+                 bounds: Dict,
+                 C0: Dict[str, float],
+                 t_reaction: float,
+                 target_conversion: float = 95.0,
+                 max_degree: int = 6,
+                 solver_method: str = 'auto'):
+        """
+        Inicializa el emulador (sin entrenar).
+
+        Args:
+            model: Instancia de KineticModel
+            bounds: Límites {variable: (min, max)} (p. ej. optimizer.bounds)
+            C0: Condiciones iniciales
+            t_reaction: Tiempo de reacción (min)
+            target_conversion: Conversión meta para 't_target' (%)
+            max_degree: Grado total máximo del PCE
+            solver_method: Método de integración de las simulaciones
+        """
+        self.model = model
+        self.model_fingerprint = model.fingerprint()
+        self.bounds = {var: tuple(bounds[var]) for var in VARIABLES}
+        self.C0 = dict(C0)
+        self.t_reaction = float(t_reaction)
+        self.target_conversion = float(target_conversion)
+        self.max_degree = max_degree
+        self.solver_method = solver_method
+
+        self.degree = None
+        self.indices = None
+        self.coefficients = None
+        self.validation = {}
+        self.n_model_evaluations = 0
+
+    # ------------------------------------------------------------------
+    # Muestreo del modelo real
+    # ------------------------------------------------------------------
+
+    def _scale(self, X: np.ndarray) -> np.ndarray:
+        """Escala x de los límites físicos a ξ ∈ [-1, 1]."""
+        lower = np.array([self.bounds[var][0] for var in VARIABLES])
+        upper = np.array([self.bounds[var][1] for var in VARIABLES])
+        return 2 * (X - lower) / (upper - lower) - 1
+
+    def design(self, n_points: int, seed: Optional[int] = None) -> np.ndarray:
+        """
+        Diseño de hipercubo latino en los límites operacionales.
+
+        Args:
+            n_points: Número de puntos
+            seed: Semilla
+
+        Returns:
+            Puntos (n_points, 3) en unidades físicas
+        """
+        sample = qmc.LatinHypercube(d=len(VARIABLES), seed=seed).random(n_points)
+        return qmc.scale(sample, [self.bounds[var][0] for var in VARIABLES],
+                         [self.bounds[var][1] for var in VARIABLES])
+
+    def evaluate_model(self, X: np.ndarray) -> np.ndarray:
+        """
+        Salidas del modelo real en los puntos X.
+
+        't_target' es el tiempo exacto de cruce de la conversión meta, o
+        2·t_reaction si no se alcanza (misma penalización que el optimizador).
+
+        Args:
+            X: Puntos (n, 3) en unidades físicas
+
+        Returns:
+            Salidas (n, len(OUTPUTS))
+        """
+        Y = np.empty((len(X), len(OUTPUTS)))
+        for i, (T, rpm, cat_pct) in enumerate(np.atleast_2d(X)):
+            results = self.model.simulate((0, self.t_reaction), self.C0,
+                                          method=self.solver_method, final_only=True,
+                                          targets={'conversion_%': self.target_conversion},
+                                          temperature=T, use_cache=False)
+            t_target = results['t_target']['conversion_%']
+            Y[i] = [results['conversion_%'][-1], results['FAME_yield_%'][-1],
+                    t_target if np.isfinite(t_target) else 2 * self.t_reaction]
+        self.n_model_evaluations += len(Y)
+        return Y
+
+    # ------------------------------------------------------------------
+    # Entrenamiento y validación
+    # ------------------------------------------------------------------
+
+    def fit(self,
+            n_train: int = 60,
+            n_validation: int = 30,
+            seed: Optional[int] = 42,
+            verbose: bool = False) -> 'PolynomialChaosSurrogate':
+        """
+        Entrena el PCE y valida su error en un diseño independiente.
+
+        Args:
+            n_train: Puntos LHS de entrenamiento
+            n_validation: Puntos LHS de validación (no se usan en el ajuste)
+            seed: Semilla de los diseños
+            verbose: Si imprimir el error por grado y salida
+
+        Returns:
+            self
+        """
+        rng = np.random.default_rng(seed)
+        X_train = self.design(n_train, seed=rng.integers(2 ** 32))
+        X_valid = self.design(n_validation, seed=rng.integers(2 ** 32))
+        Y_train = self.evaluate_model(X_train)
+        Y_valid = self.evaluate_model(X_valid)
+        xi_train = self._scale(X_train)
+
+        # Grado por validación cruzada leave-one-out: e_i = r_i / (1 - h_ii),
+        # normalizado por la dispersión de cada salida (las constantes no cuentan)
+        spread = np.std(Y_train, axis=0)
+        varying = spread > 1e-9 * (np.abs(np.mean(Y_train, axis=0)) + 1)
+        best = None
+        for degree in range(1, self.max_degree + 1):
+            indices = total_degree_indices(len(VARIABLES), degree)
+            if len(indices) >= n_train:
+                break
+            Psi = legendre_design_matrix(xi_train, indices)
+            coefficients, *_ = np.linalg.lstsq(Psi, Y_train, rcond=None)
+            leverage = np.einsum('ij,ji->i', Psi, np.linalg.pinv(Psi))
+            loo = (Y_train - Psi @ coefficients) / (1 - leverage)[:, None]
+            loo_rmse = np.sqrt(np.mean(loo ** 2, axis=0))
+            score = np.sum(loo_rmse[varying] / spread[varying])
+            if verbose:
+                print(f"Grado {degree} ({len(indices)} términos): LOO RMSE "
+                      + ", ".join(f"{out}={err:.3g}" for out, err in zip(OUTPUTS, loo_rmse)))
+            if best is None or score < best[0]:
+                best = (score, degree, indices, coefficients, loo_rmse)
+
+        _, self.degree, self.indices, self.coefficients, loo_rmse = best
+
+        error = self._predict_array(X_valid) - Y_valid
+        self.validation = {
+            output: {
+                'rmse': float(np.sqrt(np.mean(error[:, k] ** 2))),
+                'max_abs': float(np.max(np.abs(error[:, k]))),
+                'loo_rmse': float(loo_rmse[k]),
+            }
+            for k, output in enumerate(OUTPUTS)
+        }
+        return self
+
+    def error_estimate(self, output: str) -> float:
+        """
+        Error validado de una salida (máximo error absoluto de validación).
+
+        Args:
+            output: 'conversion_%', 'FAME_yield_%' o 't_target'
+
+        Returns:
+            Error absoluto en las unidades de la salida
+        """
+        if not self.validation:
+            raise ValueError("Debe ejecutar fit() primero")
+        return self.validation[output]['max_abs']
+
+    # ------------------------------------------------------------------
+    # Predicción
+    # ------------------------------------------------------------------
+
+    def _predict_array(self, X: np.ndarray) -> np.ndarray:
+        Psi = legendre_design_matrix(self._scale(np.atleast_2d(X)), self.indices)
+        return Psi @ self.coefficients
+
+    def predict(self, X) -> Dict[str, np.ndarray]:
+        """
+        Salidas emuladas.
+
+        Args:
+            X: Punto(s) [temperatura, rpm, catalizador_%], forma (3,) o (n, 3)
+
+        Returns:
+            Dict {salida: arreglo (n,)}
+        """
+        if self.coefficients is None:
+            raise ValueError("Debe ejecutar fit() primero")
+        Y = self._predict_array(np.asarray(X, dtype=float))
+        return {output: Y[:, k] for k, output in enumerate(OUTPUTS)}
+
+    def in_bounds(self, x: np.ndarray) -> bool:
+        """Si x está dentro de los límites de entrenamiento."""
+        return all(self.bounds[var][0] <= value <= self.bounds[var][1]
+                   for var, value in zip(VARIABLES, x))
+
+    def matches(self, C0: Dict[str, float], t_reaction: float,
+                target_conversion: float = 95.0,
+                model: Optional[KineticModel] = None) -> bool:
+        """
+        Si el emulador fue entrenado para estas condiciones (y este modelo).
+
+        Args:
+            C0: Condiciones iniciales
+            t_reaction: Tiempo de reacción (min)
+            target_conversion: Conversión meta (%)
+            model: KineticModel a comparar con el de entrenamiento por su
+                   huella (tipo, red y parámetros); None: no se compara
+
+        Returns:
+            True si coinciden
+        """
+        return (dict(C0) == self.C0 and float(t_reaction) == self.t_reaction
+                and float(target_conversion) == self.target_conversion
+                and (model is None or model.fingerprint() == self.model_fingerprint))
+
+    def summary(self) -> List[Dict]:
+        """Errores de validación por salida (para tabular)."""
+        return [{'output': output, 'degree': self.degree, **errors}
+                for output, errors in self.validation.items()]